@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark do casamento de palavras-chave (src/utils/palavras_chave.py)
+
+Compara, sobre os mesmos textos (blocos no estilo das publicações do DJE,
+gerados com seed fixa), três formas de testar as listas do parser:
+    - original:  any(palavra in texto.lower() for palavra in LISTA), por lista
+    - regex:     uma regex alternada com lookahead sobre todas as palavras
+    - matcher:   KeywordMatcher (texto em minúsculas uma vez + `in` por categoria)
+
+Casos medidos:
+    - uma lista:        esta_ativo (categoria "extinto")
+    - todas:            as três categorias do parser (relevância do bloco)
+    - classificador:    RelevanceClassifier.classify_movement (Alta/Média)
+
+Uso:
+    python scripts/benchmark_palavras_chave.py
+    python scripts/benchmark_palavras_chave.py --textos 50000 --repeticoes 5
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.scrapers.dje_parser import PALAVRAS_EXTINTO, PALAVRAS_IMOVEIS, PALAVRAS_URGENCIA
+from src.utils.palavras_chave import KeywordMatcher
+
+PALAVRAS_ALTA = ["sentença", "acórdão", "trânsito em julgado", "homologação"]
+PALAVRAS_MEDIA = ["despacho", "intimação", "citação", "juntada"]
+
+VOCABULARIO = (
+    "processo digital requerente requerido advogado oab juiz de direito vara da família "
+    "e sucessões foro central comarca de são paulo partes autos prazo dias manifestação "
+    "documentos petição inicial espólio herdeiros inventariante valor da causa"
+).split()
+
+
+def gerar_textos(quantidade: int, tamanho: int, seed: int) -> list:
+    """Blocos com ~tamanho caracteres; ~1 em 4 traz uma palavra-chave"""
+    rng = random.Random(seed)
+    chaves = PALAVRAS_IMOVEIS + PALAVRAS_URGENCIA + PALAVRAS_EXTINTO + PALAVRAS_ALTA + PALAVRAS_MEDIA
+    textos = []
+    for _ in range(quantidade):
+        palavras = []
+        while sum(len(p) + 1 for p in palavras) < tamanho:
+            palavras.append(rng.choice(VOCABULARIO).upper() if rng.random() < 0.2 else rng.choice(VOCABULARIO))
+        if rng.random() < 0.25:
+            palavras.insert(rng.randrange(len(palavras)), rng.choice(chaves))
+        textos.append(" ".join(palavras))
+    return textos
+
+
+class MatcherRegex:
+    """Regex alternada com lookahead (implementação anterior, mantida só para comparação)"""
+
+    def __init__(self, categorias):
+        self._categorias_por_palavra = {}
+        for categoria, lista in categorias.items():
+            for palavra in lista:
+                self._categorias_por_palavra.setdefault(palavra.lower(), set()).add(categoria)
+        ordenadas = sorted(self._categorias_por_palavra, key=len, reverse=True)
+        self._regex = re.compile("(?=(" + "|".join(re.escape(p) for p in ordenadas) + "))")
+
+    def categorias(self, texto):
+        encontradas = set()
+        for match in self._regex.finditer(texto.lower()):
+            encontradas |= self._categorias_por_palavra[match.group(1)]
+        return frozenset(encontradas)
+
+    def contem(self, texto, categoria):
+        return categoria in self.categorias(texto)
+
+
+def medir(funcao, textos, repeticoes: int) -> float:
+    """Melhor tempo (s) de `repeticoes` passadas por todos os textos"""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for texto in textos:
+            funcao(texto)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do casamento de palavras-chave")
+    parser.add_argument("--textos", type=int, default=20000)
+    parser.add_argument("--tamanho", type=int, default=400, help="Caracteres por texto")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    textos = gerar_textos(args.textos, args.tamanho, args.seed)
+    listas_parser = {"imovel": PALAVRAS_IMOVEIS, "urgencia": PALAVRAS_URGENCIA, "extinto": PALAVRAS_EXTINTO}
+    listas_classificador = {"Alta": PALAVRAS_ALTA, "Média": PALAVRAS_MEDIA}
+
+    matcher = KeywordMatcher(listas_parser)
+    regex = MatcherRegex(listas_parser)
+    matcher_classificador = KeywordMatcher(listas_classificador)
+    regex_classificador = MatcherRegex(listas_classificador)
+
+    def original_lista(texto):
+        return any(palavra in texto.lower() for palavra in PALAVRAS_EXTINTO)
+
+    def original_todas(texto):
+        return frozenset(
+            categoria for categoria, lista in listas_parser.items()
+            if any(palavra in texto.lower() for palavra in lista)
+        )
+
+    def original_classificador(texto):
+        if any(palavra in texto.lower() for palavra in PALAVRAS_ALTA):
+            return "Alta"
+        if any(palavra in texto.lower() for palavra in PALAVRAS_MEDIA):
+            return "Média"
+        return "Baixa"
+
+    def classificar(m):
+        def classify_movement(texto):
+            niveis = m.categorias(texto)
+            return "Alta" if "Alta" in niveis else "Média" if "Média" in niveis else "Baixa"
+        return classify_movement
+
+    # Mesmo resultado nas três formas antes de medir
+    for texto in textos:
+        assert matcher.categorias(texto) == regex.categorias(texto) == original_todas(texto)
+        assert classificar(matcher_classificador)(texto) == original_classificador(texto)
+
+    casos = [
+        ("uma lista", original_lista, lambda t: regex.contem(t, "extinto"), lambda t: matcher.contem(t, "extinto")),
+        ("todas", original_todas, regex.categorias, matcher.categorias),
+        ("classificador", original_classificador, classificar(regex_classificador), classificar(matcher_classificador)),
+    ]
+
+    print(f"{args.textos} textos de ~{args.tamanho} caracteres (melhor de {args.repeticoes})\n")
+    print(f"{'caso':<15}{'original':>12}{'regex':>12}{'matcher':>12}{'ganho':>10}")
+    for nome, original, com_regex, com_matcher in casos:
+        t_original = medir(original, textos, args.repeticoes)
+        t_regex = medir(com_regex, textos, args.repeticoes)
+        t_matcher = medir(com_matcher, textos, args.repeticoes)
+        print(f"{nome:<15}{t_original:>11.3f}s{t_regex:>11.3f}s{t_matcher:>11.3f}s{t_original / t_matcher:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Benchmark reproduzível dos parsers do DJE sobre cadernos sintéticos
+
+Gera os cadernos com scripts/gerar_dje_sintetico.py (mesma seed = mesmo
+PDF) e mede, para cada parser:
+    - páginas/s e registros/s
+    - pico de memória (RSS) do processo
+    - recall: fração das publicações do gabarito cujo número foi encontrado
+
+Cada medição roda num processo novo (spawn), com cache de texto e
+registros em diretórios temporários vazios: o número é sempre de um
+parsing a frio, e o pico de RSS é só do parser medido.
+
+O resultado vai para um JSON (baseline); com --comparar, cada métrica é
+comparada com um baseline anterior.
+
+Uso:
+    python scripts/benchmark_parsers.py --saida data/benchmark_dje.json
+    python scripts/benchmark_parsers.py --paginas 100 400 --densidade 12 --comparar data/benchmark_dje.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.gerar_dje_sintetico import FORMATOS, gerar_caderno
+
+PARSERS = ["dje_parser", "dje_parser_otimizado", "dje_parser_melhorado"]
+
+TIPOS = ["Inventário", "Arrolamento", "Divórcio"]
+
+
+def _executar_parser(parser: str, pdf_path: str, backend: str) -> list:
+    if parser == "dje_parser":
+        from src.scrapers.dje_parser import extrair_processos_dje
+        return extrair_processos_dje(
+            pdf_path, tipos=TIPOS, filtrar_imoveis=False, filtrar_ativos=False, backend=backend
+        )
+    if parser == "dje_parser_otimizado":
+        from src.scrapers.dje_parser_otimizado import extrair_processos_dje_otimizado
+        return extrair_processos_dje_otimizado(pdf_path, backend=backend)
+    if parser == "dje_parser_melhorado":
+        from src.scrapers.dje_parser_melhorado import extrair_todos_processos_dje
+        return extrair_todos_processos_dje(pdf_path, backend=backend)
+    raise ValueError(f"Parser desconhecido: {parser}")
+
+
+def _medir(parser: str, pdf_path: str, backend: str, fila) -> None:
+    """Roda dentro do processo filho: caches vazios, mede tempo e pico de RSS"""
+    from src.utils import cache_texto_dje, registros_dje
+
+    cache_texto_dje.CACHE_TEXTO_DIR = tempfile.mkdtemp(prefix="bench_texto_")
+    registros_dje.REGISTROS_DIR = tempfile.mkdtemp(prefix="bench_registros_")
+
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        processos = _executar_parser(parser, pdf_path, backend)
+    segundos = time.perf_counter() - inicio
+
+    fila.put({
+        "segundos": segundos,
+        "numeros": sorted({p["numero"] for p in processos}),
+        "registros": len(processos),
+        # Linux: ru_maxrss em KB
+        "pico_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    })
+
+
+def medir_parser(parser: str, pdf_path: str, backend: str) -> dict:
+    contexto = multiprocessing.get_context("spawn")
+    fila = contexto.Queue()
+    processo = contexto.Process(target=_medir, args=(parser, pdf_path, backend, fila))
+    processo.start()
+    resultado = fila.get()
+    processo.join()
+    return resultado
+
+
+def rodar_cenario(diretorio: str, paginas: int, args) -> dict:
+    pdf_path = os.path.join(diretorio, f"sintetico_{paginas}p_d{args.densidade}_s{args.seed}.pdf")
+    gabarito = gerar_caderno(
+        pdf_path,
+        paginas=paginas,
+        densidade=args.densidade,
+        formatos=args.formatos,
+        quebras=args.quebras,
+        seed=args.seed
+    )
+    esperados = {
+        p["numero"] for p in gabarito["publicacoes"]
+        if any(p["classe"].lower().startswith(tipo.lower()) for tipo in TIPOS)
+    }
+
+    cenario = {
+        "nome": f"{paginas}p_d{args.densidade}",
+        "paginas": paginas,
+        "publicacoes": len(gabarito["publicacoes"]),
+        "publicacoes_alvo": len(esperados),
+        "resultados": {}
+    }
+
+    for parser in args.parsers:
+        melhor = None
+        for _ in range(args.repeticoes):
+            medicao = medir_parser(parser, pdf_path, args.backend)
+            if melhor is None or medicao["segundos"] < melhor["segundos"]:
+                melhor = medicao
+
+        segundos = melhor["segundos"]
+        cenario["resultados"][parser] = {
+            "segundos": round(segundos, 3),
+            "paginas_por_segundo": round(paginas / segundos, 1),
+            "registros": melhor["registros"],
+            "registros_por_segundo": round(melhor["registros"] / segundos, 1),
+            "pico_rss_mb": round(melhor["pico_rss_mb"], 1),
+            "recall": round(len(esperados & set(melhor["numeros"])) / len(esperados), 4) if esperados else None
+        }
+
+    return cenario
+
+
+def comparar(atual: dict, anterior: dict) -> None:
+    """Imprime a variação de cada métrica em relação ao baseline anterior"""
+    cenarios_anteriores = {c["nome"]: c for c in anterior.get("cenarios", [])}
+
+    print("\n" + "="*80)
+    print(f"📈 COMPARAÇÃO COM BASELINE DE {anterior.get('gerado_em', '?')}")
+    print("="*80)
+
+    for cenario in atual["cenarios"]:
+        base = cenarios_anteriores.get(cenario["nome"])
+        if not base:
+            print(f"   {cenario['nome']}: sem baseline")
+            continue
+        for parser, resultado in cenario["resultados"].items():
+            ref = base["resultados"].get(parser)
+            if not ref:
+                continue
+            variacoes = []
+            for metrica in ("paginas_por_segundo", "pico_rss_mb", "recall"):
+                if ref.get(metrica):
+                    variacao = (resultado[metrica] - ref[metrica]) / ref[metrica] * 100
+                    variacoes.append(f"{metrica} {variacao:+.1f}%")
+            print(f"   {cenario['nome']:<12} {parser:<22} {' | '.join(variacoes)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos parsers do DJE")
+    parser.add_argument("--paginas", nargs="+", type=int, default=[50, 200])
+    parser.add_argument("--densidade", type=int, default=10, help="Publicações por página")
+    parser.add_argument("--formatos", nargs="+", default=FORMATOS, choices=FORMATOS)
+    parser.add_argument("--quebras", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--parsers", nargs="+", default=PARSERS, choices=PARSERS)
+    parser.add_argument("--backend", default=None, help="Backend de texto (padrão: DJE_PDF_BACKEND / pdfplumber)")
+    parser.add_argument("--repeticoes", type=int, default=1, help="Fica com a medição mais rápida")
+    parser.add_argument("--saida", help="Salva o resultado (baseline) em JSON")
+    parser.add_argument("--comparar", help="Baseline anterior para comparação")
+    args = parser.parse_args()
+
+    relatorio = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "maquina": platform.machine(),
+        "backend": args.backend or os.getenv("DJE_PDF_BACKEND", "pdfplumber"),
+        "parametros": {
+            "densidade": args.densidade,
+            "formatos": args.formatos,
+            "quebras": args.quebras,
+            "seed": args.seed,
+            "repeticoes": args.repeticoes
+        },
+        "cenarios": []
+    }
+
+    with tempfile.TemporaryDirectory(prefix="dje_bench_") as diretorio:
+        for paginas in args.paginas:
+            print(f"\n🧪 Cenário: {paginas} páginas, {args.densidade} publicações/página")
+            cenario = rodar_cenario(diretorio, paginas, args)
+            relatorio["cenarios"].append(cenario)
+
+            print(f"{'parser':<22} {'pág/s':>8} {'reg/s':>9} {'reg':>6} {'RSS MB':>8} {'recall':>7}")
+            for nome, r in cenario["resultados"].items():
+                print(
+                    f"{nome:<22} {r['paginas_por_segundo']:>8} {r['registros_por_segundo']:>9} "
+                    f"{r['registros']:>6} {r['pico_rss_mb']:>8} {r['recall'] if r['recall'] is not None else '-':>7}"
+                )
+
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as f:
+            comparar(relatorio, json.load(f))
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Baseline salvo em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Compara os backends de extração de texto do DJE
+
+Para cada backend (src/scrapers/dje_texto.py) e cada PDF do corpus:
+    1. Mede a extração de texto (páginas/s), sem usar o cache
+    2. Roda o parser sobre o texto extraído e compara com o pdfplumber:
+       - números CNJ encontrados no texto
+       - processos aprovados e seus campos (classe, comarca, partes, ...)
+
+Uso:
+    python scripts/comparar_backends.py data/dje_pdfs --backends pdfplumber pypdfium2
+    python scripts/comparar_backends.py data/dje_pdfs/dje_12-11-2025_cad13.pdf --saida relatorio.json
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.scrapers.dje_parser import PADRAO_PROCESSO, extrair_processos_dje
+from src.scrapers.dje_texto import BACKENDS, iter_textos_paginas
+from src.utils import cache_texto_dje
+
+REFERENCIA = "pdfplumber"
+
+CAMPOS_COMPARADOS = [
+    "tipo", "classe", "comarca", "codigo_comarca", "partes", "advogados",
+    "valor_causa", "pagina_dje", "tem_imovel", "esta_ativo", "relevancia"
+]
+
+
+def listar_pdfs(corpus: str, limite: int = None) -> list:
+    """Aceita um PDF, um diretório ou um glob"""
+    if os.path.isdir(corpus):
+        pdfs = sorted(glob.glob(os.path.join(corpus, "*.pdf")))
+    else:
+        pdfs = sorted(glob.glob(corpus))
+    return pdfs[:limite] if limite else pdfs
+
+
+def extrair_com_backend(pdf_path: str, backend: str, tipos: list) -> dict:
+    """Extrai o texto (cronometrado) e roda o parser sobre ele"""
+    inicio = time.perf_counter()
+    numeros = set()
+    paginas = 0
+    for _, texto in iter_textos_paginas(pdf_path, usar_cache=True, backend=backend):
+        numeros.update(PADRAO_PROCESSO.findall(texto))
+        paginas += 1
+    segundos = time.perf_counter() - inicio
+
+    # O texto acabou de ir para o cache (diretório temporário): aqui só rodam as regex.
+    # Sem pré-varredura: ela usa outro extrator e decidiria as páginas dos dois lados
+    processos = extrair_processos_dje(
+        pdf_path,
+        tipos=tipos,
+        filtrar_imoveis=False,
+        filtrar_ativos=False,
+        backend=backend,
+        usar_registros=False,
+        pre_varredura=False
+    )
+
+    return {
+        "paginas": paginas,
+        "segundos": segundos,
+        "numeros": numeros,
+        "processos": {p["numero"]: p for p in processos}
+    }
+
+
+def comparar(referencia: dict, candidato: dict) -> dict:
+    """Diferenças do candidato em relação à referência (pdfplumber)"""
+    campos_divergentes = Counter()
+    exemplos = []
+
+    comuns = set(referencia["processos"]) & set(candidato["processos"])
+    for numero in sorted(comuns):
+        ref, cand = referencia["processos"][numero], candidato["processos"][numero]
+        for campo in CAMPOS_COMPARADOS:
+            if ref.get(campo) != cand.get(campo):
+                campos_divergentes[campo] += 1
+                if len(exemplos) < 10:
+                    exemplos.append({"numero": numero, "campo": campo, REFERENCIA: ref.get(campo), "backend": cand.get(campo)})
+
+    return {
+        "numeros_faltando": sorted(referencia["numeros"] - candidato["numeros"]),
+        "numeros_extras": sorted(candidato["numeros"] - referencia["numeros"]),
+        "processos_faltando": sorted(set(referencia["processos"]) - set(candidato["processos"])),
+        "processos_extras": sorted(set(candidato["processos"]) - set(referencia["processos"])),
+        "campos_divergentes": dict(campos_divergentes),
+        "exemplos": exemplos
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara backends de extração de texto do DJE")
+    parser.add_argument("corpus", help="PDF, diretório ou glob")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--tipos", nargs="+", default=["Inventário", "Divórcio", "Arrolamento"])
+    parser.add_argument("--limite-pdfs", type=int, default=None)
+    parser.add_argument("--saida", help="Salva o relatório em JSON")
+    args = parser.parse_args()
+
+    pdfs = listar_pdfs(args.corpus, args.limite_pdfs)
+    if not pdfs:
+        parser.error(f"Nenhum PDF encontrado em {args.corpus}")
+
+    backends = [REFERENCIA] + [b for b in args.backends if b != REFERENCIA]
+
+    # Cache temporário: nenhum backend pode aproveitar texto extraído antes
+    cache_texto_dje.CACHE_TEXTO_DIR = tempfile.mkdtemp(prefix="dje_backends_")
+
+    relatorio = {"pdfs": [], "totais": {b: {"paginas": 0, "segundos": 0.0} for b in backends}}
+
+    for pdf_path in pdfs:
+        print("\n" + "="*80)
+        print(f"📄 {os.path.basename(pdf_path)}")
+        print("="*80)
+
+        resultados = {}
+        for backend in backends:
+            resultados[backend] = extrair_com_backend(pdf_path, backend, args.tipos)
+            relatorio["totais"][backend]["paginas"] += resultados[backend]["paginas"]
+            relatorio["totais"][backend]["segundos"] += resultados[backend]["segundos"]
+
+        item = {"pdf": os.path.basename(pdf_path), "backends": {}}
+        for backend in backends:
+            r = resultados[backend]
+            item["backends"][backend] = {
+                "paginas": r["paginas"],
+                "segundos": round(r["segundos"], 3),
+                "paginas_por_segundo": round(r["paginas"] / r["segundos"], 1) if r["segundos"] else None,
+                "numeros_cnj": len(r["numeros"]),
+                "processos": len(r["processos"])
+            }
+            if backend != REFERENCIA:
+                item["backends"][backend]["diferencas"] = comparar(resultados[REFERENCIA], r)
+        relatorio["pdfs"].append(item)
+
+        print(f"{'backend':<12} {'pág/s':>8} {'CNJ':>6} {'proc':>6} {'-CNJ':>6} {'+CNJ':>6} {'-proc':>6} {'campos':>7}")
+        for backend, dados in item["backends"].items():
+            dif = dados.get("diferencas", {})
+            print(
+                f"{backend:<12} {dados['paginas_por_segundo'] or 0:>8} {dados['numeros_cnj']:>6} {dados['processos']:>6} "
+                f"{len(dif.get('numeros_faltando', [])):>6} {len(dif.get('numeros_extras', [])):>6} "
+                f"{len(dif.get('processos_faltando', [])):>6} {sum(dif.get('campos_divergentes', {}).values()):>7}"
+            )
+
+    print("\n" + "="*80)
+    print("📊 TOTAL")
+    print("="*80)
+    for backend, total in relatorio["totais"].items():
+        pps = total["paginas"] / total["segundos"] if total["segundos"] else 0
+        total["paginas_por_segundo"] = round(pps, 1)
+        print(f"   {backend:<12} {total['paginas']} páginas em {total['segundos']:.1f}s → {pps:.1f} páginas/s")
+
+    perdas = sum(
+        len(dados.get("diferencas", {}).get("processos_faltando", []))
+        for item in relatorio["pdfs"] for dados in item["backends"].values()
+    )
+    if perdas:
+        print(f"\n⚠️  {perdas} processos do {REFERENCIA} NÃO foram encontrados por algum backend")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Relatório salvo em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
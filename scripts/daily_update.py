@@ -1,19 +1,64 @@
 #!/usr/bin/env python3
 """
 Atualização diária automática do DJE
-Baixa PDFs dos últimos 3 dias e atualiza o cache
+Baixa PDFs dos últimos 3 dias e atualiza o índice (src/utils/indice_dje.py)
+
+Números já conhecidos (índice + tabela processos, ver
+src/utils/numeros_conhecidos.py) só têm a aparição registrada, sem
+extração de campos. Use --refresh para reextrair tudo.
+
+O índice não é regravado: os processos novos viram segmentos novos e as
+aparições um arquivo de aparições (acrescentar_indice), então o custo
+da atualização acompanha o volume do dia, não o tamanho do índice. Se o
+índice for de outra VERSAO_INDICE (formato mudou desde a última
+indexação), ele é reconstruído antes (indexar_todos_pdfs).
 """
+import argparse
 import os
-import json
 from datetime import datetime, timedelta
 from src.scrapers.dje_downloader import baixar_dje_intervalo
-from src.scrapers.dje_parser import extrair_processos_dje
+from src.scrapers.dje_parser import extrair_processos_dje, reextrair_aparicoes
+from src.utils.indexador_dje import indexar_todos_pdfs, ler_cache
+from src.utils.indice_dje import INDICE_DIR, VERSAO_INDICE, acrescentar_indice, ler_manifesto
+from src.utils.numeros_conhecidos import (
+    acrescentar_numeros_conhecidos,
+    carregar_numeros_conhecidos,
+    reconstruir_numeros_conhecidos
+)
+
+TIPOS = ['Inventário', 'Divórcio', 'Arrolamento']
+
+
+def _data_pdf(data_pdf: str) -> datetime:
+    """DD-MM-YYYY -> datetime (datas inválidas contam como antigas)"""
+    try:
+        return datetime.strptime(data_pdf, "%d-%m-%Y")
+    except (TypeError, ValueError):
+        return datetime.min
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Atualização diária do DJE")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Reextrai os campos de todos os processos, inclusive os já conhecidos")
+    args = parser.parse_args()
+
     print("="*80)
     print("🤖 ATUALIZAÇÃO DIÁRIA AUTOMÁTICA DO DJE")
     print("="*80)
 
+    # Segmentos de outro formato não podem receber os do dia: reconstrói
+    # primeiro (refaz também os números conhecidos)
+    manifesto = ler_manifesto(INDICE_DIR)
+    if manifesto and manifesto.get("versao") != VERSAO_INDICE:
+        print(f"🔨 Índice no formato v{manifesto.get('versao')} (atual: v{VERSAO_INDICE}): reindexando antes da atualização")
+        indexar_todos_pdfs(indice_dir=INDICE_DIR)
+
+    conhecidos = None
+    if not args.refresh:
+        conhecidos = carregar_numeros_conhecidos() or reconstruir_numeros_conhecidos(INDICE_DIR)
+        print(f"🔢 {len(conhecidos)} números conhecidos ({'exato' if conhecidos.exato else 'filtro de Bloom'})")
+
     # Calcular últimos 3 dias (incluindo hoje)
     hoje = datetime.now()
     tres_dias_atras = hoje - timedelta(days=3)
@@ -56,6 +101,7 @@ def main():
     print(f"\n📄 PASSO 2: Processando novos PDFs...\n")
 
     novos_processos = []
+    aparicoes_por_pdf = {}  # pdf_path -> aparições de números conhecidos
     for pdf_path in pdfs:
         if not os.path.exists(pdf_path):
             continue
@@ -63,18 +109,26 @@ def main():
         print(f"   Processando {os.path.basename(pdf_path)}...")
 
         try:
+            # Parseia o PDF uma única vez; os filtros rodam sobre os registros guardados
+            aparicoes = []
             processos = extrair_processos_dje(
                 pdf_path,
-                tipos=['Inventário', 'Divórcio', 'Arrolamento'],
+                tipos=TIPOS,
                 filtrar_imoveis=False,
-                filtrar_ativos=True
+                filtrar_ativos=True,
+                conhecidos=conhecidos,
+                aparicoes=aparicoes
             )
 
             # Adicionar data do PDF
             pdf_basename = os.path.basename(pdf_path)
             data_pdf = pdf_basename.split('_')[1]
             for p in processos:
+                p['pdf_origem'] = pdf_basename
                 p['data_pdf'] = data_pdf
+            for a in aparicoes:
+                a['data_pdf'] = data_pdf
+            aparicoes_por_pdf[pdf_path] = aparicoes
 
             novos_processos.extend(processos)
             print(f"      ✅ {len(processos)} processos")
@@ -84,65 +138,97 @@ def main():
 
     print(f"\n✅ {len(novos_processos)} novos processos extraídos")
 
-    # PASSO 3: Atualizar cache (merge com processos existentes)
-    print(f"\n💾 PASSO 3: Atualizando cache...\n")
+    # PASSO 3: Atualizar índice (só os dados novos são gravados)
+    print(f"\n💾 PASSO 3: Atualizando índice...\n")
 
-    cache_path = "data/dje_cache.json"
+    # Índice existente: só os números procurados são localizados (sem montar dicts)
+    indice = None
+    try:
+        indice = ler_cache(INDICE_DIR)
+        print(f"   📦 Índice existente: {len(indice)} processos")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"   ⚠️  Erro ao ler índice: {e}")
+
+    procurados = {p['numero'] for p in novos_processos}
+    for aparicoes in aparicoes_por_pdf.values():
+        procurados.update(a['numero'] for a in aparicoes)
+    localizados = indice.localizar(procurados) if indice is not None else {}
+
+    # Aparições de números conhecidos: só atualiza a última aparição.
+    # Falsos positivos do filtro de Bloom (número que não está no índice)
+    # são reextraídos por completo.
+    ultimas_aparicoes = {}  # numero -> data, gravado como arquivo de aparições
+    total_aparicoes = 0
+    for pdf_path, aparicoes in aparicoes_por_pdf.items():
+        falsos_positivos = []
+        for a in aparicoes:
+            local = localizados.get(a['numero'])
+            if local is None:
+                falsos_positivos.append(a)
+            else:
+                segmento, linha = local
+                atual = ultimas_aparicoes.get(a['numero']) or segmento.processo(linha).get('ultima_aparicao')
+                if _data_pdf(a['data_pdf']) > _data_pdf(atual):
+                    ultimas_aparicoes[a['numero']] = a['data_pdf']
+            total_aparicoes += 1
+
+        if falsos_positivos:
+            reextraidos = reextrair_aparicoes(
+                pdf_path, falsos_positivos, tipos=TIPOS, filtrar_imoveis=False, filtrar_ativos=True
+            )
+            for p in reextraidos:
+                p['pdf_origem'] = os.path.basename(pdf_path)
+                p['data_pdf'] = falsos_positivos[0]['data_pdf']
+            novos_processos.extend(reextraidos)
 
-    # Carregar cache existente
-    processos_existentes = []
-    if os.path.exists(cache_path):
-        try:
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                cache_existente = json.load(f)
-                processos_existentes = cache_existente.get('processos', [])
-                print(f"   📦 Cache existente: {len(processos_existentes)} processos")
-        except Exception as e:
-            print(f"   ⚠️  Erro ao ler cache: {e}")
+    if total_aparicoes:
+        print(f"   🔁 Aparições de processos já conhecidos: {total_aparicoes}")
 
-    # Merge: adicionar apenas processos novos (evitar duplicatas)
-    numeros_existentes = {p['numero'] for p in processos_existentes}
     processos_realmente_novos = [
         p for p in novos_processos
-        if p['numero'] not in numeros_existentes
+        if p['numero'] not in localizados
     ]
 
-    # Combinar
-    todos_processos = processos_existentes + processos_realmente_novos
-
     print(f"   ➕ Processos novos adicionados: {len(processos_realmente_novos)}")
-    print(f"   📊 Total no cache: {len(todos_processos)}")
 
     # Contar PDFs únicos
     pdfs_dir = "data/dje_pdfs"
     total_pdfs = len([f for f in os.listdir(pdfs_dir) if f.endswith('.pdf')]) if os.path.exists(pdfs_dir) else 0
 
-    # Salvar cache atualizado
-    cache_atualizado = {
-        'total_processos': len(todos_processos),
+    # Gravar só o dia: um segmento por PDF com os processos novos e um
+    # arquivo de aparições; segmentos existentes e o resto do manifesto
+    # (PDFs indexados, backend/janela dos ponteiros leves) ficam como estão
+    novos_por_pdf = {}
+    for p in processos_realmente_novos:
+        novos_por_pdf.setdefault(p['pdf_origem'], []).append(p)
+
+    manifesto = acrescentar_indice(novos_por_pdf, ultimas_aparicoes, {
         'total_pdfs': total_pdfs,
-        'processos': todos_processos,
         'data_indexacao': datetime.now().isoformat(),
         'ultima_atualizacao': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
+    }, INDICE_DIR)
 
-    with open(cache_path, 'w', encoding='utf-8') as f:
-        json.dump(cache_atualizado, f, ensure_ascii=False, indent=2)
+    print(f"   📊 Total no índice: {manifesto['total_processos']}")
+    print(f"\n✅ Índice salvo: {INDICE_DIR}")
 
-    print(f"\n✅ Cache salvo: {cache_path}")
+    if args.refresh:
+        reconstruir_numeros_conhecidos(INDICE_DIR)
+    else:
+        acrescentar_numeros_conhecidos((p['numero'] for p in processos_realmente_novos), INDICE_DIR)
 
-    # Estatísticas
-    from collections import Counter
-    tipos_count = Counter(p['tipo'] for p in todos_processos)
+    # Estatísticas (contagens das listas invertidas, sem ler os processos)
+    tipos_count = ler_cache(INDICE_DIR).contagem('tipo')
 
     print("\n" + "="*80)
     print("📊 ESTATÍSTICAS FINAIS")
     print("="*80)
     print(f"📄 Total de PDFs: {total_pdfs}")
-    print(f"⚖️  Total de processos: {len(todos_processos)}")
+    print(f"⚖️  Total de processos: {manifesto['total_processos']}")
     print(f"🆕 Novos processos hoje: {len(processos_realmente_novos)}")
     print(f"\n📋 Distribuição por tipo:")
-    for tipo, count in sorted(tipos_count.items()):
+    for tipo, count in sorted(tipos_count.items(), key=lambda item: str(item[0])):
         print(f"   {tipo}: {count}")
     print("="*80)
 
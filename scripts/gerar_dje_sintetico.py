@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Gera cadernos sintéticos do DJE (PDF) para medir os parsers
+
+O layout imita os cadernos de distribuição do TJSP: cabeçalho/rodapé em
+toda página, seções "RELAÇÃO DOS FEITOS ... FORO DE X" e publicações nos
+três formatos que o parser reconhece:
+    - dois_pontos:    "PROCESSO :NNNNNNN-DD.AAAA.8.26.OOOO" / "CLASSE :INVENTÁRIO"
+    - quebra_linha:   "Classe" numa linha e a classe na seguinte
+    - movimentacao:   "NNNNNNN-DD.AAAA.8.26.OOOO - Inventário - Comarca - ..."
+
+Uma fração das publicações (quebras) é forçada a começar na última linha
+da página, com a classe e as partes na página seguinte. O gabarito de cada
+publicação (número, classe, formato, página, quebrada) é devolvido por
+gerar_caderno() e salvo ao lado do PDF (<pdf>.gabarito.json).
+
+Uso:
+    python scripts/gerar_dje_sintetico.py /tmp/caderno.pdf --paginas 200 --densidade 12
+    python scripts/gerar_dje_sintetico.py /tmp/caderno.pdf --formatos dois_pontos --quebras 0.3
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from src.utils.comarcas import COMARCAS_TJSP
+
+FORMATOS = ["dois_pontos", "quebra_linha", "movimentacao"]
+
+# (classe, aceita no formato movimentacao)
+CLASSES = [
+    ("Inventário", True),
+    ("Arrolamento Sumário", True),
+    ("Divórcio Consensual", True),
+    ("Divórcio Litigioso", True),
+    ("Alvará Judicial", True),
+    ("Procedimento Comum Cível", False),
+    ("Execução de Título Extrajudicial", False),
+    ("Alimentos - Lei Especial Nº 5.478/68", False),
+    ("Busca e Apreensão em Alienação Fiduciária", False),
+    ("Cumprimento de Sentença", False),
+]
+
+NOMES = [
+    "MARIA APARECIDA DA SILVA", "JOSÉ CARLOS PEREIRA", "ANA PAULA SOUZA", "JOÃO BATISTA OLIVEIRA",
+    "ANTÔNIO FERREIRA LIMA", "FRANCISCA RODRIGUES", "LUIZ HENRIQUE ALVES", "SEBASTIÃO GONÇALVES",
+    "BANCO BRADESCO S/A", "ESPÓLIO DE PEDRO MARTINS", "CONDOMÍNIO EDIFÍCIO AURORA", "FAZENDA DO ESTADO"
+]
+
+ADVOGADOS = [
+    "Fernanda Costa Ribeiro", "Ricardo Almeida Santos", "Juliana Moraes", "Paulo Sergio Nunes",
+    "Camila Duarte Prado", "Marcelo Vieira Campos"
+]
+
+TRECHOS_IMOVEL = [
+    "Imóvel matrícula nº {n}.{m:03d} do Registro de Imóveis local.",
+    "Partilha de casa situada na Rua das Flores, {n}.",
+    "Bem: apartamento com área privativa de {n} m².",
+    "Terreno (lote {n}, quadra {m}) objeto de avaliação.",
+]
+
+TRECHOS_NEUTROS = [
+    "Vistos. Intime-se a parte autora para emendar a inicial no prazo de 15 dias.",
+    "Cite-se. Defiro os benefícios da justiça gratuita.",
+    "Manifeste-se a parte contrária sobre os documentos juntados.",
+    "Ciência às partes do retorno dos autos. Nada sendo requerido, aguarde-se.",
+]
+
+TRECHOS_EXTINTO = [
+    "Processo extinto. Arquive-se com as cautelas de praxe.",
+    "Autos arquivados definitivamente.",
+]
+
+CABECALHO = (
+    "Disponibilização: terça-feira, 22 de julho de 2025 Diário da Justiça Eletrônico - "
+    "Caderno Judicial - 1ª Instância - Interior - Parte I São Paulo, Ano XVIII - Edição 4247 {pagina}"
+)
+RODAPE = "Publicação Oficial do Tribunal de Justiça do Estado de São Paulo - Lei Federal nº 11.419/06, art. 4º"
+
+LINHAS_POR_PAGINA = 62
+TAMANHO_FONTE = 8
+ENTRELINHA = 11.5
+MARGEM = 36
+
+
+def _numero(rng: random.Random, sequencia: int, codigo: str) -> str:
+    return f"{1000000 + sequencia:07d}-{rng.randint(10, 99)}.2025.8.26.{codigo}"
+
+
+def _publicacao(rng: random.Random, numero: str, classe: str, formato: str, comarca: str) -> List[str]:
+    """Linhas de uma publicação no formato pedido"""
+    requerente, requerido = rng.sample(NOMES, 2)
+    advogado = rng.choice(ADVOGADOS)
+    oab = rng.randint(100000, 499999)
+    valor = rng.randint(5, 2000) * 1000
+
+    detalhes = []
+    if rng.random() < 0.5:
+        detalhes.append(rng.choice(TRECHOS_IMOVEL).format(n=rng.randint(1, 999), m=rng.randint(1, 99)))
+    if rng.random() < 0.1:
+        detalhes.append(rng.choice(TRECHOS_EXTINTO))
+    detalhes.append(rng.choice(TRECHOS_NEUTROS))
+
+    if formato == "dois_pontos":
+        return [
+            f"PROCESSO :{numero}",
+            f"CLASSE :{classe.upper()}",
+            f"REQTE : {requerente}",
+            f"ADVOGADO : {oab}/SP - {advogado.upper()}",
+            f"REQDO : {requerido}",
+            f"VALOR DA CAUSA : R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."),
+            *detalhes,
+            f"VARA :{rng.choice(['1ª VARA', '2ª VARA', 'VARA ÚNICA'])}",
+        ]
+
+    if formato == "quebra_linha":
+        return [
+            f"Processo {numero}",
+            "Classe",
+            classe,
+            f"Requerente: {requerente} - Requerido: {requerido}",
+            *detalhes,
+            f"Adv: {advogado} (OAB: {oab}/SP)",
+        ]
+
+    return [
+        f"{numero} - {classe} - {comarca} - Requerente: {requerente} - Requerido: {requerido}",
+        *detalhes,
+        f"Valor: R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        + f" - Adv: {advogado} (OAB: {oab}/SP)",
+    ]
+
+
+def gerar_caderno(
+    pdf_path: str,
+    paginas: int = 50,
+    densidade: int = 10,
+    formatos: Optional[List[str]] = None,
+    quebras: float = 0.1,
+    foros_por_caderno: int = 8,
+    seed: int = 42
+) -> Dict:
+    """
+    Gera o PDF e devolve o gabarito
+
+    Args:
+        pdf_path: Onde salvar o PDF
+        paginas: Quantidade de páginas
+        densidade: Publicações por página (aproximado)
+        formatos: Formatos de classe sorteados (padrão: os três)
+        quebras: Fração das publicações que atravessam a quebra de página
+        foros_por_caderno: Quantas seções "FORO DE X" o caderno tem
+        seed: Semente - mesmos parâmetros geram o mesmo PDF
+    """
+    rng = random.Random(seed)
+    formatos = formatos or FORMATOS
+    foros = rng.sample(sorted(COMARCAS_TJSP.items()), min(foros_por_caderno, len(COMARCAS_TJSP)))
+    paginas_por_foro = max(1, -(-paginas // len(foros)))
+
+    # Linhas de texto livre entre publicações para chegar na densidade pedida
+    linhas_por_publicacao = max(1, LINHAS_POR_PAGINA // max(1, densidade))
+
+    gabarito = {"paginas": paginas, "densidade": densidade, "formatos": formatos, "quebras": quebras,
+                "seed": seed, "publicacoes": []}
+
+    pdf = canvas.Canvas(pdf_path, pagesize=A4)
+    largura, altura = A4
+
+    pagina = 1
+    linhas: List[str] = []
+    sequencia = 0
+    foro_atual = None
+
+    def fechar_pagina():
+        nonlocal pagina, linhas
+        pdf.setFont("Helvetica", TAMANHO_FONTE - 1)
+        pdf.drawString(MARGEM, altura - MARGEM + 12, RODAPE)
+        pdf.drawString(MARGEM, altura - MARGEM, CABECALHO.format(pagina=pagina))
+        pdf.setFont("Helvetica", TAMANHO_FONTE)
+        y = altura - MARGEM - 2 * ENTRELINHA
+        for linha in linhas:
+            pdf.drawString(MARGEM, y, linha)
+            y -= ENTRELINHA
+        pdf.showPage()
+        pagina += 1
+        linhas = []
+
+    def adicionar(novas: List[str], permitir_quebra: bool):
+        """Põe as linhas na página; sem permitir_quebra, o bloco vai inteiro para a próxima"""
+        if not permitir_quebra and len(linhas) + len(novas) > LINHAS_POR_PAGINA:
+            fechar_pagina()
+        for linha in novas:
+            if len(linhas) >= LINHAS_POR_PAGINA:
+                fechar_pagina()
+            if pagina > paginas:
+                return
+            linhas.append(linha)
+
+    while pagina <= paginas:
+        indice_foro = min((pagina - 1) // paginas_por_foro, len(foros) - 1)
+        if foros[indice_foro] != foro_atual:
+            foro_atual = foros[indice_foro]
+            adicionar([
+                foro_atual[1].upper(),
+                f"RELAÇÃO DOS FEITOS CÍVEIS DISTRIBUÍDOS ÀS VARAS DO FORO DE {foro_atual[1].upper()} EM 18/07/2025",
+            ], permitir_quebra=False)
+
+        formato = rng.choice(formatos)
+        candidatas = [c for c, movimentacao in CLASSES if movimentacao or formato != "movimentacao"]
+        classe = rng.choice(candidatas)
+        sequencia += 1
+        numero = _numero(rng, sequencia, foro_atual[0])
+        bloco = _publicacao(rng, numero, classe, formato, foro_atual[1])
+
+        quebrada = rng.random() < quebras
+        if quebrada:
+            # Preenche até sobrar só a linha do número nesta página
+            while len(linhas) < LINHAS_POR_PAGINA - 1:
+                linhas.append(rng.choice(TRECHOS_NEUTROS))
+
+        pagina_inicio = pagina
+        adicionar(bloco, permitir_quebra=quebrada)
+        if pagina > paginas:
+            break
+
+        gabarito["publicacoes"].append({
+            "numero": numero,
+            "classe": classe,
+            "formato": formato,
+            "codigo_comarca": foro_atual[0],
+            "pagina": pagina_inicio,
+            "quebrada": quebrada and pagina != pagina_inicio
+        })
+
+        espaco = linhas_por_publicacao - len(bloco)
+        if espaco > 0:
+            adicionar([rng.choice(TRECHOS_NEUTROS) for _ in range(espaco)], permitir_quebra=True)
+
+    if linhas and pagina <= paginas:
+        fechar_pagina()
+    pdf.save()
+
+    with open(f"{pdf_path}.gabarito.json", 'w', encoding='utf-8') as f:
+        json.dump(gabarito, f, ensure_ascii=False, indent=2)
+
+    return gabarito
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera um caderno sintético do DJE")
+    parser.add_argument("saida", help="Caminho do PDF")
+    parser.add_argument("--paginas", type=int, default=50)
+    parser.add_argument("--densidade", type=int, default=10, help="Publicações por página")
+    parser.add_argument("--formatos", nargs="+", default=FORMATOS, choices=FORMATOS)
+    parser.add_argument("--quebras", type=float, default=0.1, help="Fração das publicações quebradas entre páginas")
+    parser.add_argument("--foros", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    gabarito = gerar_caderno(
+        args.saida,
+        paginas=args.paginas,
+        densidade=args.densidade,
+        formatos=args.formatos,
+        quebras=args.quebras,
+        foros_por_caderno=args.foros,
+        seed=args.seed
+    )
+
+    quebradas = sum(1 for p in gabarito["publicacoes"] if p["quebrada"])
+    print(f"✅ {args.saida}: {args.paginas} páginas, {len(gabarito['publicacoes'])} publicações ({quebradas} quebradas)")
+
+
+if __name__ == "__main__":
+    main()
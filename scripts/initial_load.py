@@ -4,10 +4,10 @@ Carga inicial de processos de múltiplas comarcas
 Baixa PDFs de um período maior (último mês) para popular o sistema
 """
 import os
-import json
 from datetime import datetime, timedelta
 from src.scrapers.dje_downloader import baixar_dje_intervalo
 from src.scrapers.dje_parser import extrair_processos_dje
+from src.utils.indice_dje import INDICE_DIR, escrever_indice
 
 def main():
     print("="*80)
@@ -93,6 +93,7 @@ def main():
             pdf_basename = os.path.basename(pdf_path)
             data_pdf = pdf_basename.split('_')[1]
             for p in processos:
+                p['pdf_origem'] = pdf_basename
                 p['data_pdf'] = data_pdf
 
             todos_processos.extend(processos)
@@ -103,23 +104,16 @@ def main():
 
     print(f"\n✅ {len(todos_processos)} processos extraídos no total")
 
-    # PASSO 3: Salvar cache
-    print(f"\n💾 PASSO 3: Salvando cache...\n")
+    # PASSO 3: Salvar índice
+    print(f"\n💾 PASSO 3: Salvando índice...\n")
 
-    cache_path = "data/dje_cache.json"
-
-    cache = {
-        'total_processos': len(todos_processos),
+    escrever_indice(todos_processos, {
         'total_pdfs': len(todos_pdf_files),
-        'processos': todos_processos,
         'data_indexacao': datetime.now().isoformat(),
         'ultima_atualizacao': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-
-    with open(cache_path, 'w', encoding='utf-8') as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2)
+    }, INDICE_DIR)
 
-    print(f"✅ Cache salvo: {cache_path}")
+    print(f"✅ Índice salvo: {INDICE_DIR}")
 
     # Estatísticas
     from collections import Counter
@@ -0,0 +1,67 @@
+"""
+Respostas NDJSON (uma linha JSON por processo) para resultados grandes
+
+Com format=ndjson, as buscas devolvem um StreamingResponse: cada processo
+é serializado e enviado assim que sai do índice/parser/API, em vez de
+montar a lista inteira e serializar no fim. O primeiro byte sai com o
+primeiro processo e a memória do servidor não cresce com o resultado.
+
+Formato:
+    {...processo...}\\n                  uma linha por processo
+    {"_resumo": {...}}\\n                última linha: totais/estatísticas
+    {"_erro": "..."}\\n                  se a busca falhar no meio (o status
+                                        HTTP 200 já foi enviado)
+"""
+import json
+import traceback
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Union
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+MEDIA_TYPE_NDJSON = "application/x-ndjson"
+
+FORMATOS_RESPOSTA = ("json", "ndjson")
+
+
+def validar_formato(formato: str) -> bool:
+    """True se a resposta deve ser NDJSON (HTTP 400 para formato desconhecido)"""
+    if formato not in FORMATOS_RESPOSTA:
+        raise HTTPException(status_code=400, detail=f"format deve ser um de: {', '.join(FORMATOS_RESPOSTA)}")
+    return formato == "ndjson"
+
+
+def linha_ndjson(objeto: Any) -> bytes:
+    return (json.dumps(objeto, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+def _com_erro(linhas: Iterable[Dict]) -> Iterator[bytes]:
+    try:
+        for linha in linhas:
+            yield linha_ndjson(linha)
+    except Exception as e:
+        traceback.print_exc()
+        yield linha_ndjson({"_erro": str(e)})
+
+
+async def _com_erro_async(linhas: AsyncIterator[Dict]) -> AsyncIterator[bytes]:
+    try:
+        async for linha in linhas:
+            yield linha_ndjson(linha)
+    except Exception as e:
+        traceback.print_exc()
+        yield linha_ndjson({"_erro": str(e)})
+
+
+def resposta_ndjson(linhas: Union[Iterable[Dict], AsyncIterator[Dict]]) -> StreamingResponse:
+    """
+    StreamingResponse que serializa `linhas` uma a uma
+
+    Geradores síncronos rodam no threadpool do Starlette (parse de PDF e
+    leitura do índice não travam o event loop); geradores assíncronos rodam
+    no próprio loop.
+    """
+    if hasattr(linhas, "__aiter__"):
+        corpo = _com_erro_async(linhas)
+    else:
+        corpo = _com_erro(linhas)
+    return StreamingResponse(corpo, media_type=MEDIA_TYPE_NDJSON)
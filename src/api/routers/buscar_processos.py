@@ -1,9 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Optional, Dict
 import requests
 from src.utils.comarcas import get_comarca_nome, extrair_codigo_comarca, formatar_numero_cnj
 from src.utils.cache_datajud import ler_cache, salvar_cache, filtrar_processos, status_cache
+from src.api.ndjson import resposta_ndjson, validar_formato
 
 router = APIRouter()
 
@@ -108,8 +109,69 @@ async def _buscar_api_cnj(tribunal: str, tipo: str, quantidade: int = 1000) -> L
         print(f"❌ Erro ao chamar API CNJ: {e}")
         return []
 
+async def _processos_tribunal_tipo(tribunal: str, tipo: str, request: BuscarProcessosRequest) -> List[Dict]:
+    """Processos de um tribunal/tipo: cache local válido ou API CNJ (que alimenta o cache)"""
+    # TENTAR LER DO CACHE PRIMEIRO
+    cache_data = None
+    if request.usar_cache:
+        cache_data = ler_cache(tribunal, tipo)
+
+    if cache_data:
+        # CACHE VÁLIDO - BUSCA INSTANTÂNEA!
+        print(f"⚡ Usando cache para {tribunal} - {tipo}")
+        return cache_data.get("processos", [])
+
+    # CACHE INVÁLIDO - CHAMAR API CNJ
+    print(f"🌐 Chamando API CNJ para {tribunal} - {tipo}...")
+    processos_cache = await _buscar_api_cnj(tribunal, tipo, request.quantidade)
+
+    # Salvar no cache
+    if processos_cache:
+        salvar_cache(tribunal, tipo, processos_cache)
+
+    return processos_cache
+
+
+async def _linhas_buscar_processos(request: BuscarProcessosRequest):
+    """
+    Modo NDJSON de /buscar-processos: filtra e envia cada tribunal/tipo assim que chega
+
+    Mesmo resultado (e ordem) do modo JSON - concatenação dos tribunais/tipos,
+    filtrada e cortada em `quantidade` -, mas só um lote fica em memória, e
+    os tribunais/tipos seguintes nem são buscados depois da quantidade.
+    """
+    restantes = request.quantidade
+    total_antes_filtros = 0
+
+    for tribunal in request.tribunais:
+        for tipo in request.tipos_processo:
+            if restantes <= 0:
+                break
+
+            lote = await _processos_tribunal_tipo(tribunal, tipo, request)
+            total_antes_filtros += len(lote)
+
+            filtrados = filtrar_processos(
+                processos=lote,
+                comarcas=request.comarcas,
+                valor_min=request.valor_causa_min,
+                valor_max=request.valor_causa_max,
+                data_inicio=request.data_inicio,
+                data_fim=request.data_fim
+            )
+
+            for processo in filtrados[:restantes]:
+                yield processo
+            restantes -= min(len(filtrados), restantes)
+
+    yield {"_resumo": {
+        "total_processos": request.quantidade - restantes,
+        "total_antes_filtros": total_antes_filtros
+    }}
+
+
 @router.post("/buscar-processos")
-async def buscar_processos(request: BuscarProcessosRequest):
+async def buscar_processos(request: BuscarProcessosRequest, formato: str = Query("json", alias="format")):
     """
     🚀 Busca processos na API DataJud com CACHE INTELIGENTE
 
@@ -120,7 +182,13 @@ async def buscar_processos(request: BuscarProcessosRequest):
     FILTROS:
     - Tribunal, tipo, comarca, valor, data
     - Expandir "São Paulo" para todos foros da capital
+
+    Com format=ndjson, cada processo é enviado numa linha assim que o
+    tribunal/tipo dele chega (cache ou API CNJ); a última linha é
+    {"_resumo": {"total_processos", "total_antes_filtros"}}.
     """
+    ndjson = validar_formato(formato)
+
     try:
         print(f"\n{'='*80}")
         print(f"🔍 BUSCA API DATAJUD")
@@ -133,30 +201,15 @@ async def buscar_processos(request: BuscarProcessosRequest):
         if request.comarcas:
             request.comarcas = expandir_sao_paulo(request.comarcas)
 
+        if ndjson:
+            return resposta_ndjson(_linhas_buscar_processos(request))
+
         todos_processos = []
 
         for tribunal in request.tribunais:
             for tipo in request.tipos_processo:
-                # TENTAR LER DO CACHE PRIMEIRO
-                cache_data = None
-                if request.usar_cache:
-                    cache_data = ler_cache(tribunal, tipo)
-
-                if cache_data:
-                    # CACHE VÁLIDO - BUSCA INSTANTÂNEA!
-                    print(f"⚡ Usando cache para {tribunal} - {tipo}")
-                    processos_cache = cache_data.get("processos", [])
-                else:
-                    # CACHE INVÁLIDO - CHAMAR API CNJ
-                    print(f"🌐 Chamando API CNJ para {tribunal} - {tipo}...")
-                    processos_cache = await _buscar_api_cnj(tribunal, tipo, request.quantidade)
-
-                    # Salvar no cache
-                    if processos_cache:
-                        salvar_cache(tribunal, tipo, processos_cache)
-
                 # Adicionar processos
-                todos_processos.extend(processos_cache)
+                todos_processos.extend(await _processos_tribunal_tipo(tribunal, tipo, request))
 
         # APLICAR FILTROS (comarca, valor, data) - INSTANTÂNEO!
         print(f"\n📊 Total antes de filtros: {len(todos_processos)}")
@@ -2,14 +2,17 @@
 Router para busca de processos via DJE (Diário de Justiça Eletrônico)
 Precisão absoluta com filtros avançados
 """
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
+from collections import Counter
 import os
 from src.scrapers.dje_downloader import baixar_dje_intervalo, obter_cadernos_por_comarca
-from src.scrapers.dje_parser import extrair_processos_dje
-from src.utils.indexador_dje import indexar_todos_pdfs, ler_cache, filtrar_processos_cache, ordenar_processos
+from src.scrapers.dje_parser import extrair_processos_dje, iter_processos_dje
+from src.utils.indexador_dje import indexar_todos_pdfs, ler_cache, iter_processos_cache, detalhes_processo_cache, BuscaInvalida, CursorExpirado
+from src.api.ndjson import resposta_ndjson, validar_formato
 from src.database import SessionLocal
 from src.models.processo import Processo
 from sqlalchemy.exc import IntegrityError
@@ -37,16 +40,109 @@ class BuscarDJEResponse(BaseModel):
     pdfs_processados: int
     estatisticas: dict
 
+# Modo NDJSON de /buscar: processos gravados no banco em lotes deste tamanho
+LOTE_BANCO_NDJSON = 200
+
+
+def _novas_estatisticas() -> dict:
+    return {
+        "pdfs_processados": 0,
+        "processos_encontrados": 0,
+        "processos_rejeitados": 0,
+        "por_tipo": {},
+        "por_relevancia": {},
+        "por_comarca": {}
+    }
+
+
+def _contar_processo(estatisticas: dict, p: dict) -> None:
+    # Por tipo
+    tipo = p.get("tipo", "Desconhecido")
+    estatisticas["por_tipo"][tipo] = estatisticas["por_tipo"].get(tipo, 0) + 1
+
+    # Por relevância
+    rel = p.get("relevancia", "Desconhecida")
+    estatisticas["por_relevancia"][rel] = estatisticas["por_relevancia"].get(rel, 0) + 1
+
+    # Por comarca
+    comarca = p.get("comarca", "Desconhecida")
+    estatisticas["por_comarca"][comarca] = estatisticas["por_comarca"].get(comarca, 0) + 1
+
+
+def _linhas_busca_dje(request: BuscarDJERequest, pdfs: List[str]):
+    """
+    Modo NDJSON de /buscar: cada processo sai assim que o parser o aprova
+
+    Mesmos filtros e estatísticas do modo JSON; com salvar_no_banco, os
+    processos vão para o banco em lotes de LOTE_BANCO_NDJSON. A última
+    linha é o {"_resumo": ...} com os campos de BuscarDJEResponse.
+    """
+    estatisticas = _novas_estatisticas()
+    pendentes = []
+
+    def salvar_pendentes():
+        salvos, duplicados = salvar_processos_dje(pendentes)
+        estatisticas["salvos_bd"] = estatisticas.get("salvos_bd", 0) + salvos
+        estatisticas["duplicados_bd"] = estatisticas.get("duplicados_bd", 0) + duplicados
+        pendentes.clear()
+
+    for pdf_path in pdfs:
+        if not os.path.exists(pdf_path):
+            print(f"⚠️  PDF não encontrado: {pdf_path}")
+            continue
+
+        print(f"\n📄 Processando: {os.path.basename(pdf_path)}")
+
+        for processo in iter_processos_dje(
+            pdf_path=pdf_path,
+            tipos=request.tipos_processo,
+            filtrar_imoveis=request.apenas_imoveis,
+            filtrar_ativos=request.apenas_ativos,
+            comarcas_filtro=request.comarcas if request.comarcas else None,
+            valor_min=request.valor_min,
+            valor_max=request.valor_max
+        ):
+            estatisticas["processos_encontrados"] += 1
+            _contar_processo(estatisticas, processo)
+
+            if request.salvar_no_banco:
+                pendentes.append(processo)
+                if len(pendentes) >= LOTE_BANCO_NDJSON:
+                    salvar_pendentes()
+
+            yield processo
+
+        estatisticas["pdfs_processados"] += 1
+
+    if pendentes:
+        salvar_pendentes()
+
+    print(f"🎉 BUSCA CONCLUÍDA (NDJSON): {estatisticas['processos_encontrados']} processos")
+
+    yield {"_resumo": {
+        "total_processos": estatisticas["processos_encontrados"],
+        "pdfs_processados": estatisticas["pdfs_processados"],
+        "estatisticas": estatisticas
+    }}
+
+
 @router.post("/buscar", response_model=BuscarDJEResponse)
-async def buscar_processos_dje(request: BuscarDJERequest):
+async def buscar_processos_dje(request: BuscarDJERequest, formato: str = Query("json", alias="format")):
     """
     Busca processos no DJE com precisão absoluta
 
     Fluxo:
     1. Baixa PDFs do DJE para o intervalo de datas
-    2. Faz parsing com filtros precisos (imóveis, ativos, comarca, valor)
+    2. Aplica filtros precisos (imóveis, ativos, comarca, valor) sobre os
+       registros canônicos de cada PDF (o PDF só é parseado no primeiro acesso)
     3. Retorna apenas processos que atendem TODOS os critérios
+
+    Com format=ndjson, os passos 2-4 acontecem enquanto a resposta é
+    enviada: um processo por linha, assim que aprovado, e um último
+    {"_resumo": ...} com total, PDFs processados e estatísticas.
     """
+    ndjson = validar_formato(formato)
+
     try:
         print("\n" + "="*80)
         print("🔍 BUSCA DJE INICIADA")
@@ -79,17 +175,13 @@ async def buscar_processos_dje(request: BuscarDJERequest):
 
         print(f"✅ {len(pdfs)} PDFs baixados")
 
+        if ndjson:
+            return resposta_ndjson(_linhas_busca_dje(request, pdfs))
+
         # PASSO 2: Processar cada PDF com filtros
         print("\n🔍 PASSO 2: Processando PDFs com filtros...")
         todos_processos = []
-        estatisticas = {
-            "pdfs_processados": 0,
-            "processos_encontrados": 0,
-            "processos_rejeitados": 0,
-            "por_tipo": {},
-            "por_relevancia": {},
-            "por_comarca": {}
-        }
+        estatisticas = _novas_estatisticas()
 
         for pdf_path in pdfs:
             if not os.path.exists(pdf_path):
@@ -116,17 +208,7 @@ async def buscar_processos_dje(request: BuscarDJERequest):
         estatisticas["processos_encontrados"] = len(todos_processos)
 
         for p in todos_processos:
-            # Por tipo
-            tipo = p.get("tipo", "Desconhecido")
-            estatisticas["por_tipo"][tipo] = estatisticas["por_tipo"].get(tipo, 0) + 1
-
-            # Por relevância
-            rel = p.get("relevancia", "Desconhecida")
-            estatisticas["por_relevancia"][rel] = estatisticas["por_relevancia"].get(rel, 0) + 1
-
-            # Por comarca
-            comarca = p.get("comarca", "Desconhecida")
-            estatisticas["por_comarca"][comarca] = estatisticas["por_comarca"].get(comarca, 0) + 1
+            _contar_processo(estatisticas, p)
 
         # PASSO 4: Salvar no banco (opcional)
         if request.salvar_no_banco and todos_processos:
@@ -420,9 +502,12 @@ async def baixar_pdfs_automatico(
 async def teste_simples():
     """
     Teste simples: processa 1 PDF sem filtros para verificar se está funcionando
+
+    Usa o modo scan do parser (número, tipo, classe e página): o teste não
+    precisa de partes/advogados/valor.
     """
     import os
-    from src.scrapers.dje_parser import extrair_processos_dje
+    from src.scrapers.dje_parser import escanear_processos_dje
 
     pdfs_dir = "data/dje_pdfs"
 
@@ -444,12 +529,9 @@ async def teste_simples():
 
     try:
         # Processar SEM FILTROS
-        processos = extrair_processos_dje(
+        processos = escanear_processos_dje(
             pdf_path=pdf_teste,
-            tipos=["Inventário", "Divórcio"],
-            filtrar_imoveis=False,
-            filtrar_ativos=False,
-            comarcas_filtro=None
+            tipos=["Inventário", "Divórcio"]
         )
 
         return {
@@ -531,19 +613,29 @@ async def buscar_cache_instantaneo(
     valor_max: Optional[float] = None,
     data_inicio: Optional[str] = None,
     data_fim: Optional[str] = None,
-    ordenar_por: str = "relevancia_desc"
+    ordenar_por: str = "relevancia_desc",
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    formato: str = Query("json", alias="format"),
+    parte: Optional[str] = None,
+    advogado: Optional[str] = None
 ):
     """
-    🚀 BUSCA INSTANTÂNEA - Usa cache JSON pré-processado
+    🚀 BUSCA INSTANTÂNEA - Usa o índice colunar pré-processado
 
     VELOCIDADE: < 100ms (ao invés de 2+ minutos)
 
-    Este endpoint lê um arquivo JSON que contém TODOS os processos
-    já extraídos dos PDFs. A busca é EXTREMAMENTE RÁPIDA porque
-    apenas filtra dados já processados.
+    Este endpoint abre (via mmap) o índice com TODOS os processos já
+    extraídos dos PDFs (src/utils/indice_dje.py). A busca é EXTREMAMENTE
+    RÁPIDA porque só lê as colunas filtradas, sem carregar o índice inteiro.
 
     IMPORTANTE: O cache precisa ser gerado primeiro com /reindexar
 
+    Filtros e ordenações (inclusive valor) usam só as colunas do índice:
+    nenhum PDF é aberto. Processos indexados em modo leve trazem os nomes
+    (nomes_partes/nomes_advogados, sem rótulo nem OAB); partes e advogados
+    completos de um processo vêm de GET /processo-cache/{numero}.
+
     Args:
         ordenar_por: Critério de ordenação dos resultados
             - "relevancia_desc": Alta relevância primeiro (padrão)
@@ -552,22 +644,34 @@ async def buscar_cache_instantaneo(
             - "data_asc": Mais antigo primeiro
             - "valor_desc": Maior valor primeiro
             - "valor_asc": Menor valor primeiro
+        limit: Processos por página (sem limit, devolve todos de uma vez)
+        cursor: "proximo_cursor" da página anterior. Vale só para a mesma
+            busca (filtros e ordenação) e a mesma versão do índice: depois
+            de uma reindexação o cursor expira (410) e a busca recomeça.
+        parte: Nome (ou parte dele) de uma das partes - sem diferenciar
+            acento/maiúscula, cada palavra casa por prefixo ("jose silv"
+            encontra "JOSÉ DA SILVA"); usa o índice de termos, sem varredura
+        advogado: Idem, para os advogados
+        format: "json" (padrão) ou "ndjson" - um processo por linha, enviado
+            à medida que sai do índice, e uma última linha {"_resumo": ...}
+            com os demais campos da resposta (src/api/ndjson.py)
     """
-    try:
-        cache_path = "data/dje_cache.json"
+    ndjson = validar_formato(formato)
+    if limit is not None and limit < 1:
+        raise HTTPException(status_code=400, detail="limit deve ser maior que zero")
 
-        # Verificar se cache existe
-        if not os.path.exists(cache_path):
-            raise HTTPException(
-                status_code=404,
-                detail="Cache não encontrado. Execute /api/dje/reindexar primeiro para gerar o índice."
-            )
+    try:
+        # Abrir índice (FileNotFoundError -> 404)
+        cache = ler_cache()
 
-        # Ler cache
-        cache = ler_cache(cache_path)
+        # LIMITE DE 100 PROCESSOS PARA BUSCAS ABERTAS
+        # "Em comarcas maiores como São Paulo Capital, numa pesquisa aberta,
+        # puxe os 100 processos mais recentes"
+        limite_aplicado = data_inicio is None and data_fim is None
 
-        # Filtrar processos (INSTANTÂNEO!)
-        processos_filtrados = filtrar_processos_cache(
+        # Filtrar, ordenar e (busca aberta) pegar os 100 mais recentes (INSTANTÂNEO!)
+        # Só os processos devolvidos viram dict
+        processos_filtrados, total_antes_limite, proximo_cursor = iter_processos_cache(
             cache=cache,
             tipos=tipos_processo,
             comarcas=comarcas,
@@ -576,51 +680,15 @@ async def buscar_cache_instantaneo(
             valor_min=valor_min,
             valor_max=valor_max,
             data_inicio=data_inicio,
-            data_fim=data_fim
+            data_fim=data_fim,
+            ordenar_por=ordenar_por,
+            limite_recentes=100 if limite_aplicado else None,
+            limite=limit,
+            cursor=cursor,
+            parte=parte,
+            advogado=advogado
         )
-
-        # Ordenar processos (INSTANTÂNEO!)
-        processos_filtrados = ordenar_processos(
-            processos=processos_filtrados,
-            ordenar_por=ordenar_por
-        )
-
-        # LIMITE DE 100 PROCESSOS PARA BUSCAS ABERTAS
-        # "Em comarcas maiores como São Paulo Capital, numa pesquisa aberta,
-        # puxe os 100 processos mais recentes"
-        total_antes_limite = len(processos_filtrados)
-        limite_aplicado = False
-
-        if data_inicio is None and data_fim is None:
-            # Busca aberta (sem filtro de data): limitar a 100 mais recentes
-            # Primeiro, ordenar por data para garantir que pegamos os mais recentes
-            from datetime import datetime
-
-            def get_data_processo(p):
-                data_pdf = p.get("data_pdf", "01-01-2000")
-                try:
-                    return datetime.strptime(data_pdf, "%d-%m-%Y")
-                except:
-                    return datetime(2000, 1, 1)
-
-            # Ordenar por data (mais recente primeiro) temporariamente
-            processos_ordenados_data = sorted(processos_filtrados, key=get_data_processo, reverse=True)
-
-            # Pegar os 100 mais recentes
-            processos_filtrados = processos_ordenados_data[:100]
-
-            # Agora reaplicar a ordenação original escolhida pelo usuário
-            processos_filtrados = ordenar_processos(
-                processos=processos_filtrados,
-                ordenar_por=ordenar_por
-            )
-
-            limite_aplicado = True
-
-        # Estatísticas
-        from collections import Counter
-        tipos_count = Counter(p.get("tipo") for p in processos_filtrados)
-        relevancia_count = Counter(p.get("relevancia") for p in processos_filtrados)
+        total_resultados = min(total_antes_limite, 100) if limite_aplicado else total_antes_limite
 
         # Descrição da ordenação
         ordenacao_desc = {
@@ -636,57 +704,118 @@ async def buscar_cache_instantaneo(
         if limite_aplicado:
             mensagem = f"Busca aberta: retornando os 100 processos mais recentes de {total_antes_limite} encontrados."
         else:
-            mensagem = f"Busca com filtro de data: {len(processos_filtrados)} processos encontrados."
+            mensagem = f"Busca com filtro de data: {total_resultados} processos encontrados."
 
-        return {
-            "total_processos": len(processos_filtrados),
-            "total_processos_antes_limite": total_antes_limite if limite_aplicado else len(processos_filtrados),
-            "limite_aplicado": limite_aplicado,
-            "processos": processos_filtrados,
-            "pdfs_disponiveis_total": cache["total_pdfs"],
-            "pdfs_processados_sucesso": cache["total_pdfs"],
-            "data_indexacao": cache["data_indexacao"],
-            "ordenacao": {
-                "criterio": ordenar_por,
-                "descricao": ordenacao_desc.get(ordenar_por, "Sem ordenação")
-            },
-            "estatisticas": {
-                "por_tipo": dict(tipos_count),
-                "por_relevancia": dict(relevancia_count)
-            },
-            "mensagem": mensagem,
-            "cache_info": {
-                "total_processos_indexados": cache["total_processos"],
-                "total_pdfs_indexados": cache["total_pdfs"]
+        def resumo(total_processos: int, tipos_count: Counter, relevancia_count: Counter) -> dict:
+            return {
+                "total_processos": total_processos,
+                "total_processos_antes_limite": total_antes_limite if limite_aplicado else total_resultados,
+                "limite_aplicado": limite_aplicado,
+                "paginacao": {
+                    "limit": limit,
+                    "total_resultados": total_resultados,
+                    "proximo_cursor": proximo_cursor
+                },
+                "pdfs_disponiveis_total": cache.meta["total_pdfs"],
+                "pdfs_processados_sucesso": cache.meta["total_pdfs"],
+                "data_indexacao": cache.meta["data_indexacao"],
+                "ordenacao": {
+                    "criterio": ordenar_por,
+                    "descricao": ordenacao_desc.get(ordenar_por, "Sem ordenação")
+                },
+                "estatisticas": {
+                    "por_tipo": dict(tipos_count),
+                    "por_relevancia": dict(relevancia_count)
+                },
+                "mensagem": mensagem,
+                "cache_info": {
+                    "total_processos_indexados": cache.meta["total_processos"],
+                    "total_pdfs_indexados": cache.meta["total_pdfs"]
+                }
             }
+
+        if ndjson:
+            # Cada processo sai do índice e é enviado; o resumo vem no fim
+            def linhas():
+                tipos_count, relevancia_count = Counter(), Counter()
+                enviados = 0
+                for processo in processos_filtrados:
+                    tipos_count[processo.get("tipo")] += 1
+                    relevancia_count[processo.get("relevancia")] += 1
+                    enviados += 1
+                    yield processo
+                yield {"_resumo": resumo(enviados, tipos_count, relevancia_count)}
+
+            return resposta_ndjson(linhas())
+
+        processos_filtrados = list(processos_filtrados)
+
+        # Estatísticas
+        tipos_count = Counter(p.get("tipo") for p in processos_filtrados)
+        relevancia_count = Counter(p.get("relevancia") for p in processos_filtrados)
+
+        return {
+            **resumo(len(processos_filtrados), tipos_count, relevancia_count),
+            "processos": processos_filtrados
         }
 
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except CursorExpirado as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    except BuscaInvalida as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/processo-cache/{numero}")
+async def processo_cache(numero: str):
+    """
+    Um processo do índice com partes e advogados
+
+    Registros leves guardam só o ponteiro (página, offset) para o bloco do
+    processo no PDF: partes e advogados são extraídos aqui, numa thread
+    (fora do event loop), e ficam memorizados para as próximas chamadas.
+    """
+    try:
+        cache = ler_cache()
+        processo = await run_in_threadpool(detalhes_processo_cache, cache, numero)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    if processo is None:
+        raise HTTPException(status_code=404, detail=f"Processo {numero} não está no índice")
+    return processo
+
+
 @router.post("/reindexar")
-async def reindexar_pdfs(background_tasks: BackgroundTasks, limite_pdfs: Optional[int] = None):
+async def reindexar_pdfs(
+    background_tasks: BackgroundTasks,
+    limite_pdfs: Optional[int] = None,
+    reconstruir: bool = False
+):
     """
-    Reindexar PDFs e gerar cache JSON
+    Reindexar PDFs e gerar o índice colunar
 
     Args:
         limite_pdfs: Quantidade máxima de PDFs a processar (mais recentes primeiro).
-                     None = processar todos.
-                     Use 10-15 para evitar problemas de memória no Railway.
+                     None = processar todos. A memória fica limitada pelos
+                     workers da indexação (DJE_INDEXACAO_WORKERS e
+                     DJE_INDEXACAO_LIMITE_RSS_MB), não pela quantidade de PDFs.
+        reconstruir: Reparseia todos os PDFs. Por padrão só PDFs novos ou
+                     alterados desde a última indexação são parseados.
 
-    ATENÇÃO: Este processo leva 5-20 minutos dependendo do limite.
+    ATENÇÃO: Uma reconstrução completa leva 5-20 minutos dependendo do limite.
 
     Após a indexação, todas as buscas serão INSTANTÂNEAS!
     """
     def indexar_background():
         try:
             print("\n🚀 Iniciando indexação em background...")
-            cache = indexar_todos_pdfs(limite_pdfs=limite_pdfs)
+            cache = indexar_todos_pdfs(limite_pdfs=limite_pdfs, reconstruir=reconstruir)
             print(f"✅ Indexação concluída! {cache['total_processos']} processos indexados.")
         except Exception as e:
             print(f"❌ Erro na indexação: {e}")
@@ -701,14 +830,16 @@ async def reindexar_pdfs(background_tasks: BackgroundTasks, limite_pdfs: Optiona
             "mensagem": f"Indexação iniciada (limitada a {limite_pdfs} PDFs mais recentes). Isso levará 5-10 minutos.",
             "info": "Acompanhe o progresso nos logs do servidor. Após concluir, use /buscar-cache-instantaneo para buscas rápidas.",
             "modo": "limitado",
-            "limite": limite_pdfs
+            "limite": limite_pdfs,
+            "reconstruir": reconstruir
         }
     else:
         return {
             "status": "iniciado",
             "mensagem": "Indexação iniciada em background (TODOS os PDFs). Isso levará 10-20 minutos.",
             "info": "Acompanhe o progresso nos logs do servidor. Após concluir, use /buscar-cache-instantaneo para buscas rápidas.",
-            "modo": "completo"
+            "modo": "completo",
+            "reconstruir": reconstruir
         }
 
 
@@ -725,7 +856,8 @@ async def processar_pdfs_cache(
     """
     ⚠️ DEPRECATED: Use /buscar-cache-instantaneo para buscas rápidas
 
-    Este endpoint processa PDFs em tempo real (LENTO - 30s por PDF)
+    Este endpoint processa PDFs em tempo real: o primeiro acesso a cada PDF é
+    LENTO (parsing completo); os seguintes só filtram os registros guardados
     """
     try:
         pdfs_dir = "data/dje_pdfs"
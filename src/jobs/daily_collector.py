@@ -14,7 +14,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Configurar Celery
-celery_app = Celery('judicial_aggregator')
+celery_app = Celery('judicial_aggregator', include=['src.jobs.dje_tasks'])
 celery_app.config_from_object('src.celery_config')
 
 @celery_app.task(name='daily_collector')
@@ -0,0 +1,116 @@
+"""
+Tasks do Celery para parsear um caderno do DJE em paralelo entre workers
+
+Um caderno grande (caderno 12 tem ~1.500 páginas) prendia um worker por
+minutos. processar_pdf_dje divide as páginas com número .8.26. em tarefas
+de ~PAGINAS_POR_TAREFA (planejar_intervalos_dje; cada tarefa é uma lista
+de faixas de páginas), cada tarefa vira uma task parsear_intervalo_dje, e
+reduzir_intervalos_dje junta os registros na ordem das páginas, guarda
+como registros do PDF e aplica os filtros (com dedup) exatamente como o
+parse serial.
+
+O PDF precisa estar num caminho visível por todos os workers (volume
+compartilhado).
+
+Uso:
+    from src.jobs.dje_tasks import processar_pdf_dje
+    resultado = processar_pdf_dje.delay(
+        "data/dje_pdfs/dje_15-11-2025_cad12.pdf",
+        filtros={"tipos": ["Inventário", "Divórcio"], "filtrar_imoveis": True}
+    ).get()
+"""
+import logging
+import os
+from typing import Dict, List, Optional
+from celery import chord, group
+from src.jobs.daily_collector import celery_app
+from src.scrapers.dje_parser import (
+    JANELA_ENTRE_PAGINAS,
+    PAGINAS_POR_TAREFA,
+    filtrar_registros,
+    juntar_registros_dje,
+    novos_rejeitados,
+    planejar_intervalos_dje,
+    registros_guardados_dje,
+    registros_intervalo_dje
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _resultado(pdf_path: str, registros: List[Dict], filtros: Dict) -> Dict:
+    """Filtra os registros canônicos do PDF e monta o resultado (JSON) da task"""
+    rejeitados = novos_rejeitados()
+    processos = list(filtrar_registros(registros, processos_rejeitados=rejeitados, **filtros))
+    return {
+        "pdf": os.path.basename(pdf_path),
+        "total": len(processos),
+        "processos": processos,
+        "rejeitados": rejeitados
+    }
+
+
+@celery_app.task(name='dje_parsear_intervalo')
+def parsear_intervalo_dje(
+    pdf_path: str,
+    faixas: List[List[int]],
+    backend: Optional[str] = None,
+    janela_paginas: int = JANELA_ENTRE_PAGINAS
+) -> List[Dict]:
+    """Registros canônicos das faixas [page_start, page_end] (1-based, inclusivas) de uma tarefa"""
+    paginas = sum(fim - inicio + 1 for inicio, fim in faixas)
+    logger.info(f"📑 {os.path.basename(pdf_path)}: páginas {faixas[0][0]}-{faixas[-1][1]} ({paginas} em {len(faixas)} faixas)")
+    return registros_intervalo_dje(pdf_path, faixas, backend=backend, janela_paginas=janela_paginas)
+
+
+@celery_app.task(name='dje_reduzir_intervalos')
+def reduzir_intervalos_dje(
+    partes: List[List[Dict]],
+    pdf_path: str,
+    filtros: Optional[Dict] = None,
+    backend: Optional[str] = None,
+    janela_paginas: int = JANELA_ENTRE_PAGINAS
+) -> Dict:
+    """Junta as tarefas (o chord entrega na ordem do group) e aplica os filtros"""
+    registros = juntar_registros_dje(pdf_path, partes, backend=backend, janela_paginas=janela_paginas)
+    resultado = _resultado(pdf_path, registros, filtros or {})
+    logger.info(f"✅ {resultado['pdf']}: {resultado['total']} processos ({len(partes)} tarefas)")
+    return resultado
+
+
+@celery_app.task(name='dje_processar_pdf', bind=True)
+def processar_pdf_dje(
+    self,
+    pdf_path: str,
+    filtros: Optional[Dict] = None,
+    paginas_por_tarefa: int = PAGINAS_POR_TAREFA,
+    backend: Optional[str] = None,
+    janela_paginas: int = JANELA_ENTRE_PAGINAS
+):
+    """
+    Fan-out de um PDF em tarefas de páginas + reduce com dedup
+
+    Args:
+        pdf_path: Caminho do PDF (visível para todos os workers)
+        filtros: Argumentos de filtrar_registros (tipos, filtrar_imoveis,
+                 filtrar_ativos, comarcas_filtro, valor_min, valor_max)
+        paginas_por_tarefa: Páginas (aproximadas) de cada tarefa
+        backend: Extrator de texto (None = DJE_PDF_BACKEND)
+        janela_paginas: Chars das páginas vizinhas no contexto
+    """
+    filtros = filtros or {}
+
+    # PDF já parseado: só os filtros, sem fan-out
+    registros = registros_guardados_dje(pdf_path, backend, janela_paginas)
+    if registros is not None:
+        return _resultado(pdf_path, registros, filtros)
+
+    tarefas = planejar_intervalos_dje(pdf_path, paginas_por_tarefa)
+    if not tarefas:
+        return _resultado(pdf_path, juntar_registros_dje(pdf_path, [], backend, janela_paginas), filtros)
+
+    logger.info(f"🚀 {os.path.basename(pdf_path)}: {len(tarefas)} tarefas de ~{paginas_por_tarefa} páginas")
+    return self.replace(chord(
+        group(parsear_intervalo_dje.s(pdf_path, faixas, backend, janela_paginas) for faixas in tarefas),
+        reduzir_intervalos_dje.s(pdf_path, filtros, backend, janela_paginas)
+    ))
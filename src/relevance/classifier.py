@@ -1,10 +1,16 @@
 import os
 from typing import Dict
 import yaml
+from src.utils.palavras_chave import KeywordMatcher
 
 class RelevanceClassifier:
     def __init__(self):
         self.rules = self._load_rules()
+        # Keywords de Alta e Média compiladas juntas: uma passada por texto
+        self.matcher = KeywordMatcher({
+            nivel: self.rules.get(nivel, {}).get("movimentos_keywords", [])
+            for nivel in ("Alta", "Média")
+        })
     
     def _load_rules(self) -> Dict:
         rules_path = os.path.join("config", "rules.yaml")
@@ -26,12 +32,10 @@ class RelevanceClassifier:
         return "Baixa"
     
     def classify_movement(self, movement_text: str) -> str:
-        text_lower = movement_text.lower()
-        alta_keywords = self.rules.get("Alta", {}).get("movimentos_keywords", [])
-        if any(kw in text_lower for kw in alta_keywords):
+        niveis = self.matcher.categorias(movement_text)
+        if "Alta" in niveis:
             return "Alta"
-        media_keywords = self.rules.get("Média", {}).get("movimentos_keywords", [])
-        if any(kw in text_lower for kw in media_keywords):
+        if "Média" in niveis:
             return "Média"
         return "Baixa"
     
@@ -41,21 +45,16 @@ class RelevanceClassifier:
         valor_causa = process_data.get("valor_causa", 0) or 0
         if valor_causa >= min_value:
             return True
-        keywords = rules.get("movimentos_keywords", [])
         movements = process_data.get("movements", [])
         for mov in movements:
-            desc = mov.get("descricao_norm", "").lower()
-            if any(kw in desc for kw in keywords):
+            if self.matcher.contem(mov.get("descricao_norm", ""), "Alta"):
                 return True
         return False
     
     def _check_media(self, process_data: Dict) -> bool:
-        rules = self.rules.get("Média", {})
-        keywords = rules.get("movimentos_keywords", [])
         movements = process_data.get("movements", [])
         for mov in movements:
-            desc = mov.get("descricao_norm", "").lower()
-            if any(kw in desc for kw in keywords):
+            if self.matcher.contem(mov.get("descricao_norm", ""), "Média"):
                 return True
         return False
 
@@ -4,6 +4,7 @@ Analisa movimentações buscando palavras-chave que indicam IMÓVEIS
 import json
 from src.database import get_db
 from src.models import Processo
+from src.utils.palavras_chave import KeywordMatcher
 
 PALAVRAS_IMOVEIS = [
     "matrícula", "matricula", "imóvel", "imovel", "imóveis", "imoveis",
@@ -18,6 +19,8 @@ PALAVRAS_SITUACAO = [
     "alienação judicial", "alienacao judicial", "partilha", "arrolamento"
 ]
 
+MATCHER = KeywordMatcher({"imovel": PALAVRAS_IMOVEIS, "situacao": PALAVRAS_SITUACAO})
+
 print("🔍 ANALISANDO ÚLTIMOS 500 PROCESSOS COM MOVIMENTAÇÕES")
 print("="*60)
 
@@ -42,10 +45,11 @@ for processo in processos:
         if not movs or len(movs) == 0:
             continue
             
-        texto_completo = " ".join(movs).lower()
+        texto_completo = " ".join(movs)
         
-        tem_imovel = any(palavra.lower() in texto_completo for palavra in PALAVRAS_IMOVEIS)
-        tem_situacao = any(palavra.lower() in texto_completo for palavra in PALAVRAS_SITUACAO)
+        categorias = MATCHER.categorias(texto_completo)
+        tem_imovel = "imovel" in categorias
+        tem_situacao = "situacao" in categorias
         
         if tem_imovel and tem_situacao:
             processo.score_relevancia = 1.0
@@ -6,6 +6,7 @@ import time
 from src.database import get_db
 from src.models import Processo
 from sqlalchemy.exc import IntegrityError
+from src.utils.palavras_chave import KeywordMatcher
 
 PALAVRAS_FINALIZACAO = [
     "sentença extintiva", "sentenca extintiva",
@@ -16,12 +17,14 @@ PALAVRAS_FINALIZACAO = [
     "baixa definitiva"
 ]
 
+MATCHER_FINALIZACAO = KeywordMatcher({"finalizacao": PALAVRAS_FINALIZACAO})
+
 def processo_esta_ativo(movimentos):
     if not movimentos or len(movimentos) == 0:
         return True
     ultimas = movimentos[-15:] if len(movimentos) > 15 else movimentos
     texto = " ".join([m.get("nome", "").lower() for m in ultimas])
-    return not any(palavra in texto for palavra in PALAVRAS_FINALIZACAO)
+    return not MATCHER_FINALIZACAO.contem(texto, "finalizacao")
 
 def coletar_tribunal(tribunal_sigla, api_url, max_processos=5000):
     headers = {
@@ -1,8 +1,16 @@
-import pdfplumber
+import os
 import re
-from typing import List, Dict, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterable, Iterator, List, Dict, Optional
 from datetime import datetime
+from src.utils import registros_dje
+from src.utils.cache_texto_dje import hash_pdf
 from src.utils.comarcas import FOROS_SAO_PAULO_CAPITAL, get_comarca_nome
+from src.utils.palavras_chave import KeywordMatcher
+from src.scrapers.dje_texto import contar_paginas, iter_textos_paginas, obter_backend
+from src.scrapers.dje_secoes import paginas_candidatas, paginas_das_comarcas
 
 # Palavras-chave que indicam presença de IMÓVEIS
 PALAVRAS_IMOVEIS = [
@@ -31,25 +39,26 @@ PALAVRAS_EXTINTO = [
     "cancelado", "suspenso", "sobrestado"
 ]
 
+# Todas as listas compiladas num único matcher: uma passada por contexto
+MATCHER_DJE = KeywordMatcher({
+    "imovel": PALAVRAS_IMOVEIS,
+    "urgencia": PALAVRAS_URGENCIA,
+    "extinto": PALAVRAS_EXTINTO
+})
+
 def tem_imovel(texto: str) -> bool:
     """Verifica se o texto menciona imóveis"""
-    texto_lower = texto.lower()
-    return any(palavra.lower() in texto_lower for palavra in PALAVRAS_IMOVEIS)
+    return MATCHER_DJE.contem(texto, "imovel")
 
 def esta_ativo(texto: str) -> bool:
     """Verifica se processo está ativo (não extinto/arquivado)"""
-    texto_lower = texto.lower()
     # Se menciona palavras de extinção, retorna False
-    if any(palavra.lower() in texto_lower for palavra in PALAVRAS_EXTINTO):
-        return False
-    return True
-
-def calcular_relevancia_imovel(texto: str) -> tuple:
-    """Calcula score de relevância baseado em imóveis e urgência"""
-    texto_lower = texto.lower()
+    return not MATCHER_DJE.contem(texto, "extinto")
 
-    tem_imovel_flag = tem_imovel(texto)
-    tem_urgencia = any(palavra.lower() in texto_lower for palavra in PALAVRAS_URGENCIA)
+def relevancia_por_categorias(categorias) -> tuple:
+    """Score de relevância a partir das categorias já encontradas pelo MATCHER_DJE"""
+    tem_imovel_flag = "imovel" in categorias
+    tem_urgencia = "urgencia" in categorias
 
     if tem_imovel_flag and tem_urgencia:
         return ("Altíssima", 1.0)
@@ -60,6 +69,943 @@ def calcular_relevancia_imovel(texto: str) -> tuple:
     else:
         return ("Baixa", 0.2)
 
+def calcular_relevancia_imovel(texto: str) -> tuple:
+    """Calcula score de relevância baseado em imóveis e urgência"""
+    return relevancia_por_categorias(MATCHER_DJE.categorias(texto))
+
+# Regex para processo: NNNNNNN-DD.AAAA.8.26.OOOO
+PADRAO_PROCESSO = re.compile(r'(\d{7}-\d{2}\.\d{4}\.8\.26\.\d{4})')
+
+# Rejeições que acontecem ANTES do número entrar em processos_unicos
+# (o mesmo número ainda pode ser aceito numa ocorrência posterior)
+MOTIVOS_ANTES_DEDUP = ("classe_nao_identificada", "classe_incompativel", "sem_imovel", "extinto")
+
+# Quantos blocos de páginas cada worker recebe no modo paralelo (balanceamento)
+BLOCOS_POR_WORKER = 4
+
+# Páginas por tarefa quando um caderno é dividido entre workers do Celery
+# (src/jobs/dje_tasks.py)
+PAGINAS_POR_TAREFA = int(os.getenv("DJE_PAGINAS_POR_TAREFA", "100"))
+
+# Versão dos registros canônicos guardados (src/utils/registros_dje.py):
+# incrementar sempre que a extração mudar, para invalidar o que já foi parseado
+VERSAO_REGISTROS = 2
+
+# Chars da página vizinha visíveis para processos perto da quebra de página
+# (400 = quanto de uma publicação quebrada na página entra no bloco dela)
+JANELA_ENTRE_PAGINAS = 400
+
+# Tamanho máximo de um bloco de publicação (número até o próximo número)
+LIMITE_BLOCO = 3000
+
+# Modos do motor de extração (mesmo loop de páginas/blocos):
+#   scan - só número, classe e página (tipo sai da classe): o mais rápido
+#   leve - scan + flags, relevância, valor, nomes de partes/advogados (sem
+#          rótulos/OAB, gravados no índice) e ponteiro (página, offset) para
+#          extrair partes/advogados rotulados sob demanda (detalhes_registro)
+#   full - registro canônico completo (partes, advogados, valor, flags)
+MODO_SCAN = "scan"
+MODO_LEVE = "leve"
+MODO_FULL = "full"
+MODOS = (MODO_SCAN, MODO_LEVE, MODO_FULL)
+
+# Campos que o modo leve deixa para detalhes_registro
+CAMPOS_DETALHE = ("partes", "advogados")
+
+# Tipos do modo scan quando o chamador não informa (contagens/projeções)
+TIPOS_SCAN = ["Inventário", "Arrolamento", "Divórcio", "Alimentos", "Guarda"]
+
+# Formatos de classe do DJE TJSP, em ordem de prioridade:
+# 1a) Distribuição com dois pontos: "CLASSE :DIVÓRCIO CONSENSUAL"
+# 1b) Distribuição sem dois pontos: "Classe\nTutela Antecipada Antecedente"
+# 2) Movimentações: "número - texto - Classe - Comarca"
+FORMATOS_CLASSE = ("classe_dois_pontos", "classe_linha", "classe_movimentacao")
+
+# Rótulos abreviados das relações de distribuição
+ROTULOS_PARTES = {"REQTE": "Requerente", "REQDO": "Requerido"}
+ORDEM_PARTES = ['Apelante', 'Apelado', 'Requerente', 'Requerido', 'Autor', 'Réu']
+
+# Todos os campos de uma publicação numa única regex (um token por alternativa)
+PADRAO_CAMPOS = re.compile(
+    r'(?i:CLASSE[ \t]*:[ \t]*(?P<classe_dois_pontos>[^\n]+))'
+    r'|(?i:\bClasse[ \t]*\n\s*(?P<classe_linha>[^\n]+))'
+    r'|(?i:-\s+(?P<classe_movimentacao>Inventário|Arrolamento(?:\s+(?:Sumário|Comum))?|Divórcio\s+(?:Consensual|Litigioso)|'
+    r'Separação\s+(?:Consensual|Litigiosa)|Alvará\s+Judicial)\s+-)'
+    r'|(?i:Comarca de (?P<comarca>[A-Z][a-zá-úÀ-Ú \t]+))'
+    r'|(?P<parte>(?P<rotulo_parte>Apelante|Apelado|Requerente|Requerido|Autor|Réu|REQTE|REQDO)\s*:\s*'
+    r'(?P<nome_parte>[A-ZÀ-Ú][^-\n]+?))(?:\s*-|\n|$)'
+    r'|(?P<oab>(?P<nome_oab>[A-ZÀ-Ú][A-Za-zá-úÀ-Ú]*(?:[ \t]+[A-Za-zá-úÀ-Ú]+){0,6})[ \t]*\((?P<registro_oab>OAB:\s*\d+/[A-Z]{2})\))'
+    r'|(?P<advogado>ADVOGADO\s*:\s*(?P<inscricao>\d+/[A-Z]{2})\s*-\s*(?P<nome_advogado>[^\n]+))'
+    r'|(?P<valor>R\$\s*(?P<numero_valor>[\d.,]+))',
+    re.MULTILINE
+)
+
+# Cabeçalho e rodapé repetidos em toda página do DJE: ficariam entre o
+# número do processo e a continuação da publicação na página seguinte
+PADRAO_CABECALHO_RODAPE = re.compile(
+    r'^(?:Disponibilização:|Publicação Oficial do Tribunal de Justiça).*(?:\n|$)',
+    re.MULTILINE
+)
+
+
+def _iter_janelas(textos: Iterator[tuple], janela: int) -> Iterator[tuple]:
+    """
+    Costura cada página com as vizinhas: gera (indice, texto, inicio, fim)
+
+    texto = últimos `janela` chars da página anterior + página atual +
+    primeiros `janela` chars da próxima; [inicio, fim) delimita a página
+    atual dentro de texto (só ali se procuram números de processo).
+    Buffer circular de 3 páginas: memória O(janela), não O(documento).
+    Com janela=0 cada página é analisada isolada, como antes.
+    """
+    if not janela:
+        for indice, texto in textos:
+            if texto:
+                yield indice, texto, 0, len(texto)
+        return
+
+    def costurar(anterior, atual, proxima):
+        indice, texto = atual
+        if not texto:
+            return None
+        antes = anterior[1][-janela:] + "\n" if anterior and anterior[1] else ""
+        depois = "\n" + proxima[1][:janela] if proxima and proxima[1] else ""
+        return indice, antes + texto + depois, len(antes), len(antes) + len(texto)
+
+    buffer = deque(maxlen=3)  # (anterior, atual, próxima)
+    for indice, texto in textos:
+        buffer.append((indice, PADRAO_CABECALHO_RODAPE.sub("", texto)))
+        if len(buffer) >= 2:
+            janela_pagina = costurar(buffer[-3] if len(buffer) == 3 else None, buffer[-2], buffer[-1])
+            if janela_pagina:
+                yield janela_pagina
+
+    # Última página: não tem próxima
+    if buffer:
+        janela_pagina = costurar(buffer[-2] if len(buffer) >= 2 else None, buffer[-1], None)
+        if janela_pagina:
+            yield janela_pagina
+
+
+def _iter_paginas(pdf_path: str, inicio: int, fim: int, total_paginas: int, leitura: Dict) -> Iterator[tuple]:
+    """Janelas (indice, texto, inicio, fim) das páginas [inicio, fim), lendo também as vizinhas"""
+    janela = leitura.get("janela", JANELA_ENTRE_PAGINAS)
+    vizinhas = 1 if janela else 0
+
+    textos = iter_textos_paginas(
+        pdf_path,
+        max(0, inicio - vizinhas),
+        min(total_paginas, fim + vizinhas),
+        usar_cache=leitura.get("usar_cache", True),
+        backend=leitura.get("backend")
+    )
+
+    for indice, texto, ini, fim_pagina in _iter_janelas(textos, janela):
+        if inicio <= indice < fim:
+            yield indice, texto, ini, fim_pagina
+
+
+def _campos_bloco(bloco: str) -> Dict:
+    """
+    Extrai todos os campos de UM bloco de publicação numa única passada
+
+    Cada token de PADRAO_CAMPOS é visto uma vez, na ordem do texto. A classe
+    segue a prioridade dos formatos (CLASSE : > Classe\\n > " - Classe - "),
+    não a posição; partes ficam com a primeira ocorrência de cada tipo.
+    """
+    classes = {}
+    comarca = None
+    partes = {}
+    advogados = []
+    valor = None
+
+    for token in PADRAO_CAMPOS.finditer(bloco):
+        tipo = token.lastgroup
+        if tipo in FORMATOS_CLASSE:
+            classes.setdefault(tipo, token.group(tipo).strip())
+        elif tipo == "comarca":
+            comarca = comarca or token.group("comarca").strip()
+        elif tipo == "parte":
+            rotulo = ROTULOS_PARTES.get(token.group("rotulo_parte").upper(), token.group("rotulo_parte"))
+            partes.setdefault(rotulo, token.group("nome_parte").strip())
+        elif tipo == "oab":
+            advogados.append(f"{token.group('nome_oab').strip()} ({token.group('registro_oab')})")
+        elif tipo == "advogado":
+            advogados.append(f"{token.group('nome_advogado').strip()} (OAB: {token.group('inscricao')})")
+        elif tipo == "valor" and valor is None:
+            valor = token.group("numero_valor")
+
+    classe = next((classes[formato] for formato in FORMATOS_CLASSE if classes.get(formato)), None)
+
+    return {
+        'classe': classe,
+        'comarca': comarca,
+        'partes': [f"{rotulo}: {partes[rotulo]}" for rotulo in ORDEM_PARTES if rotulo in partes],
+        'advogados': advogados,
+        'valor_causa': _valor_float(valor)
+    }
+
+
+def _valor_float(valor: Optional[str]) -> Optional[float]:
+    """"1.234,56" -> 1234.56 (None se ausente ou inválido)"""
+    if not valor:
+        return None
+    try:
+        return float(valor.replace('.', '').replace(',', '.'))
+    except ValueError:
+        return None
+
+
+def _campos_leves_bloco(bloco: str) -> Dict:
+    """
+    Nomes de partes e advogados e valor da causa do bloco (modo leve)
+
+    Mesmas regras de _campos_bloco (primeira ocorrência de cada tipo de
+    parte e de valor), numa passada, sem rótulos nem OAB: os nomes ficam no
+    índice (src/utils/indice_dje.py: termos da busca e nomes da linha) e o
+    valor vira coluna numérica - busca e resposta sem reabrir o PDF.
+    """
+    partes = {}
+    advogados = []
+    valor = None
+
+    for token in PADRAO_CAMPOS.finditer(bloco):
+        tipo = token.lastgroup
+        if tipo == "parte":
+            rotulo = ROTULOS_PARTES.get(token.group("rotulo_parte").upper(), token.group("rotulo_parte"))
+            partes.setdefault(rotulo, token.group("nome_parte").strip())
+        elif tipo == "oab":
+            advogados.append(token.group('nome_oab').strip())
+        elif tipo == "advogado":
+            advogados.append(token.group('nome_advogado').strip())
+        elif tipo == "valor" and valor is None:
+            valor = token.group("numero_valor")
+
+    return {
+        'nomes_partes': [partes[rotulo] for rotulo in ORDEM_PARTES if rotulo in partes],
+        'nomes_advogados': advogados,
+        'valor_causa': _valor_float(valor)
+    }
+
+
+def _classe_bloco(bloco: str) -> Optional[str]:
+    """
+    Só a classe do bloco (modo scan), com a mesma prioridade de _campos_bloco
+
+    Percorre os mesmos tokens de PADRAO_CAMPOS (a classe é idêntica à do
+    modo full), mas para no primeiro "CLASSE :" e não monta os demais campos.
+    """
+    classes = {}
+    for token in PADRAO_CAMPOS.finditer(bloco):
+        tipo = token.lastgroup
+        if tipo == FORMATOS_CLASSE[0]:
+            return token.group(tipo).strip()
+        if tipo in FORMATOS_CLASSE:
+            classes.setdefault(tipo, token.group(tipo).strip())
+    return next((classes[formato] for formato in FORMATOS_CLASSE if classes.get(formato)), None)
+
+
+def _registros_pagina(
+    text: str,
+    i: int,
+    inicio: int = 0,
+    fim: Optional[int] = None,
+    conhecidos=None,
+    modo: str = MODO_FULL,
+    tipos: Optional[List[str]] = None
+) -> Iterator[Dict]:
+    """
+    Gera o registro canônico (SEM filtros) de cada ocorrência de número na página
+
+    O texto é segmentado em blocos de publicação: cada bloco vai do número
+    até o próximo número (no máximo LIMITE_BLOCO chars), e todos os campos
+    saem dele - classe, partes e flags de uma publicação não vazam para a
+    vizinha. Todas as classes entram; ocorrências sem classe identificada
+    geram só {'numero', 'classe': None, 'pagina_dje'}. Os filtros de cada
+    busca são aplicados depois, por filtrar_registros.
+
+    text pode incluir trechos das páginas vizinhas (ver _iter_janelas): os
+    números são procurados só em text[inicio:fim], mas o bloco de um número
+    perto do fim da página continua na página seguinte.
+
+    Números em `conhecidos` (src/utils/numeros_conhecidos.py) só geram a
+    aparição {'numero', 'pagina_dje', 'conhecido': True}, sem extração.
+    No modo scan, cada ocorrência gera só {'numero', 'classe', 'pagina_dje'};
+    no modo leve, o registro não tem partes/advogados e ganha 'offset' (posição
+    do número a partir do início da página, ver detalhes_registro), os nomes
+    de partes/advogados (nomes_partes/nomes_advogados, índice de termos) e
+    valor_causa. Com
+    `tipos`, o modo leve também pula flags e relevância de classes que não
+    são de nenhum desses tipos (filtrar_registros as rejeitaria de todo jeito).
+    """
+    fim = len(text) if fim is None else fim
+    inicios = [match.start() for match in PADRAO_PROCESSO.finditer(text, inicio)]
+
+    for posicao, inicio_bloco in enumerate(inicios):
+        if inicio_bloco >= fim:
+            break
+
+        numero = PADRAO_PROCESSO.match(text, inicio_bloco).group(1)
+        if conhecidos is not None and numero in conhecidos:
+            yield {'numero': numero, 'pagina_dje': i, 'conhecido': True}
+            continue
+
+        fim_bloco = inicios[posicao + 1] if posicao + 1 < len(inicios) else len(text)
+        bloco = text[inicio_bloco:min(fim_bloco, inicio_bloco + LIMITE_BLOCO)]
+
+        if modo == MODO_SCAN:
+            yield {'numero': numero, 'classe': _classe_bloco(bloco[len(numero):]), 'pagina_dje': i}
+            continue
+
+        if modo == MODO_LEVE:
+            campos = {'classe': _classe_bloco(bloco[len(numero):])}
+        else:
+            campos = _campos_bloco(bloco[len(numero):])
+        if not campos['classe']:
+            # Sem classe em nenhum formato: nenhuma busca vai aceitar este registro
+            yield {'numero': numero, 'classe': None, 'pagina_dje': i}
+            continue
+
+        if modo == MODO_LEVE and tipos and not tipo_da_classe(campos['classe'], tipos):
+            yield {'numero': numero, 'classe': campos['classe'], 'pagina_dje': i}
+            continue
+
+        codigo_comarca = numero.split('.')[-1]
+
+        # Uma única passada pelo bloco para imóvel/urgência/extinção
+        categorias = MATCHER_DJE.categorias(bloco)
+        relevancia, score = relevancia_por_categorias(categorias)
+
+        if modo == MODO_LEVE:
+            yield {
+                'numero': numero,
+                'classe': campos['classe'],
+                'comarca': get_comarca_nome(codigo_comarca, tribunal="TJSP"),
+                'codigo_comarca': codigo_comarca,
+                'pagina_dje': i,
+                'offset': inicio_bloco - inicio,
+                'tem_imovel': "imovel" in categorias,
+                'esta_ativo': "extinto" not in categorias,
+                'relevancia': relevancia,
+                'score_relevancia': score,
+                **_campos_leves_bloco(bloco[len(numero):])
+            }
+            continue
+
+        yield {
+            'numero': numero,
+            'classe': campos['classe'],
+            # Sem "Comarca de X" na publicação, o nome vem do código do foro
+            'comarca': campos['comarca'] or get_comarca_nome(codigo_comarca, tribunal="TJSP"),
+            'codigo_comarca': codigo_comarca,
+            'partes': campos['partes'],
+            'advogados': campos['advogados'],
+            'valor_causa': campos['valor_causa'],
+            'pagina_dje': i,
+            'tem_imovel': "imovel" in categorias,
+            'esta_ativo': "extinto" not in categorias,
+            'relevancia': relevancia,
+            'score_relevancia': score
+        }
+
+
+def tipo_da_classe(classe: str, tipos: List[str]) -> Optional[str]:
+    """Primeiro tipo procurado que a classe COMEÇA (não apenas contém), ou None"""
+    classe_lower = classe.lower()
+
+    for tipo in tipos:
+        tipo_lower = tipo.lower()
+        # Aceitar se:
+        # 1. Classe é exatamente o tipo (ex: "Inventário" == "Inventário")
+        # 2. Classe começa com o tipo + espaço (ex: "Inventário Negativo" começa com "Inventário ")
+        # 3. Classe começa com o tipo + hífen (ex: "Divórcio-Consensual" começa com "Divórcio")
+        if (classe_lower == tipo_lower or
+            classe_lower.startswith(tipo_lower + " ") or
+            classe_lower.startswith(tipo_lower + "-")):
+            return tipo
+
+    return None
+
+
+def _avaliar_registro(
+    registro: Dict,
+    tipos: List[str],
+    filtrar_imoveis: bool,
+    filtrar_ativos: bool,
+    comarcas_filtro: Optional[List[str]],
+    valor_min: Optional[float],
+    valor_max: Optional[float]
+) -> tuple:
+    """
+    Aplica os filtros de uma busca a um registro canônico
+
+    Retorna (motivo, processo): motivo é None quando o registro foi aprovado
+    ou a chave de processos_rejeitados quando foi rejeitado (processo = None).
+    """
+    classe = registro['classe']
+    if not classe:
+        # Se não encontrou classe em nenhum formato, rejeitar
+        return "classe_nao_identificada", None
+
+    # FILTRO CRÍTICO: Verificar se a CLASSE corresponde EXATAMENTE aos tipos procurados
+    tipo_encontrado = tipo_da_classe(classe, tipos)
+    if not tipo_encontrado:
+        # Classe não corresponde aos tipos procurados (ex: "Procedimento Comum Cível" quando busca "Inventário")
+        return "classe_incompativel", None
+
+    # FILTRO 1: Verificar se tem imóveis (se filtro ativado)
+    if filtrar_imoveis and not registro['tem_imovel']:
+        return "sem_imovel", None
+
+    # FILTRO 2: Verificar se está ativo (se filtro ativado)
+    if filtrar_ativos and not registro['esta_ativo']:
+        return "extinto", None
+
+    comarca = registro['comarca']
+    codigo_comarca = registro['codigo_comarca']
+
+    # FILTRO 3: Filtrar por comarca (se especificado)
+    if comarcas_filtro:
+        comarca_aceita = False
+
+        # Verificar se São Paulo está nos filtros
+        busca_sao_paulo = any(
+            c.lower() in ["são paulo", "sao paulo", "sp capital", "são paulo (capital)", "sao paulo (capital)"]
+            for c in comarcas_filtro
+        )
+
+        # Se buscar São Paulo, verificar pelo CÓDIGO da comarca
+        if busca_sao_paulo and codigo_comarca in FOROS_SAO_PAULO_CAPITAL:
+            comarca_aceita = True
+
+        # Verificação normal por nome de comarca
+        if not comarca_aceita and comarca:
+            comarca_aceita = any(
+                c.lower() in comarca.lower() or comarca.lower() in c.lower()
+                for c in comarcas_filtro
+            )
+
+        if not comarca_aceita:
+            return "comarca", None
+
+    # FILTRO 4: Filtrar por valor da causa (se especificado)
+    valor_causa_float = registro.get('valor_causa')
+    if valor_min is not None and valor_causa_float is not None:
+        if valor_causa_float < valor_min:
+            return "valor", None
+
+    if valor_max is not None and valor_causa_float is not None:
+        if valor_causa_float > valor_max:
+            return "valor", None
+
+    if 'offset' in registro:
+        # Registro leve (MODO_LEVE): ponteiro no lugar de partes/advogados
+        return None, {
+            'numero': registro['numero'],
+            'tipo': tipo_encontrado,
+            'classe': classe,
+            'comarca': comarca,
+            'codigo_comarca': codigo_comarca,
+            'pagina_dje': registro['pagina_dje'],
+            'offset': registro['offset'],
+            'valor_causa': valor_causa_float,
+            'tem_imovel': registro['tem_imovel'],
+            'esta_ativo': registro['esta_ativo'],
+            'relevancia': registro['relevancia'],
+            'score_relevancia': registro['score_relevancia'],
+            'nomes_partes': registro.get('nomes_partes', []),
+            'nomes_advogados': registro.get('nomes_advogados', [])
+        }
+
+    return None, {
+        'numero': registro['numero'],
+        'tipo': tipo_encontrado,
+        'classe': classe,
+        'comarca': comarca,
+        'codigo_comarca': codigo_comarca,
+        'partes': registro['partes'],
+        'advogados': registro['advogados'],
+        'valor_causa': valor_causa_float,
+        'pagina_dje': registro['pagina_dje'],
+        'tem_imovel': registro['tem_imovel'],
+        'esta_ativo': registro['esta_ativo'],
+        'relevancia': registro['relevancia'],
+        'score_relevancia': registro['score_relevancia']
+    }
+
+
+def _processar_intervalo(
+    pdf_path: str,
+    intervalos: List[tuple],
+    total_paginas: int,
+    leitura: Dict,
+    conhecidos=None,
+    modo: str = MODO_FULL,
+    tipos: Optional[List[str]] = None
+) -> List[Dict]:
+    """
+    Worker do modo paralelo: abre o PDF por conta própria e analisa as páginas dos intervalos [inicio, fim)
+
+    Retorna os registros canônicos na ordem das páginas; como não há filtro
+    nem dedup aqui, o merge no processo principal é só concatenar os blocos.
+    """
+    registros = []
+    for inicio, fim in intervalos:
+        for indice, text, ini, fim_pagina in _iter_paginas(pdf_path, inicio, fim, total_paginas, leitura):
+            registros.extend(_registros_pagina(text, indice + 1, inicio=ini, fim=fim_pagina, conhecidos=conhecidos, modo=modo, tipos=tipos))
+    return registros
+
+
+def _intervalos_paginas(total_paginas: int, partes: int, intervalos: Optional[List[tuple]] = None) -> List[List[tuple]]:
+    """
+    Divide [0, total_paginas) - ou só os `intervalos` informados - em cerca de `partes` blocos
+
+    Cada bloco é uma lista de intervalos [inicio, fim), na ordem das páginas,
+    somando ~paginas/partes páginas: intervalos curtos e espalhados (páginas
+    candidatas salteadas) dividem o mesmo bloco em vez de virar um bloco cada.
+    """
+    intervalos = [(0, total_paginas)] if intervalos is None else intervalos
+    paginas = sum(fim - inicio for inicio, fim in intervalos)
+    tamanho = max(1, -(-paginas // max(1, partes)))
+
+    blocos, bloco, livres = [], [], tamanho
+    for inicio, fim in intervalos:
+        while inicio < fim:
+            corte = min(fim, inicio + livres)
+            bloco.append((inicio, corte))
+            livres -= corte - inicio
+            inicio = corte
+            if not livres:
+                blocos.append(bloco)
+                bloco, livres = [], tamanho
+    if bloco:
+        blocos.append(bloco)
+    return blocos
+
+
+def _recortar_intervalos(
+    intervalos: List[tuple],
+    page_start: Optional[int] = None,
+    page_end: Optional[int] = None
+) -> List[tuple]:
+    """Intersecção dos intervalos [inicio, fim) (0-based) com as páginas page_start..page_end (1-based, inclusivas)"""
+    minimo = page_start - 1 if page_start else 0
+    recortados = []
+    for inicio, fim in intervalos:
+        inicio = max(inicio, minimo)
+        if page_end:
+            fim = min(fim, page_end)
+        if inicio < fim:
+            recortados.append((inicio, fim))
+    return recortados
+
+
+def novos_rejeitados() -> Dict:
+    """Contadores de rejeição no formato usado pelo relatório de filtros"""
+    return {"sem_imovel": 0, "extinto": 0, "comarca": 0, "valor": 0}
+
+
+def iter_registros_dje(
+    pdf_path: str,
+    paralelo: bool = False,
+    max_workers: Optional[int] = None,
+    usar_cache_texto: bool = True,
+    backend: Optional[str] = None,
+    janela_paginas: int = JANELA_ENTRE_PAGINAS,
+    intervalos: Optional[List[tuple]] = None,
+    pre_varredura: bool = True,
+    conhecidos=None,
+    modo: str = MODO_FULL,
+    tipos: Optional[List[str]] = None
+) -> Iterator[Dict]:
+    """
+    Gera os registros canônicos do PDF (sem filtros), uma entrada por ocorrência
+
+    Cada página é liberada logo depois de extrair o texto, então o pico de
+    memória não cresce com o tamanho do caderno. Com usar_cache_texto, o
+    texto das páginas vem do cache persistente (src/utils/cache_texto_dje.py);
+    `backend` escolhe o extrator de texto (src/scrapers/dje_texto.py).
+    janela_paginas é quantos chars das páginas vizinhas entram no contexto
+    de processos perto da quebra de página (0 = cada página isolada).
+    intervalos restringe a análise a esses intervalos [inicio, fim) de
+    páginas (0-based); as vizinhas ainda são lidas para o contexto.
+    Sem intervalos, a pré-varredura (src/scrapers/dje_secoes.py) restringe a
+    análise às páginas com algum número .8.26. (e as vizinhas); pre_varredura=False lê todas.
+    Números em `conhecidos` geram só a aparição (ver _registros_pagina).
+    modo escolhe scan (número, classe, página), leve (sem partes e
+    advogados, com ponteiro) ou full (registro completo). `tipos` só vale no
+    modo leve (ver _registros_pagina).
+    """
+    if modo not in MODOS:
+        raise ValueError(f"Modo desconhecido: {modo} (use {', '.join(MODOS)})")
+
+    leitura = {"usar_cache": usar_cache_texto, "backend": backend, "janela": janela_paginas}
+
+    total_paginas = contar_paginas(pdf_path, usar_cache=usar_cache_texto, backend=backend)
+    print(f"📊 {total_paginas} páginas")
+
+    if intervalos is not None:
+        intervalos = [(inicio, min(fim, total_paginas)) for inicio, fim in intervalos if inicio < total_paginas]
+        print(f"   🗺️  Analisando {sum(fim - inicio for inicio, fim in intervalos)} páginas selecionadas")
+    elif pre_varredura:
+        intervalos = [(inicio, min(fim, total_paginas)) for inicio, fim in paginas_candidatas(pdf_path) if inicio < total_paginas]
+        puladas = total_paginas - sum(fim - inicio for inicio, fim in intervalos)
+        print(f"   ⏭️  {puladas} de {total_paginas} páginas sem número .8.26. puladas na pré-varredura")
+
+    if not paralelo:
+        for inicio, fim in intervalos if intervalos is not None else [(0, total_paginas)]:
+            for indice, text, ini, fim_pagina in _iter_paginas(pdf_path, inicio, fim, total_paginas, leitura):
+                i = indice + 1
+                if i % 10 == 0:
+                    print(f"   Página {i}/{total_paginas}...")
+
+                yield from _registros_pagina(text, i, inicio=ini, fim=fim_pagina, conhecidos=conhecidos, modo=modo, tipos=tipos)
+
+    if paralelo:
+        workers = max_workers or os.cpu_count() or 1
+        blocos = _intervalos_paginas(total_paginas, workers * BLOCOS_POR_WORKER, intervalos)
+        print(f"   ⚡ Modo paralelo: {workers} workers, {len(blocos)} blocos de páginas")
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            resultados = executor.map(
+                _processar_intervalo,
+                repeat(pdf_path),
+                blocos,
+                repeat(total_paginas),
+                repeat(leitura),
+                repeat(conhecidos),
+                repeat(modo),
+                repeat(tipos)
+            )
+
+            # executor.map devolve na ordem dos blocos: o merge reproduz a ordem serial
+            for bloco, registros in zip(blocos, resultados):
+                print(f"   Páginas {bloco[0][0] + 1}-{bloco[-1][1]}/{total_paginas}...")
+                yield from registros
+
+
+def _compactar_registros(registros: Iterator[Dict]) -> List[Dict]:
+    """
+    Junta ocorrências repetidas de um número num único registro com 'ocorrencias'
+
+    Só junta com o registro MAIS RECENTE do mesmo número e quando classe e
+    flags são iguais: nesse caso a segunda ocorrência tem exatamente o mesmo
+    destino que a primeira em qualquer busca, então filtrar_registros continua
+    reproduzindo o resultado (e os contadores) da lista completa.
+
+    Registros que já trazem 'ocorrencias' (blocos compactados separadamente,
+    ver juntar_registros_dje) somam as contagens.
+    """
+    compactados = []
+    ultimo = {}  # numero -> registro mais recente
+
+    for registro in registros:
+        anterior = ultimo.get(registro['numero'])
+        if anterior is not None and all(
+            anterior.get(campo) == registro.get(campo) for campo in ('classe', 'tem_imovel', 'esta_ativo')
+        ):
+            anterior['ocorrencias'] += registro.get('ocorrencias', 1)
+            continue
+
+        registro['ocorrencias'] = registro.get('ocorrencias', 1)
+        compactados.append(registro)
+        ultimo[registro['numero']] = registro
+
+    return compactados
+
+
+def _chave_registros(backend: Optional[str], janela_paginas: int) -> str:
+    """Backend, janela e versão mudam os registros: cada combinação é guardada à parte"""
+    return f"{obter_backend(backend).nome}-j{janela_paginas}-v{VERSAO_REGISTROS}"
+
+
+def registros_guardados_dje(pdf_path: str, backend: Optional[str], janela_paginas: int) -> Optional[List[Dict]]:
+    """Registros canônicos já guardados para o PDF (None se ainda não foi parseado)"""
+    registros = registros_dje.ler_registros(hash_pdf(pdf_path), _chave_registros(backend, janela_paginas))
+    if registros is not None:
+        print(f"📦 {len(registros)} registros já parseados")
+    return registros
+
+
+def carregar_registros_dje(
+    pdf_path: str,
+    paralelo: bool = False,
+    max_workers: Optional[int] = None,
+    usar_cache_texto: bool = True,
+    backend: Optional[str] = None,
+    janela_paginas: int = JANELA_ENTRE_PAGINAS,
+    pre_varredura: bool = True
+) -> List[Dict]:
+    """
+    Registros canônicos do PDF: parseia UMA vez e guarda (src/utils/registros_dje.py)
+
+    Buscas seguintes no mesmo PDF, com quaisquer tipos/filtros, só aplicam
+    filtrar_registros sobre a lista guardada. pre_varredura como em
+    iter_registros_dje.
+    """
+    registros = registros_guardados_dje(pdf_path, backend, janela_paginas)
+    if registros is not None:
+        return registros
+
+    registros = _compactar_registros(iter_registros_dje(
+        pdf_path,
+        paralelo=paralelo,
+        max_workers=max_workers,
+        usar_cache_texto=usar_cache_texto,
+        backend=backend,
+        janela_paginas=janela_paginas,
+        pre_varredura=pre_varredura
+    ))
+    registros_dje.salvar_registros(hash_pdf(pdf_path), _chave_registros(backend, janela_paginas), registros)
+    return registros
+
+
+def planejar_intervalos_dje(pdf_path: str, paginas_por_tarefa: int = PAGINAS_POR_TAREFA) -> List[List[tuple]]:
+    """
+    Divide as páginas com número .8.26. do PDF em tarefas de ~paginas_por_tarefa páginas
+
+    Cada tarefa é uma lista de faixas (page_start, page_end), 1-based e
+    inclusivas, pronta para registros_intervalo_dje: páginas candidatas
+    salteadas entram todas na mesma tarefa, sem virar uma tarefa por faixa.
+    Roda a pré-varredura antes de distribuir, então os workers já
+    encontram o mapa de seções pronto ao lado do PDF.
+    """
+    candidatas = paginas_candidatas(pdf_path)
+    paginas = sum(fim - inicio for inicio, fim in candidatas)
+    partes = -(-paginas // max(1, paginas_por_tarefa))
+    return [
+        [(inicio + 1, fim) for inicio, fim in bloco]
+        for bloco in _intervalos_paginas(0, partes, candidatas)
+    ]
+
+
+def registros_intervalo_dje(
+    pdf_path: str,
+    faixas: List[tuple],
+    usar_cache_texto: bool = True,
+    backend: Optional[str] = None,
+    janela_paginas: int = JANELA_ENTRE_PAGINAS
+) -> List[Dict]:
+    """
+    Registros canônicos (compactados) dos números que começam nas faixas (page_start, page_end)
+
+    Unidade de trabalho de um worker (uma tarefa de planejar_intervalos_dje):
+    as páginas vizinhas ainda são lidas para o contexto, então juntar as
+    tarefas na ordem (juntar_registros_dje) reproduz o parse do PDF inteiro.
+    """
+    candidatas = paginas_candidatas(pdf_path)
+    intervalos = [
+        intervalo
+        for page_start, page_end in faixas
+        for intervalo in _recortar_intervalos(candidatas, page_start, page_end)
+    ]
+    return _compactar_registros(iter_registros_dje(
+        pdf_path,
+        usar_cache_texto=usar_cache_texto,
+        backend=backend,
+        janela_paginas=janela_paginas,
+        intervalos=intervalos
+    ))
+
+
+def juntar_registros_dje(
+    pdf_path: str,
+    partes: List[List[Dict]],
+    backend: Optional[str] = None,
+    janela_paginas: int = JANELA_ENTRE_PAGINAS,
+    salvar: bool = True
+) -> List[Dict]:
+    """
+    Junta os registros das tarefas (na ordem das páginas) e guarda como os registros do PDF
+
+    `partes` precisa cobrir todas as tarefas de planejar_intervalos_dje para
+    que o resultado possa ser guardado (salvar=True).
+    """
+    registros = _compactar_registros(registro for parte in partes for registro in parte)
+    if salvar:
+        registros_dje.salvar_registros(hash_pdf(pdf_path), _chave_registros(backend, janela_paginas), registros)
+    return registros
+
+
+def detalhes_registro(
+    pdf_path: str,
+    pagina_dje: int,
+    offset: int,
+    numero: str,
+    usar_cache_texto: bool = True,
+    backend: Optional[str] = None,
+    janela_paginas: int = JANELA_ENTRE_PAGINAS
+) -> Dict:
+    """
+    Partes e advogados de um registro leve, a partir do ponteiro
+
+    Relê só a página (e as vizinhas, para a janela) e extrai o bloco que
+    começa em `offset`, exatamente como o modo full faria. backend e
+    janela_paginas precisam ser os mesmos da indexação; se o texto mudou e o
+    número não está mais no offset, ele é procurado na página.
+    """
+    leitura = {"usar_cache": usar_cache_texto, "backend": backend, "janela": janela_paginas}
+    total_paginas = contar_paginas(pdf_path, usar_cache=usar_cache_texto, backend=backend)
+
+    for _, text, ini, _ in _iter_paginas(pdf_path, pagina_dje - 1, pagina_dje, total_paginas, leitura):
+        inicio_bloco = ini + offset
+        match = PADRAO_PROCESSO.match(text, inicio_bloco)
+        if not match or match.group(1) != numero:
+            inicio_bloco = text.find(numero, ini)
+            if inicio_bloco < 0:
+                break
+
+        proximo = PADRAO_PROCESSO.search(text, inicio_bloco + len(numero))
+        fim_bloco = proximo.start() if proximo else len(text)
+        campos = _campos_bloco(text[inicio_bloco + len(numero):min(fim_bloco, inicio_bloco + LIMITE_BLOCO)])
+        return {campo: campos[campo] for campo in CAMPOS_DETALHE}
+
+    return {'partes': [], 'advogados': []}
+
+
+def filtrar_registros(
+    registros: Iterable[Dict],
+    tipos: List[str] = ["Inventário", "Divórcio"],
+    filtrar_imoveis: bool = True,
+    filtrar_ativos: bool = True,
+    comarcas_filtro: Optional[List[str]] = None,
+    valor_min: Optional[float] = None,
+    valor_max: Optional[float] = None,
+    processos_rejeitados: Optional[Dict] = None,
+    conhecidos=None,
+    aparicoes: Optional[List[Dict]] = None
+) -> Iterator[Dict]:
+    """
+    Aplica os filtros de uma busca sobre registros canônicos (na ordem do PDF)
+
+    Cada número é aprovado no máximo uma vez. Rejeições por classe, imóvel ou
+    extinção não "gastam" o número (uma ocorrência posterior ainda pode ser
+    aprovada); rejeições por comarca ou valor, sim.
+
+    Números já conhecidos (marcados pelo parser ou presentes em `conhecidos`)
+    não passam pelos filtros: a primeira aparição de cada um vai para
+    `aparicoes` ({'numero', 'pagina_dje'}), se informada.
+    """
+    if processos_rejeitados is None:
+        processos_rejeitados = novos_rejeitados()
+
+    processos_unicos = set()  # Para evitar duplicatas
+
+    for registro in registros:
+        numero = registro['numero']
+        if numero in processos_unicos:
+            continue
+
+        if registro.get('conhecido') or (conhecidos is not None and numero in conhecidos):
+            processos_unicos.add(numero)
+            if aparicoes is not None:
+                aparicoes.append({'numero': numero, 'pagina_dje': registro['pagina_dje']})
+            continue
+
+        motivo, processo = _avaliar_registro(
+            registro, tipos, filtrar_imoveis, filtrar_ativos, comarcas_filtro, valor_min, valor_max
+        )
+
+        if motivo not in MOTIVOS_ANTES_DEDUP:
+            processos_unicos.add(numero)
+
+        if motivo:
+            ocorrencias = registro.get('ocorrencias', 1) if motivo in MOTIVOS_ANTES_DEDUP else 1
+            processos_rejeitados[motivo] = processos_rejeitados.get(motivo, 0) + ocorrencias
+            continue
+
+        yield processo
+
+
+def iter_processos_dje(
+    pdf_path: str,
+    tipos: List[str] = ["Inventário", "Divórcio"],
+    filtrar_imoveis: bool = True,
+    filtrar_ativos: bool = True,
+    comarcas_filtro: Optional[List[str]] = None,
+    valor_min: Optional[float] = None,
+    valor_max: Optional[float] = None,
+    paralelo: bool = False,
+    max_workers: Optional[int] = None,
+    processos_rejeitados: Optional[Dict] = None,
+    usar_cache_texto: bool = True,
+    backend: Optional[str] = None,
+    janela_paginas: int = JANELA_ENTRE_PAGINAS,
+    usar_registros: bool = True,
+    usar_secoes: bool = True,
+    conhecidos=None,
+    aparicoes: Optional[List[Dict]] = None,
+    page_start: Optional[int] = None,
+    page_end: Optional[int] = None,
+    pre_varredura: bool = True
+) -> Iterator[Dict]:
+    """
+    Gera os processos aprovados nos filtros
+
+    Mesmos argumentos de extrair_processos_dje. Com usar_registros, os
+    registros canônicos do PDF vêm do armazenamento (carregar_registros_dje)
+    e só os filtros rodam; sem ele, o PDF é parseado página a página
+    (memória constante) e filtrado no caminho. Os contadores de rejeição são
+    acumulados em `processos_rejeitados`, se informado.
+
+    Com comarcas_filtro e usar_secoes, se o PDF ainda não tem registros
+    guardados, só as páginas das seções/foros dessas comarcas são parseadas
+    (src/scrapers/dje_secoes.py) - e o resultado parcial não é guardado.
+
+    Com `conhecidos` (src/utils/numeros_conhecidos.py), números já indexados
+    viram só aparições (ver filtrar_registros). Se o PDF ainda não tem
+    registros guardados, o parse pula a extração deles - e também não é
+    guardado, já que os registros ficariam incompletos.
+
+    page_start/page_end (1-based, inclusivas) restringem a busca aos números
+    que começam nessas páginas; sem registros guardados, só essas páginas são
+    parseadas (e o resultado parcial não é guardado).
+    """
+    opcoes_parse = {
+        "paralelo": paralelo,
+        "max_workers": max_workers,
+        "usar_cache_texto": usar_cache_texto,
+        "backend": backend,
+        "janela_paginas": janela_paginas,
+        "pre_varredura": pre_varredura
+    }
+
+    parcial = page_start is not None or page_end is not None
+    registros = registros_guardados_dje(pdf_path, backend, janela_paginas) if usar_registros else None
+
+    if registros is not None and parcial:
+        registros = [
+            r for r in registros
+            if (page_start or 1) <= r['pagina_dje'] and (page_end is None or r['pagina_dje'] <= page_end)
+        ]
+    elif registros is None and (parcial or (comarcas_filtro and usar_secoes)):
+        if comarcas_filtro and usar_secoes:
+            intervalos = paginas_das_comarcas(pdf_path, comarcas_filtro)
+        elif pre_varredura:
+            intervalos = paginas_candidatas(pdf_path)
+        else:
+            intervalos = [(0, contar_paginas(pdf_path, usar_cache=usar_cache_texto, backend=backend))]
+        intervalos = _recortar_intervalos(intervalos, page_start, page_end)
+        registros = iter_registros_dje(pdf_path, intervalos=intervalos, conhecidos=conhecidos, **opcoes_parse)
+    elif registros is None and usar_registros and conhecidos is None:
+        registros = carregar_registros_dje(pdf_path, **opcoes_parse)
+    elif registros is None:
+        registros = iter_registros_dje(pdf_path, conhecidos=conhecidos, **opcoes_parse)
+
+    yield from filtrar_registros(
+        registros,
+        tipos=tipos,
+        filtrar_imoveis=filtrar_imoveis,
+        filtrar_ativos=filtrar_ativos,
+        comarcas_filtro=comarcas_filtro,
+        valor_min=valor_min,
+        valor_max=valor_max,
+        processos_rejeitados=processos_rejeitados,
+        conhecidos=conhecidos,
+        aparicoes=aparicoes
+    )
+
+
 def extrair_processos_dje(
     pdf_path: str,
     tipos: List[str] = ["Inventário", "Divórcio"],
@@ -67,11 +1013,26 @@ def extrair_processos_dje(
     filtrar_ativos: bool = True,
     comarcas_filtro: Optional[List[str]] = None,
     valor_min: Optional[float] = None,
-    valor_max: Optional[float] = None
+    valor_max: Optional[float] = None,
+    paralelo: bool = False,
+    max_workers: Optional[int] = None,
+    usar_cache_texto: bool = True,
+    backend: Optional[str] = None,
+    janela_paginas: int = JANELA_ENTRE_PAGINAS,
+    usar_registros: bool = True,
+    usar_secoes: bool = True,
+    conhecidos=None,
+    aparicoes: Optional[List[Dict]] = None,
+    page_start: Optional[int] = None,
+    page_end: Optional[int] = None,
+    pre_varredura: bool = True
 ) -> List[Dict]:
     """
     Extrai processos do DJE com filtros avançados
 
+    Wrapper de iter_processos_dje que devolve a lista completa e imprime o
+    relatório de filtros.
+
     Args:
         pdf_path: Caminho do PDF
         tipos: Tipos de processo a buscar
@@ -80,234 +1041,70 @@ def extrair_processos_dje(
         comarcas_filtro: Lista de comarcas para filtrar (None = todas)
         valor_min: Valor mínimo da causa
         valor_max: Valor máximo da causa
+        paralelo: Se True, divide as páginas entre processos (ProcessPoolExecutor).
+                  Cada worker abre o PDF sozinho; o resultado é idêntico ao serial.
+        max_workers: Número de processos no modo paralelo (None = os.cpu_count())
+        usar_cache_texto: Se True, reaproveita o texto das páginas já extraído
+                          (só as regex rodam de novo)
+        backend: Extrator de texto - pdfplumber, pdfminer ou pypdfium2
+                 (None = variável DJE_PDF_BACKEND, padrão pdfplumber)
+        janela_paginas: Chars da página anterior/seguinte visíveis no contexto
+                        de processos perto da quebra de página (0 = desliga)
+        usar_registros: Se True, o PDF é parseado uma única vez (sem filtros) e
+                        os registros ficam guardados; cada busca só aplica
+                        os filtros sobre eles
+        usar_secoes: Se True e houver comarcas_filtro, um PDF ainda não parseado
+                     só tem lidas as páginas das seções dessas comarcas
+        conhecidos: Números já indexados (src/utils/numeros_conhecidos.py) -
+                    não são extraídos nem devolvidos, só registrados
+        aparicoes: Lista que recebe {'numero', 'pagina_dje'} de cada número
+                   conhecido encontrado no PDF
+        page_start: Primeira página (1-based) a considerar (None = início do PDF)
+        page_end: Última página (inclusive) a considerar (None = fim do PDF).
+                  Para dividir um caderno entre workers, ver src/jobs/dje_tasks.py
+        pre_varredura: Se True, só as páginas com número .8.26. na pré-varredura
+                       (src/scrapers/dje_secoes.py, com as vizinhas) são
+                       analisadas; False lê todas (comparações de backend)
     """
     print(f"📄 Parseando: {pdf_path}")
     print(f"   🏠 Filtrar imóveis: {filtrar_imoveis}")
     print(f"   ✅ Filtrar ativos: {filtrar_ativos}")
     if comarcas_filtro:
         print(f"   📍 Comarcas: {', '.join(comarcas_filtro)}")
+    if page_start is not None or page_end is not None:
+        print(f"   📑 Páginas: {page_start or 1} a {page_end or 'fim'}")
+
+    processos_rejeitados = novos_rejeitados()
+    if conhecidos is not None and aparicoes is None:
+        aparicoes = []
+    processos = list(iter_processos_dje(
+        pdf_path,
+        tipos=tipos,
+        filtrar_imoveis=filtrar_imoveis,
+        filtrar_ativos=filtrar_ativos,
+        comarcas_filtro=comarcas_filtro,
+        valor_min=valor_min,
+        valor_max=valor_max,
+        paralelo=paralelo,
+        max_workers=max_workers,
+        processos_rejeitados=processos_rejeitados,
+        usar_cache_texto=usar_cache_texto,
+        backend=backend,
+        janela_paginas=janela_paginas,
+        usar_registros=usar_registros,
+        usar_secoes=usar_secoes,
+        conhecidos=conhecidos,
+        aparicoes=aparicoes,
+        page_start=page_start,
+        page_end=page_end,
+        pre_varredura=pre_varredura
+    ))
 
-    processos = []
-    processos_unicos = set()  # Para evitar duplicatas
-    processos_rejeitados = {"sem_imovel": 0, "extinto": 0, "comarca": 0, "valor": 0}
-    
-    with pdfplumber.open(pdf_path) as pdf:
-        total_paginas = len(pdf.pages)
-        print(f"📊 {total_paginas} páginas")
-        
-        for i, page in enumerate(pdf.pages, 1):
-            if i % 10 == 0:
-                print(f"   Página {i}/{total_paginas}...")
-            
-            text = page.extract_text()
-            if not text:
-                continue
-            
-            # Regex para processo: NNNNNNN-DD.AAAA.8.26.OOOO
-            pattern = r'(\d{7}-\d{2}\.\d{4}\.8\.26\.\d{4})'
-            
-            for match in re.finditer(pattern, text):
-                numero = match.group(1)
-
-                # Evitar duplicatas
-                if numero in processos_unicos:
-                    continue
-
-                # Contexto pequeno APENAS DEPOIS do número do processo
-                # Isso evita capturar a CLASSE de processos anteriores
-                start_contexto = match.end()  # Começa DEPOIS do número
-                end_contexto = min(len(text), match.end() + 300)  # Apenas 300 chars depois
-                contexto = text[start_contexto:end_contexto]
-
-                # Também capturar contexto ANTES (menor) para comarca e outras infos
-                start_antes = max(0, match.start() - 200)
-                contexto_antes = text[start_antes:match.start()]
-
-                # Contexto completo para verificações de imóvel/ativo
-                contexto_completo = text[max(0, match.start() - 400):min(len(text), match.end() + 400)]
-
-                # Extrair informações primeiro
-                codigo_comarca = numero.split('.')[-1]
-
-                # Extrair CLASSE REAL do processo
-                # CRÍTICO: Só buscar DEPOIS do número do processo para evitar pegar classe de processo anterior
-                # DJE TJSP tem 3 formatos:
-                # 1a) Distribuição com dois pontos: "CLASSE :DIVÓRCIO CONSENSUAL"
-                # 1b) Distribuição sem dois pontos: "Classe\nTutela Antecipada Antecedente"
-                # 2) Movimentações: "número - texto - Classe - Comarca"
-
-                classe = None
-
-                # Tentar Formato 1a (CLASSE :) - BUSCAR APENAS DEPOIS DO NÚMERO
-                classe_match = re.search(
-                    r'CLASSE\s*:\s*([^\n]+)',
-                    contexto,  # Usa contexto DEPOIS do número
-                    re.IGNORECASE
-                )
-                if classe_match:
-                    classe = classe_match.group(1).strip()
-
-                # Tentar Formato 1b (Classe\n sem dois pontos)
-                if not classe:
-                    classe_match = re.search(
-                        r'Classe[\s\n]+([^\n]+)',
-                        contexto,  # Usa contexto DEPOIS do número
-                        re.IGNORECASE
-                    )
-                    if classe_match:
-                        classe = classe_match.group(1).strip()
-
-                # Tentar Formato 2 (" - Classe - ")
-                if not classe:
-                    classe_match = re.search(
-                        r'-\s+(Inventário|Arrolamento|Divórcio\s+(?:Consensual|Litigioso)|'
-                        r'Separação\s+(?:Consensual|Litigiosa)|Alvará\s+Judicial)\s+-',
-                        contexto,  # Usa contexto DEPOIS do número
-                        re.IGNORECASE
-                    )
-                    if classe_match:
-                        classe = classe_match.group(1).strip()
-
-                if not classe:
-                    # Se não encontrou classe em nenhum formato, rejeitar
-                    processos_rejeitados["classe_nao_identificada"] = processos_rejeitados.get("classe_nao_identificada", 0) + 1
-                    continue
-
-                # FILTRO CRÍTICO: Verificar se a CLASSE corresponde EXATAMENTE aos tipos procurados
-                # Agora verifica se a classe COMEÇA com o tipo, não apenas se CONTÉM
-                tipo_encontrado = None
-                classe_lower = classe.lower()
-
-                for tipo in tipos:
-                    tipo_lower = tipo.lower()
-                    # Aceitar se:
-                    # 1. Classe é exatamente o tipo (ex: "Inventário" == "Inventário")
-                    # 2. Classe começa com o tipo + espaço (ex: "Inventário Negativo" começa com "Inventário ")
-                    # 3. Classe começa com o tipo + hífen (ex: "Divórcio-Consensual" começa com "Divórcio")
-                    if (classe_lower == tipo_lower or
-                        classe_lower.startswith(tipo_lower + " ") or
-                        classe_lower.startswith(tipo_lower + "-")):
-                        tipo_encontrado = tipo
-                        break
-
-                if not tipo_encontrado:
-                    # Classe não corresponde aos tipos procurados (ex: "Procedimento Comum Cível" quando busca "Inventário")
-                    processos_rejeitados["classe_incompativel"] = processos_rejeitados.get("classe_incompativel", 0) + 1
-                    continue
-
-                # FILTRO 1: Verificar se tem imóveis (se filtro ativado)
-                if filtrar_imoveis and not tem_imovel(contexto_completo):
-                    processos_rejeitados["sem_imovel"] += 1
-                    continue
-
-                # FILTRO 2: Verificar se está ativo (se filtro ativado)
-                if filtrar_ativos and not esta_ativo(contexto_completo):
-                    processos_rejeitados["extinto"] += 1
-                    continue
-
-                processos_unicos.add(numero)
-
-                # Extrair comarca (nome) - usar contexto completo
-                comarca_match = re.search(r'Comarca de ([A-Z][a-zá-úÀ-Ú\s]+)', contexto_completo, re.IGNORECASE)
-                comarca = comarca_match.group(1).strip() if comarca_match else None
-
-                # Se não achou comarca no texto, buscar antes do número
-                if not comarca:
-                    comarca_match = re.search(r'-\s*([A-Z][a-zá-úÀ-Ú\s]+)\s*-', contexto_antes)
-                    if comarca_match:
-                        comarca = comarca_match.group(1).strip()
-                    else:
-                        # Buscar nome da comarca pelo código
-                        from src.utils.comarcas import get_comarca_nome
-                        comarca = get_comarca_nome(codigo_comarca, tribunal="TJSP")
-
-                # FILTRO 3: Filtrar por comarca (se especificado)
-                if comarcas_filtro:
-                    comarca_aceita = False
-
-                    # Verificar se São Paulo está nos filtros
-                    busca_sao_paulo = any(
-                        c.lower() in ["são paulo", "sao paulo", "sp capital", "são paulo (capital)", "sao paulo (capital)"]
-                        for c in comarcas_filtro
-                    )
-
-                    # Se buscar São Paulo, verificar pelo CÓDIGO da comarca
-                    if busca_sao_paulo and codigo_comarca in FOROS_SAO_PAULO_CAPITAL:
-                        comarca_aceita = True
-
-                    # Verificação normal por nome de comarca
-                    if not comarca_aceita and comarca:
-                        comarca_aceita = any(
-                            c.lower() in comarca.lower() or comarca.lower() in c.lower()
-                            for c in comarcas_filtro
-                        )
-
-                    if not comarca_aceita:
-                        processos_rejeitados["comarca"] += 1
-                        continue
-                
-                # Extrair partes (Apelante/Apelado ou Requerente/Requerido) - usar contexto completo
-                partes = []
-                for parte_tipo in ['Apelante', 'Apelado', 'Requerente', 'Requerido', 'Autor', 'Réu']:
-                    parte_match = re.search(f'{parte_tipo}:\s*([A-ZÀ-Ú][^-\n]+?)(?:\s*-|\n)', contexto_completo)
-                    if parte_match:
-                        partes.append(f"{parte_tipo}: {parte_match.group(1).strip()}")
-
-                # Extrair advogados - usar contexto completo
-                advogados = []
-                adv_matches = re.finditer(r'(OAB:\s*\d+/[A-Z]{2})', contexto_completo)
-                for adv_match in adv_matches:
-                    # Pegar nome antes do OAB
-                    pos = contexto_completo.index(adv_match.group(1))
-                    trecho = contexto_completo[max(0, pos-100):pos]
-                    nome_match = re.search(r'([A-Z][a-zá-úÀ-Ú\s]+(?:\s+[A-Z][a-zá-úÀ-Ú\s]+)*)\s*\(', trecho)
-                    if nome_match:
-                        advogados.append(f"{nome_match.group(1).strip()} ({adv_match.group(1)})")
-
-                # Extrair valor da causa - usar contexto completo
-                valor_causa_float = None
-                valor_match = re.search(r'R\$\s*([\d.,]+)', contexto_completo)
-                if valor_match:
-                    valor_str = valor_match.group(1)
-                    # Converter para float
-                    try:
-                        valor_causa_float = float(valor_str.replace('.', '').replace(',', '.'))
-                    except:
-                        valor_causa_float = None
-
-                # FILTRO 4: Filtrar por valor da causa (se especificado)
-                if valor_min is not None and valor_causa_float is not None:
-                    if valor_causa_float < valor_min:
-                        processos_rejeitados["valor"] += 1
-                        continue
-
-                if valor_max is not None and valor_causa_float is not None:
-                    if valor_causa_float > valor_max:
-                        processos_rejeitados["valor"] += 1
-                        continue
-
-                # Calcular relevância baseada em imóveis - usar contexto completo
-                relevancia, score = calcular_relevancia_imovel(contexto_completo)
-
-                processos.append({
-                    'numero': numero,
-                    'tipo': tipo_encontrado,
-                    'classe': classe,
-                    'comarca': comarca,
-                    'codigo_comarca': codigo_comarca,
-                    'partes': partes,
-                    'advogados': advogados,
-                    'valor_causa': valor_causa_float,
-                    'pagina_dje': i,
-                    'tem_imovel': tem_imovel(contexto_completo),
-                    'esta_ativo': esta_ativo(contexto_completo),
-                    'relevancia': relevancia,
-                    'score_relevancia': score
-                })
-    
     # Relatório de filtros
     total_rejeitados = sum(processos_rejeitados.values())
     print(f"\n✅ {len(processos)} processos APROVADOS nos filtros")
+    if aparicoes:
+        print(f"🔁 {len(aparicoes)} processos já conhecidos (só aparição registrada)")
 
     if total_rejeitados > 0:
         print(f"❌ {total_rejeitados} processos REJEITADOS:")
@@ -322,6 +1119,113 @@ def extrair_processos_dje(
 
     return processos
 
+
+def escanear_processos_dje(
+    pdf_path: str,
+    tipos: Optional[List[str]] = None,
+    page_start: Optional[int] = None,
+    page_end: Optional[int] = None,
+    paralelo: bool = False,
+    max_workers: Optional[int] = None,
+    usar_cache_texto: bool = True,
+    backend: Optional[str] = None,
+    janela_paginas: int = JANELA_ENTRE_PAGINAS
+) -> List[Dict]:
+    """
+    Modo scan: número, tipo, classe, código do foro e página dos processos dos tipos
+
+    Mesmo loop de páginas e blocos de extrair_processos_dje (mesma classe),
+    sem partes, advogados, valor nem flags de imóvel/extinção - para
+    contagens, projeções e testes rápidos. Se o PDF já tem registros
+    guardados, eles são usados no lugar do parse.
+
+    Args:
+        tipos: Tipos aceitos (None = TIPOS_SCAN)
+        page_start/page_end: Faixa de páginas (1-based, inclusivas)
+        Demais argumentos como em extrair_processos_dje
+    """
+    tipos = tipos or TIPOS_SCAN
+    print(f"📄 Escaneando: {pdf_path}")
+
+    registros = registros_guardados_dje(pdf_path, backend, janela_paginas)
+    if registros is None:
+        intervalos = None
+        if page_start is not None or page_end is not None:
+            intervalos = _recortar_intervalos(paginas_candidatas(pdf_path), page_start, page_end)
+        registros = iter_registros_dje(
+            pdf_path,
+            paralelo=paralelo,
+            max_workers=max_workers,
+            usar_cache_texto=usar_cache_texto,
+            backend=backend,
+            janela_paginas=janela_paginas,
+            intervalos=intervalos,
+            modo=MODO_SCAN
+        )
+
+    processos = {}
+    for registro in registros:
+        numero, classe, pagina = registro['numero'], registro.get('classe'), registro['pagina_dje']
+        if numero in processos or not classe:
+            continue
+        if (page_start and pagina < page_start) or (page_end and pagina > page_end):
+            continue
+
+        tipo = tipo_da_classe(classe, tipos)
+        if tipo:
+            processos[numero] = {
+                'numero': numero,
+                'tipo': tipo,
+                'classe': classe,
+                'codigo_comarca': numero.split('.')[-1],
+                'pagina_dje': pagina
+            }
+
+    print(f"✅ {len(processos)} processos encontrados")
+    return list(processos.values())
+
+
+def reextrair_aparicoes(
+    pdf_path: str,
+    aparicoes: List[Dict],
+    tipos: List[str] = ["Inventário", "Divórcio"],
+    filtrar_imoveis: bool = True,
+    filtrar_ativos: bool = True,
+    comarcas_filtro: Optional[List[str]] = None,
+    valor_min: Optional[float] = None,
+    valor_max: Optional[float] = None,
+    backend: Optional[str] = None,
+    janela_paginas: int = JANELA_ENTRE_PAGINAS
+) -> List[Dict]:
+    """
+    Extração completa (com filtros) de números que tinham virado só aparição
+
+    Usado para os falsos positivos do filtro de Bloom: números que o filtro
+    deu como conhecidos mas que não existem na fonte exata. Usa os registros
+    guardados do PDF, se houver; senão parseia só as páginas das aparições.
+    """
+    numeros = {a['numero'] for a in aparicoes}
+    if not numeros:
+        return []
+
+    registros = registros_guardados_dje(pdf_path, backend, janela_paginas)
+    if registros is None:
+        # Página do número (0-based); a janela entre páginas cobre a quebra
+        intervalos = [(pagina - 1, pagina) for pagina in sorted({a['pagina_dje'] for a in aparicoes})]
+        registros = iter_registros_dje(
+            pdf_path, backend=backend, janela_paginas=janela_paginas, intervalos=intervalos, pre_varredura=False
+        )
+
+    return list(filtrar_registros(
+        (r for r in registros if r['numero'] in numeros),
+        tipos=tipos,
+        filtrar_imoveis=filtrar_imoveis,
+        filtrar_ativos=filtrar_ativos,
+        comarcas_filtro=comarcas_filtro,
+        valor_min=valor_min,
+        valor_max=valor_max
+    ))
+
 if __name__ == "__main__":
     from datetime import date
 
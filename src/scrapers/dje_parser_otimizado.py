@@ -1,67 +1,21 @@
-import pdfplumber
-import re
-from typing import List, Dict
-from collections import defaultdict
+from typing import List, Dict, Optional
+from src.scrapers.dje_parser import escanear_processos_dje
 
-def extrair_processos_dje_otimizado(pdf_path: str, max_paginas: int = None) -> List[Dict]:
-    """Parser otimizado para PDFs grandes"""
-    print(f"📄 Parseando: {pdf_path}")
-    
-    processos_dict = {}
-    
-    with pdfplumber.open(pdf_path) as pdf:
-        total = len(pdf.pages)
-        processar = min(max_paginas, total) if max_paginas else total
-        
-        print(f"📊 {total} páginas (processando {processar})")
-        
-        # Processar em blocos
-        bloco = 50
-        for inicio in range(0, processar, bloco):
-            fim = min(inicio + bloco, processar)
-            print(f"   Páginas {inicio+1}-{fim}...")
-            
-            # Juntar texto do bloco
-            texto_bloco = ""
-            for i in range(inicio, fim):
-                texto_bloco += pdf.pages[i].extract_text() + "\n"
-            
-            # Buscar processos
-            pattern = r'(\d{7}-\d{2}\.\d{4}\.8\.26\.\d{4})'
-            
-            for match in re.finditer(pattern, texto_bloco):
-                numero = match.group(1)
-                
-                if numero in processos_dict:
-                    continue
-                
-                # Contexto
-                start = max(0, match.start() - 1500)
-                end = min(len(texto_bloco), match.end() + 1500)
-                ctx = texto_bloco[start:end].lower()
-                
-                # Filtrar por tipo
-                tipo = None
-                if 'inventário' in ctx or 'arrolamento' in ctx:
-                    tipo = 'Inventário'
-                elif 'divórcio' in ctx:
-                    tipo = 'Divórcio'
-                elif 'alimentos' in ctx:
-                    tipo = 'Alimentos'
-                elif 'guarda' in ctx:
-                    tipo = 'Guarda'
-                
-                if not tipo:
-                    continue
-                
-                processos_dict[numero] = {
-                    'numero': numero,
-                    'tipo': tipo,
-                    'codigo_comarca': numero.split('.')[-1]
-                }
-    
-    processos = list(processos_dict.values())
-    print(f"✅ {len(processos)} processos encontrados")
+# Rótulos de tipo deste parser: arrolamento sempre foi contado como inventário
+TIPOS_AGRUPADOS = {"Arrolamento": "Inventário"}
+
+def extrair_processos_dje_otimizado(pdf_path: str, max_paginas: int = None, backend: Optional[str] = None) -> List[Dict]:
+    """
+    Parser otimizado para PDFs grandes
+
+    Modo scan do motor único (src/scrapers/dje_parser.py), com a mesma classe
+    estrita do modo full. Mantém os campos de sempre (numero, tipo,
+    codigo_comarca, com arrolamento como 'Inventário'); classe e pagina_dje
+    vêm de brinde.
+    """
+    processos = escanear_processos_dje(pdf_path, page_end=max_paginas, backend=backend)
+    for processo in processos:
+        processo['tipo'] = TIPOS_AGRUPADOS.get(processo['tipo'], processo['tipo'])
     return processos
 
 if __name__ == "__main__":
@@ -0,0 +1,202 @@
+"""
+Mapa de seções (foro/vara) dos cadernos do DJE
+
+Os cadernos são organizados em seções por foro ("RELAÇÃO DOS FEITOS CÍVEIS
+DISTRIBUÍDOS ÀS VARAS DO FORO DE IBIÚNA EM 18/07/2025", "COMARCA DE BAURU").
+Uma passada de indexação (com o backend rápido, pypdfium2) registra:
+    - o intervalo de páginas de cada seção e o foro dela
+    - em quais páginas aparece cada código de foro (OOOO de NNNNNNN-DD.AAAA.8.26.OOOO)
+    - quais páginas têm algum número .8.26. (pré-varredura)
+
+O mapa fica ao lado do PDF (<pdf>.secoes.json). Buscas restritas a algumas
+comarcas usam paginas_das_comarcas() para abrir só as páginas relevantes;
+o FILTRO 3 do parser continua valendo sobre os registros dessas páginas.
+Sem filtro de comarca, paginas_candidatas() deixa de fora editais,
+expedientes e seções de outros tribunais - páginas sem nenhum número do
+TJSP, que não geram registro mas pagariam a extração completa.
+
+A pré-varredura usa outro extrator (BACKEND_SECOES) que o do parser e pode
+perder ou partir um número que o parser enxergaria. Por isso ela é
+conservadora: cada página selecionada leva as PAGINAS_VIZINHAS de cada
+lado, e um caderno em que ela não achou número nenhum é lido inteiro.
+"""
+import json
+import os
+import re
+from typing import Dict, List, Optional
+from src.utils.comarcas import FOROS_SAO_PAULO_CAPITAL, get_comarca_nome
+from src.scrapers.dje_texto import iter_textos_paginas
+
+# Backend da passada de indexação: só precisa dos números e cabeçalhos
+BACKEND_SECOES = os.getenv("DJE_SECOES_BACKEND", "pypdfium2")
+
+# Incrementar quando o formato ou a detecção de seções mudar
+VERSAO_SECOES = 2
+
+# Páginas somadas de cada lado das páginas selecionadas pela pré-varredura
+PAGINAS_VIZINHAS = 1
+
+PADRAO_CODIGO_FORO = re.compile(r'\d{7}-\d{2}\.\d{4}\.8\.26\.(\d{4})')
+
+PADRAO_SECAO = re.compile(
+    r'^(?:RELAÇÃO DOS FEITOS .+? DISTRIBUÍDOS ÀS VARAS DO (?:FORO DE |FORO DAS? |FORO )?(?P<foro>.+?) EM \d{2}/\d{2}/\d{4}'
+    r'|COMARCA DE (?P<comarca>[^\n]+?))\s*$',
+    re.MULTILINE
+)
+
+NOMES_SAO_PAULO = ["são paulo", "sao paulo", "sp capital", "são paulo (capital)", "sao paulo (capital)"]
+
+
+def caminho_mapa(pdf_path: str) -> str:
+    return f"{pdf_path}.secoes.json"
+
+
+def _agrupar_paginas(paginas) -> List[List[int]]:
+    """[1, 2, 3, 7, 8] -> [[1, 3], [7, 8]] (intervalos fechados, 1-based)"""
+    intervalos = []
+    for pagina in sorted(set(paginas)):
+        if intervalos and pagina == intervalos[-1][1] + 1:
+            intervalos[-1][1] = pagina
+        else:
+            intervalos.append([pagina, pagina])
+    return intervalos
+
+
+def _expandir(intervalos: List[List[int]]) -> set:
+    """[[1, 3], [7, 8]] -> {1, 2, 3, 7, 8}"""
+    return {pagina for inicio, fim in intervalos for pagina in range(inicio, fim + 1)}
+
+
+def _com_vizinhas(paginas: set, total_paginas: int) -> set:
+    """Páginas (1-based) mais PAGINAS_VIZINHAS de cada lado, dentro do caderno"""
+    return {
+        vizinha
+        for pagina in paginas
+        for vizinha in range(max(1, pagina - PAGINAS_VIZINHAS), min(total_paginas, pagina + PAGINAS_VIZINHAS) + 1)
+    }
+
+
+def construir_mapa_secoes(pdf_path: str, backend: Optional[str] = None) -> Dict:
+    """Lê todas as páginas uma vez e monta o mapa de seções e códigos de foro"""
+    secoes = []
+    paginas_por_codigo: Dict[str, set] = {}
+    total_paginas = 0
+
+    # Sem cache de texto: o mapa em si é o que fica salvo
+    for indice, texto in iter_textos_paginas(pdf_path, usar_cache=False, backend=backend or BACKEND_SECOES):
+        pagina = indice + 1
+        total_paginas = pagina
+
+        for codigo in PADRAO_CODIGO_FORO.findall(texto):
+            paginas_por_codigo.setdefault(codigo, set()).add(pagina)
+
+        for match in PADRAO_SECAO.finditer(texto):
+            if secoes:
+                secoes[-1]["pagina_fim"] = pagina
+            secoes.append({
+                "titulo": match.group(0).strip(),
+                "foro": (match.group("foro") or match.group("comarca")).strip(),
+                "pagina_inicio": pagina,
+                "pagina_fim": pagina
+            })
+
+        # A seção aberta vai até a próxima seção (ou o fim do caderno)
+        if secoes:
+            secoes[-1]["pagina_fim"] = pagina
+
+    paginas_com_numero = set()
+    for paginas in paginas_por_codigo.values():
+        paginas_com_numero |= paginas
+
+    stat = os.stat(pdf_path)
+    return {
+        "versao": VERSAO_SECOES,
+        "tamanho": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "total_paginas": total_paginas,
+        "secoes": secoes,
+        "paginas_com_numero": _agrupar_paginas(paginas_com_numero),
+        "codigos": {codigo: _agrupar_paginas(paginas) for codigo, paginas in sorted(paginas_por_codigo.items())}
+    }
+
+
+def obter_mapa_secoes(pdf_path: str, backend: Optional[str] = None) -> Dict:
+    """Mapa salvo ao lado do PDF; reconstrói se não existir ou se o PDF mudou"""
+    caminho = caminho_mapa(pdf_path)
+    stat = os.stat(pdf_path)
+
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            mapa = json.load(f)
+        if (mapa.get("versao") == VERSAO_SECOES and mapa.get("tamanho") == stat.st_size
+                and mapa.get("mtime_ns") == stat.st_mtime_ns):
+            return mapa
+    except (OSError, ValueError):
+        pass
+
+    print(f"🗺️  Indexando seções: {os.path.basename(pdf_path)}")
+    mapa = construir_mapa_secoes(pdf_path, backend=backend)
+
+    temp = f"{caminho}.{os.getpid()}.tmp"
+    with open(temp, 'w', encoding='utf-8') as f:
+        json.dump(mapa, f, ensure_ascii=False)
+    os.replace(temp, caminho)
+
+    return mapa
+
+
+def _nome_aceito(nome: Optional[str], comarcas_filtro: List[str]) -> bool:
+    """Mesma comparação por nome do FILTRO 3 do parser"""
+    if not nome:
+        return False
+    nome = nome.lower()
+    return any(c.lower() in nome or nome in c.lower() for c in comarcas_filtro)
+
+
+def paginas_das_comarcas(pdf_path: str, comarcas_filtro: List[str], backend: Optional[str] = None) -> List[tuple]:
+    """
+    Intervalos [inicio, fim) de páginas (0-based) que podem ter processos das comarcas
+
+    Uma página entra se tem algum número cujo código de foro pertence a uma
+    das comarcas, ou se está numa seção cujo foro casa com o filtro - e
+    leva as PAGINAS_VIZINHAS de cada lado.
+    """
+    mapa = obter_mapa_secoes(pdf_path, backend=backend)
+    busca_sao_paulo = any(c.lower() in NOMES_SAO_PAULO for c in comarcas_filtro)
+
+    paginas = set()
+    for codigo, intervalos in mapa["codigos"].items():
+        if ((busca_sao_paulo and codigo in FOROS_SAO_PAULO_CAPITAL)
+                or _nome_aceito(get_comarca_nome(codigo, tribunal="TJSP"), comarcas_filtro)):
+            for inicio, fim in intervalos:
+                paginas.update(range(inicio, fim + 1))
+
+    for secao in mapa["secoes"]:
+        if _nome_aceito(secao["foro"], comarcas_filtro):
+            paginas.update(range(secao["pagina_inicio"], secao["pagina_fim"] + 1))
+
+    # Páginas da seção sem nenhum número não geram registro (se a
+    # pré-varredura não achou número nenhum, ela não serve para descartar)
+    com_numero = _expandir(mapa["paginas_com_numero"])
+    if com_numero:
+        paginas &= com_numero
+
+    paginas = _com_vizinhas(paginas, mapa["total_paginas"])
+    return [(inicio - 1, fim) for inicio, fim in _agrupar_paginas(paginas)]
+
+
+def paginas_candidatas(pdf_path: str, backend: Optional[str] = None) -> List[tuple]:
+    """
+    Intervalos [inicio, fim) de páginas (0-based) com pelo menos um número .8.26.
+
+    Com as PAGINAS_VIZINHAS de cada lado; sem nenhum número na
+    pré-varredura, o caderno inteiro.
+    """
+    mapa = obter_mapa_secoes(pdf_path, backend=backend)
+    total_paginas = mapa["total_paginas"]
+    paginas = _expandir(mapa["paginas_com_numero"])
+    if not paginas:
+        return [(0, total_paginas)] if total_paginas else []
+
+    paginas = _com_vizinhas(paginas, total_paginas)
+    return [(inicio - 1, fim) for inicio, fim in _agrupar_paginas(paginas)]
@@ -0,0 +1,188 @@
+"""
+Texto das páginas dos PDFs do DJE
+
+Ponto único onde os parsers obtêm o texto de cada página. Consulta o cache
+persistente (src/utils/cache_texto_dje.py) antes de abrir o PDF; o PDF só é
+aberto se alguma página pedida ainda não estiver lá.
+
+A extração em si é feita por um backend plugável, escolhido por deployment
+com a variável DJE_PDF_BACKEND (padrão: pdfplumber):
+    - pdfplumber: referência (mais lento)
+    - pdfminer: pdfminer.six direto, com LAParams ajustados
+    - pypdfium2: PDFium (C++), o mais rápido
+
+Use scripts/comparar_backends.py antes de trocar: ele mede páginas/s e
+compara os processos extraídos com os do pdfplumber.
+"""
+import os
+from typing import Dict, Iterator, Optional, Tuple
+from src.utils import cache_texto_dje
+
+BACKEND_PADRAO = os.getenv("DJE_PDF_BACKEND", "pdfplumber")
+
+
+class BackendTexto:
+    """Interface dos backends de extração de texto"""
+
+    nome = "base"
+
+    def contar_paginas(self, pdf_path: str) -> int:
+        raise NotImplementedError
+
+    def iter_textos(self, pdf_path: str, inicio: int, fim: int) -> Iterator[Tuple[int, str]]:
+        """Gera (indice, texto) para as páginas [inicio, fim) - índices 0-based"""
+        raise NotImplementedError
+
+
+class PdfplumberBackend(BackendTexto):
+    nome = "pdfplumber"
+
+    def contar_paginas(self, pdf_path: str) -> int:
+        import pdfplumber
+
+        with pdfplumber.open(pdf_path) as pdf:
+            return len(pdf.pages)
+
+    def iter_textos(self, pdf_path: str, inicio: int, fim: int) -> Iterator[Tuple[int, str]]:
+        import pdfplumber
+
+        with pdfplumber.open(pdf_path) as pdf:
+            for indice in range(inicio, fim):
+                page = pdf.pages[indice]
+                texto = page.extract_text() or ""
+                page.close()  # Sem isso o pdfplumber mantém o layout de TODAS as páginas
+                yield indice, texto
+
+
+class PdfminerBackend(BackendTexto):
+    """
+    pdfminer.six sem a camada do pdfplumber
+
+    boxes_flow=None desliga a ordenação hierárquica dos blocos (a parte mais
+    cara da análise de layout). char_margin alto junta rótulo e valor na
+    mesma linha ("CLASSE :INVENTÁRIO"); com o padrão (2.0) eles viram caixas
+    separadas e o parser não acha nenhuma classe.
+    """
+    nome = "pdfminer"
+
+    def __init__(self, laparams: Optional[Dict] = None):
+        self.laparams = laparams or {"char_margin": 50.0, "line_margin": 0.1, "boxes_flow": None}
+
+    def contar_paginas(self, pdf_path: str) -> int:
+        from pdfminer.pdfpage import PDFPage
+
+        with open(pdf_path, 'rb') as f:
+            return sum(1 for _ in PDFPage.get_pages(f))
+
+    def iter_textos(self, pdf_path: str, inicio: int, fim: int) -> Iterator[Tuple[int, str]]:
+        from pdfminer.converter import PDFPageAggregator
+        from pdfminer.layout import LAParams, LTTextContainer
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+
+        manager = PDFResourceManager()
+        device = PDFPageAggregator(manager, laparams=LAParams(**self.laparams))
+        interpreter = PDFPageInterpreter(manager, device)
+
+        with open(pdf_path, 'rb') as f:
+            for indice, page in enumerate(PDFPage.get_pages(f, pagenos=range(inicio, fim))):
+                interpreter.process_page(page)
+                layout = device.get_result()
+                texto = "".join(
+                    elemento.get_text() for elemento in layout if isinstance(elemento, LTTextContainer)
+                )
+                yield inicio + indice, texto.strip()
+
+
+class Pypdfium2Backend(BackendTexto):
+    nome = "pypdfium2"
+
+    def contar_paginas(self, pdf_path: str) -> int:
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def iter_textos(self, pdf_path: str, inicio: int, fim: int) -> Iterator[Tuple[int, str]]:
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            for indice in range(inicio, fim):
+                page = pdf[indice]
+                textpage = page.get_textpage()
+                texto = textpage.get_text_range()
+                textpage.close()
+                page.close()
+                yield indice, texto.replace("\r\n", "\n").replace("\r", "\n").strip()
+        finally:
+            pdf.close()
+
+
+BACKENDS = {
+    backend.nome: backend
+    for backend in (PdfplumberBackend, PdfminerBackend, Pypdfium2Backend)
+}
+
+
+def obter_backend(nome: Optional[str] = None) -> BackendTexto:
+    """Instancia o backend pelo nome (None = DJE_PDF_BACKEND / pdfplumber)"""
+    nome = nome or BACKEND_PADRAO
+    if nome not in BACKENDS:
+        raise ValueError(f"Backend de texto desconhecido: {nome}. Opções: {', '.join(BACKENDS)}")
+    return BACKENDS[nome]()
+
+
+def contar_paginas(pdf_path: str, usar_cache: bool = True, backend: Optional[str] = None) -> int:
+    """Quantidade de páginas do PDF"""
+    pdf_hash = cache_texto_dje.hash_pdf(pdf_path) if usar_cache else None
+
+    if pdf_hash:
+        total = cache_texto_dje.ler_total_paginas(pdf_hash)
+        if total is not None:
+            return total
+
+    total = obter_backend(backend).contar_paginas(pdf_path)
+
+    if pdf_hash:
+        cache_texto_dje.salvar_total_paginas(pdf_hash, total)
+
+    return total
+
+
+def iter_textos_paginas(
+    pdf_path: str,
+    inicio: int = 0,
+    fim: Optional[int] = None,
+    usar_cache: bool = True,
+    backend: Optional[str] = None
+) -> Iterator[Tuple[int, str]]:
+    """
+    Gera (indice, texto) para as páginas [inicio, fim) - índices 0-based
+
+    Páginas sem texto geram string vazia. A partir da primeira página fora
+    do cache, o restante do intervalo é extraído numa única abertura do PDF.
+    """
+    extrator = obter_backend(backend)
+    pdf_hash = cache_texto_dje.hash_pdf(pdf_path) if usar_cache else None
+    total = contar_paginas(pdf_path, usar_cache=usar_cache, backend=extrator.nome)
+    fim = total if fim is None else min(fim, total)
+
+    indice = inicio
+    while pdf_hash and indice < fim:
+        texto = cache_texto_dje.ler_texto_pagina(pdf_hash, indice + 1, extrator.nome)
+        if texto is None:
+            break
+        yield indice, texto
+        indice += 1
+
+    if indice >= fim:
+        return
+
+    for indice, texto in extrator.iter_textos(pdf_path, indice, fim):
+        if pdf_hash:
+            cache_texto_dje.salvar_texto_pagina(pdf_hash, indice + 1, texto, extrator.nome)
+        yield indice, texto
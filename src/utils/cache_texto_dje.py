@@ -0,0 +1,84 @@
+"""
+Cache persistente do texto de cada página dos PDFs do DJE
+
+O texto extraído pelo pdfplumber (a parte LENTA do parsing) é salvo
+comprimido em disco, chaveado pelo hash do CONTEÚDO do PDF e pelo número da
+página. Reprocessar o mesmo PDF com outros tipos/filtros/palavras-chave
+custa apenas o tempo das regex.
+
+Cada backend de extração (src/scrapers/dje_texto.py) tem seu próprio
+diretório, já que o texto produzido difere entre eles.
+
+Estrutura:
+    data/dje_text_cache/<sha256 do PDF>/meta.json                  {"total_paginas": N}
+    data/dje_text_cache/<sha256 do PDF>/<backend>/00001.txt.gz     texto da página 1
+"""
+import gzip
+import hashlib
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+CACHE_TEXTO_DIR = os.getenv("DJE_TEXT_CACHE_DIR", "data/dje_text_cache")
+
+# (caminho absoluto, tamanho, mtime) -> sha256, para não reler o PDF no mesmo processo
+_hashes: Dict[Tuple[str, int, int], str] = {}
+
+
+def hash_pdf(pdf_path: str) -> str:
+    """SHA-256 do conteúdo do PDF (memoizado por caminho/tamanho/mtime)"""
+    stat = os.stat(pdf_path)
+    chave = (os.path.abspath(pdf_path), stat.st_size, stat.st_mtime_ns)
+
+    if chave not in _hashes:
+        sha = hashlib.sha256()
+        with open(pdf_path, 'rb') as f:
+            for bloco in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(bloco)
+        _hashes[chave] = sha.hexdigest()
+
+    return _hashes[chave]
+
+
+def _dir_pdf(pdf_hash: str) -> str:
+    return os.path.join(CACHE_TEXTO_DIR, pdf_hash)
+
+
+def _gravar_atomico(caminho: str, dados: bytes) -> None:
+    """Grava via arquivo temporário + rename (workers paralelos podem gravar juntos)"""
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temp = f"{caminho}.{os.getpid()}.tmp"
+    with open(temp, 'wb') as f:
+        f.write(dados)
+    os.replace(temp, caminho)
+
+
+def ler_texto_pagina(pdf_hash: str, pagina: int, backend: str = "pdfplumber") -> Optional[str]:
+    """Texto da página (1-based) ou None se ainda não estiver no cache"""
+    caminho = os.path.join(_dir_pdf(pdf_hash), backend, f"{pagina:05d}.txt.gz")
+    try:
+        with open(caminho, 'rb') as f:
+            return gzip.decompress(f.read()).decode('utf-8')
+    except (OSError, EOFError):
+        return None
+
+
+def salvar_texto_pagina(pdf_hash: str, pagina: int, texto: str, backend: str = "pdfplumber") -> None:
+    """Salva o texto da página (1-based); páginas sem texto são salvas vazias"""
+    caminho = os.path.join(_dir_pdf(pdf_hash), backend, f"{pagina:05d}.txt.gz")
+    _gravar_atomico(caminho, gzip.compress((texto or "").encode('utf-8'), compresslevel=6))
+
+
+def ler_total_paginas(pdf_hash: str) -> Optional[int]:
+    """Quantidade de páginas registrada para o PDF (None se desconhecida)"""
+    try:
+        with open(os.path.join(_dir_pdf(pdf_hash), "meta.json"), 'r', encoding='utf-8') as f:
+            return json.load(f).get("total_paginas")
+    except (OSError, ValueError):
+        return None
+
+
+def salvar_total_paginas(pdf_hash: str, total_paginas: int) -> None:
+    """Registra a quantidade de páginas do PDF"""
+    caminho = os.path.join(_dir_pdf(pdf_hash), "meta.json")
+    _gravar_atomico(caminho, json.dumps({"total_paginas": total_paginas}).encode('utf-8'))
@@ -1,28 +1,331 @@
 """
-Indexador de PDFs DJE - Processa todos os PDFs UMA VEZ e salva em cache JSON
+Indexador de PDFs DJE - Processa cada PDF UMA VEZ e salva no índice colunar
+
+O índice (src/utils/indice_dje.py, aberto via mmap) guarda registros leves (modo leve do parser): número, tipo,
+classe, comarca, flags, relevância, valor da causa e o ponteiro (pdf_origem,
+pagina_dje, offset). Filtros e ordenações (inclusive por valor) só usam as
+colunas; partes e advogados são extraídos do PDF só quando alguém abre o
+processo (materializar_detalhes) e ficam memorizados.
+
+O manifesto do índice guarda, por PDF, tamanho, hash, versão do parser e
+quantidade de registros: a reindexação só parseia PDFs novos ou alterados
+(ou todos, com reconstruir=True).
+
+Os PDFs são parseados em WORKERS_INDEXACAO processos. Cada worker grava o
+segmento do PDF direto no disco (o processo principal só recebe a entrada
+do manifesto) e é trocado por um novo depois de PDFS_POR_WORKER PDFs ou
+quando o pico de RSS passa de LIMITE_RSS_WORKER_MB: a memória da
+indexação fica limitada ao que K workers usam com um PDF cada.
+
+ler_cache() mantém o índice aberto no módulo e só reabre quando o
+manifesto muda (reindexação/atualização diária trocam o manifesto).
 """
-import os
+import base64
+import hashlib
+import heapq
 import json
+import math
+import multiprocessing
+import os
+import queue
+import resource
+import threading
 from datetime import datetime
-from typing import List, Dict
-from src.scrapers.dje_parser import extrair_processos_dje
+from functools import lru_cache
+from typing import Iterator, List, Dict, Optional, Tuple
+from src.scrapers.dje_parser import (
+    JANELA_ENTRE_PAGINAS,
+    MODO_LEVE,
+    VERSAO_REGISTROS,
+    detalhes_registro,
+    filtrar_registros,
+    iter_registros_dje
+)
+from src.scrapers.dje_texto import obter_backend
+from src.utils.cache_texto_dje import hash_pdf
+from src.utils.indice_dje import (
+    CODIGOS_FLAGS,
+    FLAG_ATIVO,
+    FLAG_IMOVEL,
+    INDICE_DIR,
+    MANIFESTO,
+    TAMANHO_MINIMO_TERMO,
+    VERSAO_INDICE,
+    IndiceDJE,
+    SegmentoDJE,
+    abrir_indice,
+    converter_cache_json,
+    escrever_segmento,
+    ler_manifesto,
+    nome_segmento,
+    ordinal_data,
+    proxima_geracao,
+    tokens,
+    trava_escrita,
+    trocar_manifesto
+)
+from src.utils.numeros_conhecidos import reconstruir_numeros_conhecidos
+
+# Cache JSON das versões anteriores: migrado para o índice na primeira leitura
+CACHE_JSON_LEGADO = "data/dje_cache.json"
+
+# Onde o downloader grava os cadernos (e a atualização diária os lê)
+PDFS_DIR = "data/dje_pdfs"
+
+TIPOS_INDEXADOS = ["Inventário", "Divórcio", "Arrolamento"]
+
+# Detalhes (partes, advogados) memorizados por processo
+TAMANHO_MEMO_DETALHES = 4096
+
+# Ordenações resolvidas pelas colunas do índice: critério -> (coluna, decrescente)
+ORDENACOES_COLUNA = {
+    "relevancia_desc": ("score_relevancia", True),
+    "relevancia_asc": ("score_relevancia", False),
+    "data_desc": ("data_ordinal", True),
+    "data_asc": ("data_ordinal", False),
+    "valor_desc": ("valor_causa", True),
+    "valor_asc": ("valor_causa", False),
+}
+
+# Workers da indexação e quando reciclá-los
+WORKERS_INDEXACAO = int(os.getenv("DJE_INDEXACAO_WORKERS", "2"))
+PDFS_POR_WORKER = int(os.getenv("DJE_INDEXACAO_PDFS_POR_WORKER", "10"))
+LIMITE_RSS_WORKER_MB = int(os.getenv("DJE_INDEXACAO_LIMITE_RSS_MB", "768"))
+
+# Workers mortos antes de pegar um PDF (ex.: falha ao importar) substituídos,
+# no total, antes de a indexação seguir em série no processo principal
+MAX_MORTES_SEM_PDF = 3
+
+# diretório -> (assinatura do manifesto, índice aberto)
+_indices_abertos: Dict[str, tuple] = {}
+_trava_indices = threading.Lock()
+
+
+def versao_parser() -> str:
+    """Tudo que muda os registros indexados de um PDF: backend, janela, versão dos registros, modo e tipos"""
+    return (
+        f"{obter_backend(None).nome}-j{JANELA_ENTRE_PAGINAS}-v{VERSAO_REGISTROS}"
+        f"-{MODO_LEVE}-{','.join(TIPOS_INDEXADOS)}"
+    )
+
+
+def _pdf_inalterado(pdf_path: str, entrada: Dict, versao: str) -> bool:
+    """Compara o PDF com a entrada do manifesto (hash só quando o mtime mudou)"""
+    if not entrada or entrada.get("versao_parser") != versao:
+        return False
+    stat = os.stat(pdf_path)
+    if stat.st_size != entrada.get("tamanho"):
+        return False
+    if stat.st_mtime_ns == entrada.get("mtime_ns"):
+        return True
+    if hash_pdf(pdf_path) == entrada.get("sha256"):
+        entrada["mtime_ns"] = stat.st_mtime_ns
+        return True
+    return False
+
+
+def _indexar_pdf(pdf_path: str, indice_dir: str, geracao: int, versao: str) -> Dict:
+    """Parseia um PDF, grava o segmento dele e devolve {"segmento", "entrada"} para o manifesto"""
+    pdf_nome = os.path.basename(pdf_path)
+
+    # Processar SEM FILTROS - capturar TUDO (streaming, página a página),
+    # em modo leve: partes/advogados/valor só sob demanda
+    processos = []
+    for p in filtrar_registros(
+        iter_registros_dje(pdf_path, modo=MODO_LEVE, tipos=TIPOS_INDEXADOS),
+        tipos=TIPOS_INDEXADOS,
+        filtrar_imoveis=False,  # Captura todos
+        filtrar_ativos=False,   # Captura todos
+        comarcas_filtro=None    # Captura todas
+    ):
+        # Adicionar metadados do PDF
+        p["pdf_origem"] = pdf_nome
+        p["data_pdf"] = pdf_nome.split("_")[1].replace(".pdf", "")
+        processos.append(p)
+
+    nome = nome_segmento(pdf_nome, geracao)
+    escrever_segmento(processos, {"pdf": pdf_nome}, os.path.join(indice_dir, nome))
+
+    stat = os.stat(pdf_path)
+    return {
+        "segmento": {"nome": nome, "pdf": pdf_nome, "total": len(processos)},
+        "entrada": {
+            "tamanho": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": hash_pdf(pdf_path),
+            "versao_parser": versao,
+            "registros": len(processos),
+            "data_indexacao": datetime.now().isoformat()
+        }
+    }
+
+
+def _pico_rss_mb() -> float:
+    # Linux: ru_maxrss em KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _worker_indexacao(fila_pdfs, fila_resultados, indice_dir: str, geracao: int, versao: str,
+                      pdfs_por_worker: int, limite_rss_mb: int) -> None:
+    """
+    Processo worker: indexa PDFs da fila até receber None ou atingir o limite
+
+    Avisa {"tipo": "inicio"} antes de cada PDF (se o worker morrer no meio,
+    o principal sabe qual PDF perdeu) e {"tipo": "fim"} ao se aposentar.
+    """
+    processados = 0
+    while True:
+        pdf_path = fila_pdfs.get()
+        if pdf_path is None:
+            break
+
+        fila_resultados.put({"tipo": "inicio", "pid": os.getpid(), "pdf": pdf_path})
+        try:
+            resultado = _indexar_pdf(pdf_path, indice_dir, geracao, versao)
+        except Exception as e:
+            resultado = {"erro": str(e)}
+        fila_resultados.put({"tipo": "pdf", "pid": os.getpid(), "pdf": pdf_path, **resultado})
+
+        processados += 1
+        if processados >= pdfs_por_worker or _pico_rss_mb() >= limite_rss_mb:
+            break
+
+    fila_resultados.put({"tipo": "fim", "pid": os.getpid(), "processados": processados, "rss_mb": _pico_rss_mb()})
+
 
+def _indexar_em_workers(
+    pendentes: List[str],
+    indice_dir: str,
+    geracao: int,
+    versao: str,
+    workers: int,
+    pdfs_por_worker: int,
+    limite_rss_mb: int
+):
+    """
+    Distribui os PDFs entre processos worker e devolve os resultados conforme chegam
+
+    Gera (pdf_path, resultado) - resultado com "segmento"/"entrada" ou "erro".
+    Worker que se aposenta (PDFs ou RSS) é substituído enquanto houver PDF
+    na fila; worker que morre (ex.: OOM killer) perde só o PDF em andamento.
+    Workers que morrem sem PDF em andamento (não conseguem nem começar)
+    são substituídos no máximo MAX_MORTES_SEM_PDF vezes; passado isso, ou
+    se PDFs se perderem entre a fila e um worker, os PDFs que faltam são
+    indexados aqui mesmo, em série.
+    """
+    # spawn: a API chama a indexação de uma thread (fork + threads não é seguro)
+    contexto = multiprocessing.get_context("spawn")
+    fila_pdfs = contexto.Queue()
+    fila_resultados = contexto.Queue()
+    for pdf_path in pendentes:
+        fila_pdfs.put(pdf_path)
+
+    ativos = {}          # pid -> Process
+    em_andamento = {}    # pid -> pdf_path
+    entregues = set()    # PDFs com resultado já devolvido
+    mortes_sem_pdf = 0
+
+    def iniciar_worker():
+        processo = contexto.Process(
+            target=_worker_indexacao,
+            args=(fila_pdfs, fila_resultados, indice_dir, geracao, versao, pdfs_por_worker, limite_rss_mb),
+            daemon=True
+        )
+        processo.start()
+        ativos[processo.pid] = processo
+
+    for _ in range(min(max(1, workers), len(pendentes))):
+        iniciar_worker()
+
+    while len(entregues) < len(pendentes):
+        try:
+            mensagem = fila_resultados.get(timeout=5)
+        except queue.Empty:
+            # Worker morto sem avisar: o PDF em andamento conta como erro
+            for pid, processo in list(ativos.items()):
+                if not processo.is_alive():
+                    del ativos[pid]
+                    pdf_path = em_andamento.pop(pid, None)
+                    if pdf_path:
+                        entregues.add(pdf_path)
+                        yield pdf_path, {"erro": f"worker {pid} terminou com código {processo.exitcode}"}
+                    else:
+                        mortes_sem_pdf += 1
+                    if len(entregues) < len(pendentes) and mortes_sem_pdf <= MAX_MORTES_SEM_PDF:
+                        iniciar_worker()
+            # Sem worker vivo, ou todos parados com a fila vazia: não há mais progresso
+            if not ativos or (not em_andamento and fila_pdfs.empty()):
+                break
+            continue
 
-def indexar_todos_pdfs(pdfs_dir: str = "data/dje_pdfs", cache_path: str = "data/dje_cache.json", limite_pdfs: int = None) -> Dict:
+        pid = mensagem["pid"]
+        if mensagem["tipo"] == "inicio":
+            em_andamento[pid] = mensagem["pdf"]
+        elif mensagem["tipo"] == "pdf":
+            em_andamento.pop(pid, None)
+            entregues.add(mensagem["pdf"])
+            yield mensagem["pdf"], mensagem
+        elif mensagem["tipo"] == "fim":
+            processo = ativos.pop(pid, None)
+            if processo:
+                processo.join()
+            print(f"  ♻️  Worker {pid} reciclado ({mensagem['processados']} PDFs, pico de {mensagem['rss_mb']:.0f} MB)")
+            if len(entregues) < len(pendentes):
+                iniciar_worker()
+
+    for _ in ativos:
+        fila_pdfs.put(None)
+    for processo in ativos.values():
+        processo.join(timeout=30)
+        if processo.is_alive():
+            processo.terminate()
+
+    restantes = [pdf_path for pdf_path in pendentes if pdf_path not in entregues]
+    if restantes:
+        print(f"  ⚠️  Workers sem progresso ({mortes_sem_pdf} mortes sem PDF): {len(restantes)} PDFs indexados em série")
+    for pdf_path in restantes:
+        try:
+            yield pdf_path, _indexar_pdf(pdf_path, indice_dir, geracao, versao)
+        except Exception as e:
+            yield pdf_path, {"erro": str(e)}
+
+
+def indexar_todos_pdfs(
+    pdfs_dir: str = PDFS_DIR,
+    indice_dir: str = INDICE_DIR,
+    limite_pdfs: int = None,
+    reconstruir: bool = False,
+    workers: int = WORKERS_INDEXACAO,
+    pdfs_por_worker: int = PDFS_POR_WORKER,
+    limite_rss_mb: int = LIMITE_RSS_WORKER_MB
+) -> Dict:
     """
-    Processa TODOS os PDFs (ou limite especificado) e salva em cache JSON
+    Indexa os PDFs (ou limite especificado) no índice colunar
+
+    Só PDFs novos ou alterados (tamanho/hash) ou indexados por outra versão
+    do parser são parseados; cada um vira um segmento novo. Os segmentos
+    dos demais são reaproveitados, e os de PDFs fora da seleção saem do índice.
 
     Args:
         pdfs_dir: Diretório com PDFs
-        cache_path: Caminho do arquivo de cache
-        limite_pdfs: Limite de PDFs a processar (None = todos). Use 10-15 para evitar OOM no Railway.
+        indice_dir: Diretório do índice (src/utils/indice_dje.py)
+        limite_pdfs: Limite de PDFs a processar (None = todos, mais recentes primeiro)
+        reconstruir: Ignora o manifesto e reparseia todos os PDFs
+        workers: Processos parseando PDFs ao mesmo tempo
+        pdfs_por_worker: PDFs por worker antes de trocá-lo por um novo
+        limite_rss_mb: Pico de RSS (MB) a partir do qual o worker é trocado
 
     Returns:
+        manifesto do índice:
         {
             "total_processos": int,
             "total_pdfs": int,
             "data_indexacao": str,
-            "processos": [...]
+            "backend": str,            # extrator de texto usado (ponteiros dependem dele)
+            "janela_paginas": int,
+            "pdfs_dir": str,           # onde estão os PDFs (caminho absoluto)
+            "pdfs": {nome: {"tamanho", "mtime_ns", "sha256", "versao_parser", "registros"}},
+            ...                        # segmentos e geração
         }
     """
     print("\n" + "="*80)
@@ -45,78 +348,351 @@ def indexar_todos_pdfs(pdfs_dir: str = "data/dje_pdfs", cache_path: str = "data/
         todos_pdfs = todos_pdfs[:limite_pdfs]
         print(f"⚠️  MODO LIMITADO: Processando apenas os {limite_pdfs} PDFs mais recentes (de {len(todos_pdfs)} disponíveis)")
 
-    print(f"\n📦 {len(todos_pdfs)} PDFs encontrados")
-    print("⏳ Processando... (isso pode levar 10-20 minutos, mas só precisa ser feito UMA VEZ)\n")
-
-    todos_processos = []
-    pdfs_processados = 0
-
-    for i, pdf_path in enumerate(todos_pdfs, 1):
-        pdf_nome = os.path.basename(pdf_path)
-        print(f"[{i}/{len(todos_pdfs)}] {pdf_nome}")
-
-        try:
-            # Processar SEM FILTROS - capturar TUDO
-            processos = extrair_processos_dje(
-                pdf_path=pdf_path,
-                tipos=["Inventário", "Divórcio", "Arrolamento"],
-                filtrar_imoveis=False,  # Captura todos
-                filtrar_ativos=False,   # Captura todos
-                comarcas_filtro=None    # Captura todas
-            )
-
-            # Adicionar metadados do PDF
-            for p in processos:
-                p["pdf_origem"] = pdf_nome
-                p["data_pdf"] = pdf_nome.split("_")[1].replace(".pdf", "")
-
-            todos_processos.extend(processos)
-            pdfs_processados += 1
-            print(f"  ✅ {len(processos)} processos extraídos\n")
+    # Um escritor por vez: do manifesto lido até a troca (ver trava_escrita)
+    with trava_escrita(indice_dir):
+        manifesto = None if reconstruir else ler_manifesto(indice_dir)
+        if manifesto and manifesto.get("versao") != VERSAO_INDICE:
+            print(f"🔨 Índice no formato v{manifesto.get('versao')} (atual: v{VERSAO_INDICE}): reconstruindo")
+            manifesto = None
+        pdfs_anteriores = (manifesto or {}).get("pdfs", {})
+        versao = versao_parser()
+
+        pendentes = [
+            pdf_path for pdf_path in todos_pdfs
+            if not _pdf_inalterado(pdf_path, pdfs_anteriores.get(os.path.basename(pdf_path)), versao)
+        ]
+
+        print(f"\n📦 {len(todos_pdfs)} PDFs encontrados")
+        if reconstruir:
+            print("🔨 Reconstrução completa: todos os PDFs serão parseados")
+        else:
+            print(f"♻️  {len(todos_pdfs) - len(pendentes)} PDFs já indexados (sem mudança)")
+        print(f"⏳ Processando {len(pendentes)} PDFs novos ou alterados ({min(max(1, workers), max(1, len(pendentes)))} workers)...\n")
+
+        pdfs = {}
+        for pdf_path in todos_pdfs:
+            pdf_nome = os.path.basename(pdf_path)
+            if pdf_nome in pdfs_anteriores and pdf_path not in pendentes:
+                pdfs[pdf_nome] = pdfs_anteriores[pdf_nome]
+
+        # Workers gravam os segmentos (nomeados com a geração do próximo manifesto);
+        # aqui só chegam as entradas do manifesto
+        geracao = proxima_geracao(indice_dir)
+        segmentos_novos = []
+        resultados = _indexar_em_workers(
+            pendentes, indice_dir, geracao, versao, workers, pdfs_por_worker, limite_rss_mb
+        ) if pendentes else []
+        for i, (pdf_path, resultado) in enumerate(resultados, 1):
+            pdf_nome = os.path.basename(pdf_path)
+
+            if "erro" in resultado:
+                # Segmento anterior do PDF (se houver) continua valendo
+                print(f"[{i}/{len(pendentes)}] {pdf_nome}  ❌ ERRO: {resultado['erro']}")
+                if pdf_nome in pdfs_anteriores:
+                    pdfs[pdf_nome] = pdfs_anteriores[pdf_nome]
+                continue
 
-        except Exception as e:
-            print(f"  ❌ ERRO: {e}\n")
-            continue
+            segmentos_novos.append(resultado["segmento"])
+            pdfs[pdf_nome] = resultado["entrada"]
+            print(f"[{i}/{len(pendentes)}] {pdf_nome}  ✅ {resultado['segmento']['total']} processos extraídos")
 
-    # Criar estrutura do cache
-    cache = {
-        "total_processos": len(todos_processos),
-        "total_pdfs": pdfs_processados,
-        "data_indexacao": datetime.now().isoformat(),
-        "processos": todos_processos
-    }
+        # Salvar índice: segmentos novos + os reaproveitados dos PDFs selecionados
+        meta = trocar_manifesto(segmentos_novos, {
+            "pdfs": pdfs,
+            "total_pdfs": len(pdfs),
+            "data_indexacao": datetime.now().isoformat(),
+            "backend": obter_backend(None).nome,
+            "janela_paginas": JANELA_ENTRE_PAGINAS,
+            "pdfs_dir": os.path.abspath(pdfs_dir)
+        }, indice_dir, manter=pdfs, geracao=geracao)
 
-    # Salvar cache
-    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-    with open(cache_path, 'w', encoding='utf-8') as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2)
+    # Indexação completa é o modo refresh: os números conhecidos são refeitos
+    # a partir do índice novo para as próximas atualizações diárias
+    reconstruir_numeros_conhecidos(indice_dir)
 
     print("\n" + "="*80)
     print("✅ INDEXAÇÃO CONCLUÍDA!")
     print("="*80)
-    print(f"📊 Total de processos indexados: {len(todos_processos)}")
-    print(f"📄 PDFs processados: {pdfs_processados}/{len(todos_pdfs)}")
-    print(f"💾 Cache salvo em: {cache_path}")
-    print(f"📦 Tamanho do arquivo: {os.path.getsize(cache_path) / 1024 / 1024:.2f} MB")
+    print(f"📊 Total de processos indexados: {meta['total_processos']}")
+    print(f"📄 PDFs parseados: {len(segmentos_novos)}/{len(pendentes)} (índice com {len(pdfs)}/{len(todos_pdfs)})")
+    print(f"💾 Índice salvo em: {indice_dir}")
+    tamanho = sum(
+        arquivo.stat().st_size
+        for segmento in meta["segmentos"]
+        for arquivo in os.scandir(os.path.join(indice_dir, segmento["nome"]))
+    )
+    print(f"📦 Tamanho do índice: {tamanho / 1024 / 1024:.2f} MB")
     print("="*80)
 
-    return cache
+    return meta
+
+
+def _assinatura_indice(indice_dir: str) -> tuple:
+    """
+    Identifica a versão gravada do índice: toda escrita troca o manifesto
+    (arquivo temporário + rename), então inode/mtime/tamanho mudam
+    """
+    stat = os.stat(os.path.join(indice_dir, MANIFESTO))
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def ler_cache(indice_dir: str = INDICE_DIR) -> IndiceDJE:
+    """
+    Índice de processos aberto (mmap: nada é lido até a busca tocar as colunas)
+
+    O índice fica aberto no módulo e é reaproveitado entre requisições; só
+    é reaberto quando o manifesto muda. A reabertura acontece numa thread
+    por vez: enquanto ela não termina, as outras seguem com o índice
+    anterior. O índice devolvido é compartilhado - não chamar fechar().
+
+    Se o índice ainda não existe mas há um dje_cache.json das versões
+    anteriores, ele é convertido uma vez.
+    """
+    if not os.path.exists(os.path.join(indice_dir, MANIFESTO)) and os.path.exists(CACHE_JSON_LEGADO):
+        with _trava_indices:
+            if not os.path.exists(os.path.join(indice_dir, MANIFESTO)):
+                converter_cache_json(CACHE_JSON_LEGADO, indice_dir)
+
+    try:
+        assinatura = _assinatura_indice(indice_dir)
+    except FileNotFoundError:
+        return abrir_indice(indice_dir)  # levanta com a mensagem de índice não encontrado
+
+    aberto = _indices_abertos.get(indice_dir)
+    if aberto and aberto[0] == assinatura:
+        return aberto[1]
+
+    # Outra thread já está reabrindo: segue com o snapshot anterior
+    if aberto and not _trava_indices.acquire(blocking=False):
+        return aberto[1]
+    if not aberto:
+        _trava_indices.acquire()
+
+    try:
+        aberto = _indices_abertos.get(indice_dir)
+        if aberto and aberto[0] == assinatura:
+            return aberto[1]
+
+        # O anterior não é fechado: requisições em andamento ainda podem
+        # estar lendo dele (os mmaps são soltos quando a última referência sai)
+        indice = abrir_indice(indice_dir)
+        _indices_abertos[indice_dir] = (assinatura, indice)
+        return indice
+    finally:
+        _trava_indices.release()
+
+
+@lru_cache(maxsize=TAMANHO_MEMO_DETALHES)
+def _detalhes(pdf_path: str, pagina_dje: int, offset: int, numero: str, backend: str, janela_paginas: int) -> Dict:
+    return detalhes_registro(pdf_path, pagina_dje, offset, numero, backend=backend, janela_paginas=janela_paginas)
+
+
+def materializar_detalhes(processos: List[Dict], meta: Dict, pdfs_dir: Optional[str] = None) -> List[Dict]:
+    """
+    Preenche partes e advogados dos registros leves (no lugar)
+
+    Cada processo é extraído uma vez: o resultado fica no próprio dict e no
+    memo de _detalhes (que sobrevive entre requisições). Registros antigos,
+    já completos, ou sem ponteiro passam direto.
+
+    O PDF é procurado no diretório de onde o índice foi gerado
+    (meta["pdfs_dir"]) e depois em PDFS_DIR, onde a atualização diária
+    baixa os cadernos que acrescenta.
+    """
+    backend = meta.get("backend") or obter_backend(None).nome
+    janela = meta.get("janela_paginas", JANELA_ENTRE_PAGINAS)
+    diretorios = [pdfs_dir or meta.get("pdfs_dir") or PDFS_DIR]
+    if os.path.abspath(diretorios[0]) != os.path.abspath(PDFS_DIR):
+        diretorios.append(PDFS_DIR)
+
+    for p in processos:
+        if "partes" in p or "offset" not in p:
+            continue
+        pdf_path = next(
+            (caminho for caminho in (os.path.join(d, p["pdf_origem"]) for d in diretorios) if os.path.exists(caminho)),
+            None
+        )
+        if pdf_path is None:
+            p.update({"partes": [], "advogados": []})
+            continue
+        p.update(_detalhes(pdf_path, p["pagina_dje"], p["offset"], p["numero"], backend, janela))
+
+    return processos
+
+
+def detalhes_processo_cache(cache: IndiceDJE, numero: str) -> Optional[Dict]:
+    """Processo do índice com partes e advogados (materializar_detalhes); None se não está no índice"""
+    localizado = cache.localizar([numero]).get(numero)
+    if localizado is None:
+        return None
+    segmento, linha = localizado
+    return materializar_detalhes([segmento.processo(linha)], cache.meta)[0]
+
+
+def _linhas_segmento(
+    segmento: SegmentoDJE,
+    data_aceita,
+    tipo_aceito,
+    flags_exigidas: int,
+    codigo_aceito,
+    comarca_aceita,
+    termos: List[Tuple[str, List[str]]] = (),
+    valor_aceito=None
+) -> List[int]:
+    """
+    Linhas do segmento que passam nos filtros de colunas
+
+    data_aceita, tipo_aceito, codigo_aceito e comarca_aceita são predicados
+    sobre os valores do dicionário (None = sem filtro). Cada filtro vira um
+    bitmap (OR das listas invertidas dos códigos aceitos) e o resultado é o
+    AND deles: nenhuma linha é visitada até sobrarem só as aprovadas. Termos de partes/advogados (os mais
+    seletivos, primeiro): cada prefixo é o OR das listas dos tokens que
+    começam com ele, e todos os prefixos precisam casar. valor_aceito
+    (predicado sobre valor_causa) roda por último, só nas linhas que sobraram.
+    """
+    bitmap = segmento.todas()
+
+    for campo, prefixos in termos:
+        for prefixo in prefixos:
+            if bitmap:
+                bitmap &= segmento.bitmap_prefixo(campo, prefixo)
+
+    # Filtrar por data do DJE (se especificado)
+    if data_aceita and bitmap:
+        bitmap &= segmento.bitmap("data_pdf", segmento.codigos("data_pdf", data_aceita))
+
+    if tipo_aceito and bitmap:
+        bitmap &= segmento.bitmap("tipo", segmento.codigos("tipo", tipo_aceito))
+
+    if flags_exigidas and bitmap:
+        bitmap &= segmento.bitmap(
+            "flags", [flags for flags in range(CODIGOS_FLAGS) if flags & flags_exigidas == flags_exigidas]
+        )
+
+    if comarca_aceita and bitmap:
+        bitmap &= (
+            segmento.bitmap("codigo_comarca", segmento.codigos("codigo_comarca", codigo_aceito))
+            | segmento.bitmap("comarca", segmento.codigos("comarca", comarca_aceita))
+        )
+
+    if not bitmap:
+        return []
+    linhas = segmento.linhas(bitmap)
+    if valor_aceito:
+        valores = segmento.coluna("valor_causa")
+        linhas = [linha for linha in linhas if valor_aceito(valores[linha])]
+    return linhas
+
+
+def filtrar_linhas_cache(
+    cache: IndiceDJE,
+    tipos: List[str] = None,
+    comarcas: List[str] = None,
+    apenas_imoveis: bool = True,
+    apenas_ativos: bool = True,
+    data_inicio: str = None,
+    data_fim: str = None,
+    parte: str = None,
+    advogado: str = None,
+    valor_min: float = None,
+    valor_max: float = None
+) -> List[Tuple[SegmentoDJE, List[int]]]:
+    """
+    Linhas do índice que passam nos filtros de colunas, por segmento
+
+    Os filtros rodam sobre cada segmento: tipo, comarca e data são
+    comparados uma vez por valor do dicionário, e os códigos aceitos viram
+    bitmaps (listas invertidas gravadas na indexação) que se cruzam por AND.
+    Nenhum dict é montado (ver filtrar_processos_cache/buscar_processos_cache).
+
+    Args:
+        data_inicio: Data no formato YYYY-MM-DD (ex: 2024-01-01)
+        data_fim: Data no formato YYYY-MM-DD (ex: 2024-02-01)
+        parte/advogado: Termos do nome (sem diferenciar acento/maiúscula);
+            cada palavra casa por prefixo com alguma palavra do nome
+            ("jose silv" encontra "JOSÉ DA SILVA")
+        valor_min/valor_max: Faixa do valor da causa (coluna valor_causa;
+            processos sem valor ficam de fora)
+
+    Raises:
+        BuscaInvalida: data fora do formato ou parte/advogado sem nenhuma
+            palavra de TAMANHO_MINIMO_TERMO letras
+    """
+    indice = cache
+
+    termos = []
+    for campo, texto in (("partes", parte), ("advogados", advogado)):
+        if texto:
+            prefixos = [token for token in tokens(texto) if len(token) >= TAMANHO_MINIMO_TERMO]
+            if not prefixos:
+                raise BuscaInvalida(f"Busca por {campo} precisa de uma palavra com {TAMANHO_MINIMO_TERMO}+ letras: {texto!r}")
+            termos.append((campo, prefixos))
+
+    # Predicados por valor de dicionário: avaliados uma vez por valor distinto
+    # de cada segmento (None = filtro não pedido)
+    data_aceita = None
+    if data_inicio or data_fim:
+        try:
+            data_inicio_dt = datetime.strptime(data_inicio, "%Y-%m-%d") if data_inicio else None
+            data_fim_dt = datetime.strptime(data_fim, "%Y-%m-%d") if data_fim else None
+        except ValueError:
+            raise BuscaInvalida(f"Data fora do formato YYYY-MM-DD: {data_inicio or data_fim!r}")
+
+        def data_no_periodo(data_pdf: str) -> bool:
+            try:
+                # Converter DD-MM-YYYY para datetime
+                data_processo = datetime.strptime(data_pdf, "%d-%m-%Y")
+            except ValueError:
+                return False
+            if data_inicio_dt and data_processo < data_inicio_dt:
+                return False
+            if data_fim_dt and data_processo > data_fim_dt:
+                return False
+            return True
+
+        data_aceita = data_no_periodo
+
+    tipo_aceito = (lambda tipo: tipo in tipos) if tipos else None
+
+    flags_exigidas = (FLAG_IMOVEL if apenas_imoveis else 0) | (FLAG_ATIVO if apenas_ativos else 0)
+
+    codigo_aceito = comarca_aceita = None
+    if comarcas:
+        from src.utils.comarcas import FOROS_SAO_PAULO_CAPITAL
+
+        # Verificar se busca São Paulo
+        busca_sao_paulo = any(
+            c.lower() in ["são paulo", "sao paulo", "sp capital", "são paulo (capital)"]
+            for c in comarcas
+        )
+
+        # Se buscar São Paulo, aceitar códigos da capital
+        codigo_aceito = lambda codigo: busca_sao_paulo and codigo in FOROS_SAO_PAULO_CAPITAL
 
+        # Verificação normal por nome
+        comarca_aceita = lambda comarca: any(
+            c.lower() in comarca.lower() or comarca.lower() in c.lower() for c in comarcas
+        )
 
-def ler_cache(cache_path: str = "data/dje_cache.json") -> Dict:
-    """Lê o cache de processos"""
-    if not os.path.exists(cache_path):
-        raise FileNotFoundError(
-            f"Cache não encontrado em {cache_path}. "
-            f"Execute indexar_todos_pdfs() primeiro."
+    # Mesma regra do filtro sobre os dicts: sem valor (NaN na coluna) ou zero não passa
+    valor_aceito = None
+    if valor_min is not None or valor_max is not None:
+        valor_aceito = lambda valor: bool(valor) and (valor_min is None or valor >= valor_min) and (
+            valor_max is None or valor <= valor_max
         )
 
-    with open(cache_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    candidatos = []
+    for segmento in indice.segmentos:
+        linhas = _linhas_segmento(
+            segmento, data_aceita, tipo_aceito, flags_exigidas, codigo_aceito, comarca_aceita, termos, valor_aceito
+        )
+        if linhas:
+            candidatos.append((segmento, linhas))
+    return candidatos
 
 
 def filtrar_processos_cache(
-    cache: Dict,
+    cache: IndiceDJE,
     tipos: List[str] = None,
     comarcas: List[str] = None,
     apenas_imoveis: bool = True,
@@ -124,92 +700,213 @@ def filtrar_processos_cache(
     valor_min: float = None,
     valor_max: float = None,
     data_inicio: str = None,
-    data_fim: str = None
+    data_fim: str = None,
+    parte: str = None,
+    advogado: str = None
 ) -> List[Dict]:
     """
-    Filtra processos do cache (INSTANTÂNEO)
+    Filtra processos do índice (INSTANTÂNEO)
 
-    Esta função é EXTREMAMENTE RÁPIDA porque apenas filtra dados já processados
+    Só as linhas aprovadas pelos filtros de colunas (filtrar_linhas_cache,
+    inclusive o de valor) viram dict.
 
     Args:
         data_inicio: Data no formato YYYY-MM-DD (ex: 2024-01-01)
         data_fim: Data no formato YYYY-MM-DD (ex: 2024-02-01)
     """
-    processos = cache["processos"]
+    candidatos = filtrar_linhas_cache(
+        cache, tipos, comarcas, apenas_imoveis, apenas_ativos, data_inicio, data_fim, parte, advogado,
+        valor_min, valor_max
+    )
+    return [p for segmento, linhas in candidatos for p in segmento.processos(linhas)]
 
-    # Filtrar por data do DJE (se especificado)
-    if data_inicio or data_fim:
-        from datetime import datetime
 
-        processos_filtrados = []
-        for p in processos:
-            data_pdf = p.get("data_pdf")  # Formato: DD-MM-YYYY
-            if not data_pdf:
-                continue
+class BuscaInvalida(ValueError):
+    """Parâmetro da busca inválido (cursor, data, termo de parte/advogado): erro de quem chamou"""
 
-            try:
-                # Converter DD-MM-YYYY para datetime
-                data_processo = datetime.strptime(data_pdf, "%d-%m-%Y")
 
-                # Comparar com range
-                if data_inicio:
-                    data_inicio_dt = datetime.strptime(data_inicio, "%Y-%m-%d")
-                    if data_processo < data_inicio_dt:
-                        continue
+class CursorExpirado(BuscaInvalida):
+    """Cursor de uma versão anterior do índice (reindexação/atualização diária no meio da paginação)"""
 
-                if data_fim:
-                    data_fim_dt = datetime.strptime(data_fim, "%Y-%m-%d")
-                    if data_processo > data_fim_dt:
-                        continue
 
-                processos_filtrados.append(p)
-            except:
-                continue
+def _versao_indice(meta: Dict) -> str:
+    return f"{meta.get('versao')}.{meta.get('geracao')}"
 
-        processos = processos_filtrados
 
-    # Aplicar filtros
-    if tipos:
-        processos = [p for p in processos if p.get("tipo") in tipos]
+def _assinatura_busca(filtros: Dict) -> str:
+    dados = json.dumps(filtros, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(dados.encode("utf-8")).hexdigest()[:16]
 
-    if apenas_imoveis:
-        processos = [p for p in processos if p.get("tem_imovel") == True]
 
-    if apenas_ativos:
-        processos = [p for p in processos if p.get("esta_ativo") == True]
+def codificar_cursor(meta: Dict, filtros: Dict, chave: tuple) -> str:
+    """
+    Cursor opaco: versão do índice (versao.geracao), assinatura dos filtros
+    e chave de ordenação da última linha devolvida
+    """
+    dados = json.dumps({"i": _versao_indice(meta), "b": _assinatura_busca(filtros), "k": list(chave)})
+    return base64.urlsafe_b64encode(dados.encode("utf-8")).decode("ascii").rstrip("=")
 
-    if comarcas:
-        from src.utils.comarcas import FOROS_SAO_PAULO_CAPITAL
 
-        processos_filtrados = []
-        for p in processos:
-            comarca = p.get("comarca", "")
-            codigo_comarca = p.get("codigo_comarca", "")
+def decodificar_cursor(cursor: str, meta: Dict, filtros: Dict) -> tuple:
+    """
+    Chave de ordenação guardada no cursor
 
-            # Verificar se busca São Paulo
-            busca_sao_paulo = any(
-                c.lower() in ["são paulo", "sao paulo", "sp capital", "são paulo (capital)"]
-                for c in comarcas
-            )
+    Raises:
+        BuscaInvalida: cursor malformado ou de outra busca
+        CursorExpirado: cursor de outra versão do índice
+    """
+    try:
+        dados = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        versao, assinatura, chave = dados["i"], dados["b"], tuple(dados["k"])
+    except (ValueError, TypeError, KeyError):
+        raise BuscaInvalida("Cursor inválido")
 
-            # Se buscar São Paulo, aceitar códigos da capital
-            if busca_sao_paulo and codigo_comarca in FOROS_SAO_PAULO_CAPITAL:
-                processos_filtrados.append(p)
-                continue
+    if assinatura != _assinatura_busca(filtros):
+        raise BuscaInvalida("Cursor de outra busca (filtros ou ordenação diferentes)")
+    if versao != _versao_indice(meta):
+        raise CursorExpirado("Cursor expirado: o índice foi atualizado, refaça a busca")
+    return chave
+
+
+def _paginar(itens: list, chave, limite: Optional[int], apos: Optional[tuple]) -> Tuple[list, Optional[tuple]]:
+    """
+    Itens depois de `apos` (na ordem de `chave`) até `limite`, e a chave do
+    último devolvido se sobrar algum (None na última página)
+    """
+    if apos is not None:
+        itens = [item for item in itens if chave(item) > apos]
+    if limite is None or len(itens) <= limite:
+        return sorted(itens, key=chave), None
+    pagina = heapq.nsmallest(limite, itens, key=chave)
+    return pagina, chave(pagina[-1])
+
+
+def _ordenar_linhas(
+    candidatos: List[Tuple[SegmentoDJE, List[int]]],
+    ordenar_por: str,
+    limite_recentes: Optional[int],
+    limite: Optional[int] = None,
+    apos: Optional[tuple] = None
+) -> Tuple[Iterator[Dict], Optional[tuple]]:
+    """
+    Ordena linhas pelas colunas (score_relevancia, data_ordinal, valor_causa) e só monta os dicts devolvidos
 
-            # Verificação normal por nome
-            if any(c.lower() in comarca.lower() or comarca.lower() in c.lower() for c in comarcas):
-                processos_filtrados.append(p)
+    Mesmo resultado de ordenar_processos sobre os dicts - empates na ordem
+    em que os filtros devolveram as linhas. Com limite_recentes, os N mais
+    recentes (empates de data pela ordenação pedida) saem de um heap
+    (heapq.nsmallest) e só eles são ordenados pelo critério.
 
-        processos = processos_filtrados
+    A chave de ordenação termina na posição da linha, então é única: a
+    página seguinte são as `limite` menores chaves depois de `apos`.
+    Os dicts são montados à medida que o gerador é consumido.
+    """
+    coluna, decrescente = ORDENACOES_COLUNA.get(ordenar_por, (None, False))
+    sinal = -1 if decrescente else 1
+    # Processo sem valor da causa (NaN) fica no fim nas duas direções, como em ordenar_processos
+    sem_valor = -1 if decrescente else math.inf
+
+    # (critério, -data, posição, segmento, linha): posição desempata, o resto nunca é comparado
+    entradas = []
+    posicao = 0
+    for segmento, linhas in candidatos:
+        datas = segmento.coluna("data_ordinal")
+        criterio = segmento.coluna(coluna) if coluna else None
+        for linha in linhas:
+            valor = criterio[linha] if criterio else 0
+            if valor != valor:
+                valor = sem_valor
+            entradas.append((sinal * valor, -datas[linha], posicao, segmento, linha))
+            posicao += 1
+
+    if limite_recentes is None:
+        chave = lambda e: (e[0], e[2])
+    else:
+        entradas = heapq.nsmallest(limite_recentes, entradas, key=lambda e: (e[1], e[0], e[2]))
+        chave = lambda e: (e[0], e[1], e[2])
 
-    if valor_min is not None:
-        processos = [p for p in processos if p.get("valor_causa") and p["valor_causa"] >= valor_min]
+    entradas, proxima = _paginar(entradas, chave, limite, apos)
+    return (segmento.processo(linha) for _, _, _, segmento, linha in entradas), proxima
 
-    if valor_max is not None:
-        processos = [p for p in processos if p.get("valor_causa") and p["valor_causa"] <= valor_max]
 
-    return processos
+def iter_processos_cache(
+    cache: IndiceDJE,
+    tipos: List[str] = None,
+    comarcas: List[str] = None,
+    apenas_imoveis: bool = True,
+    apenas_ativos: bool = True,
+    valor_min: float = None,
+    valor_max: float = None,
+    data_inicio: str = None,
+    data_fim: str = None,
+    ordenar_por: str = "relevancia_desc",
+    limite_recentes: Optional[int] = None,
+    limite: Optional[int] = None,
+    cursor: Optional[str] = None,
+    parte: str = None,
+    advogado: str = None
+) -> Tuple[Iterator[Dict], int, Optional[str]]:
+    """
+    Filtra, ordena e (com limite_recentes) fica com os N processos mais recentes
+
+    Equivale a filtrar_processos_cache + ordenar_processos, e, com limite,
+    a ordenar por data, cortar em N e reordenar pelo critério - mas sem
+    montar dict para quem não é devolvido. Filtros e ordenações (relevância,
+    data e valor) usam as colunas gravadas na indexação; o PDF não é aberto.
+
+    Paginação: com `limite`, devolve uma página e o cursor da próxima (None
+    na última). O cursor guarda a chave de ordenação da última linha e vale
+    só para a mesma busca na mesma versão do índice (CursorExpirado depois
+    de uma reindexação).
+
+    Filtros e ordenação rodam na chamada; os dicts dos processos devolvidos
+    só são montados quando o gerador é consumido (respostas NDJSON).
+    buscar_processos_cache devolve a lista.
+
+    Returns:
+        (processos, total encontrado antes do limite, cursor da próxima página)
+    """
+    filtros = {
+        "tipos": tipos, "comarcas": comarcas, "apenas_imoveis": apenas_imoveis,
+        "apenas_ativos": apenas_ativos, "valor_min": valor_min, "valor_max": valor_max,
+        "data_inicio": data_inicio, "data_fim": data_fim, "ordenar_por": ordenar_por,
+        "limite_recentes": limite_recentes, "parte": parte, "advogado": advogado
+    }
+    apos = decodificar_cursor(cursor, cache.meta, filtros) if cursor else None
+
+    candidatos = filtrar_linhas_cache(
+        cache, tipos, comarcas, apenas_imoveis, apenas_ativos, data_inicio, data_fim, parte, advogado,
+        valor_min, valor_max
+    )
+
+    total = sum(len(linhas) for _, linhas in candidatos)
+    processos, proxima = _ordenar_linhas(candidatos, ordenar_por, limite_recentes, limite, apos)
+
+    return processos, total, codificar_cursor(cache.meta, filtros, proxima) if proxima else None
+
+
+def buscar_processos_cache(
+    cache: IndiceDJE,
+    tipos: List[str] = None,
+    comarcas: List[str] = None,
+    apenas_imoveis: bool = True,
+    apenas_ativos: bool = True,
+    valor_min: float = None,
+    valor_max: float = None,
+    data_inicio: str = None,
+    data_fim: str = None,
+    ordenar_por: str = "relevancia_desc",
+    limite_recentes: Optional[int] = None,
+    limite: Optional[int] = None,
+    cursor: Optional[str] = None,
+    parte: str = None,
+    advogado: str = None
+) -> Tuple[List[Dict], int, Optional[str]]:
+    """Wrapper de iter_processos_cache que devolve a lista de processos"""
+    processos, total, proximo_cursor = iter_processos_cache(
+        cache, tipos, comarcas, apenas_imoveis, apenas_ativos, valor_min, valor_max,
+        data_inicio, data_fim, ordenar_por, limite_recentes, limite, cursor, parte, advogado
+    )
+    return list(processos), total, proximo_cursor
 
 
 def ordenar_processos(
@@ -232,8 +929,6 @@ def ordenar_processos(
     Returns:
         Lista ordenada de processos
     """
-    from datetime import datetime
-
     if ordenar_por == "relevancia_desc":
         # Alta -> Baixa (0.8 -> 0.2)
         return sorted(processos, key=lambda p: p.get("score_relevancia", 0), reverse=True)
@@ -244,25 +939,11 @@ def ordenar_processos(
 
     elif ordenar_por == "data_desc":
         # Mais recente primeiro
-        def get_data(p):
-            data_pdf = p.get("data_pdf", "01-01-2000")
-            try:
-                return datetime.strptime(data_pdf, "%d-%m-%Y")
-            except:
-                return datetime(2000, 1, 1)
-
-        return sorted(processos, key=get_data, reverse=True)
+        return sorted(processos, key=lambda p: ordinal_data(p.get("data_pdf")), reverse=True)
 
     elif ordenar_por == "data_asc":
         # Mais antigo primeiro
-        def get_data(p):
-            data_pdf = p.get("data_pdf", "01-01-2000")
-            try:
-                return datetime.strptime(data_pdf, "%d-%m-%Y")
-            except:
-                return datetime(2000, 1, 1)
-
-        return sorted(processos, key=get_data, reverse=False)
+        return sorted(processos, key=lambda p: ordinal_data(p.get("data_pdf")), reverse=False)
 
     elif ordenar_por == "valor_desc":
         # Maior valor primeiro
@@ -287,7 +968,8 @@ def ordenar_processos(
 
 if __name__ == "__main__":
     # Executar indexação
-    cache = indexar_todos_pdfs()
+    indexar_todos_pdfs()
+    cache = ler_cache()
 
     # Teste de velocidade
     print("\n🧪 TESTANDO VELOCIDADE DE BUSCA...")
@@ -0,0 +1,801 @@
+"""
+Índice colunar do DJE em disco, aberto via mmap (substitui o dje_cache.json)
+
+O índice é um conjunto de segmentos, um por PDF, mais um manifesto que
+diz quais segmentos valem e de quais PDFs (tamanho, hash, versão do
+parser, registros) eles vieram. A reindexação só parseia PDFs novos ou
+alterados e troca os segmentos deles; os demais são reaproveitados.
+
+Em cada segmento, cada campo dos processos vira um bloco de coluna:
+    - numero:            ASCII de largura fixa (25 bytes, NNNNNNN-DD.AAAA.8.26.OOOO)
+    - strings repetidas: codificadas por dicionário (tipo, classe, comarca,
+                         codigo_comarca, relevancia, data_pdf, pdf_origem,
+                         ultima_aparicao) - código 0 = ausente
+    - números:           largura fixa (pagina_dje, offset, score, valor, flags e
+                         data_ordinal - data_pdf como date.toordinal(), chave
+                         de ordenação por data sem strptime na busca)
+    - detalhes:          partes/advogados dos registros completos (JSON por
+                         linha + offsets); vazio nos registros leves
+    - nomes:             nomes_partes/nomes_advogados dos registros leves
+                         (JSON por linha + offsets), os mesmos dos termos
+    - listas invertidas: para as colunas de COLUNAS_BITMAP, as linhas de cada
+                         código (uint32 ordenados); viram bitmaps (int) na
+                         busca e os filtros são AND/OR de bitmaps
+    - termos:            para partes e advogados (CAMPOS_TERMOS), vocabulário
+                         ordenado dos tokens dos nomes (sem acento, minúsculos)
+                         e a lista invertida de cada token; a busca por
+                         prefixo é um bisect no vocabulário
+
+Estrutura (data/dje_indice/):
+    manifesto.json          segmentos, PDFs indexados (e diretório deles), totais, data de indexação, backend/janela
+    aparicoes.g<N>.json     número -> última aparição (atualização diária, ver acrescentar_indice)
+    .escrita.lock           trava dos escritores (flock)
+    <segmento>/
+        meta.json           total do segmento, dicionários e blocos (início, tamanho, formato)
+        colunas.dat         os blocos, alinhados em 8 bytes (ordem de bytes da máquina que escreveu):
+            <coluna>            array binário da coluna
+            <coluna>.post/.pidx listas invertidas e offsets por código (uint64, códigos + 1)
+            termos_<campo>.voc  tokens ordenados, separados por \\n (UTF-8)
+            termos_<campo>.post/.pidx  listas invertidas por posição do token no vocabulário
+            detalhes/.idx       blob de detalhes e offsets (uint64, n + 1)
+            nomes/.idx          blob de nomes e offsets (uint64, n + 1)
+
+Um arquivo por segmento: cada mmap segura um descritor de arquivo, e o
+índice tem um segmento por PDF.
+
+Segmentos nunca são alterados: cada escrita grava segmentos novos (nome com
+a geração do manifesto) e troca o manifesto via arquivo temporário +
+rename. Quem já abriu o índice segue lendo os segmentos antigos: os
+substituídos só são apagados na troca seguinte, e quem leu o manifesto
+anterior ainda consegue abri-los. Um escritor por vez (trava_escrita): a
+troca apaga o que ficou fora dos dois últimos manifestos, inclusive
+segmentos ainda não publicados de outro escritor.
+
+A atualização diária (acrescentar_indice) só grava os dados do dia: um
+segmento por PDF com os processos novos (somado aos segmentos que o PDF
+já tiver) e, para processos já indexados que reapareceram, um arquivo de
+aparições com a nova ultima_aparicao - a coluna dos segmentos antigos não
+é regravada; a leitura aplica as aparições por cima dela. Passando de
+LIMITE_ARQUIVOS_APARICOES, os arquivos de aparições são fundidos num só.
+
+Os segmentos são abertos com mmap somente leitura: abrir o índice não lê os
+dados, uma busca só toca as colunas que filtra, e vários processos
+(workers do uvicorn) compartilham a mesma cópia no page cache. Só as
+linhas do resultado viram dict (IndiceDJE.processo).
+"""
+import fcntl
+import json
+import math
+import mmap
+import os
+import re
+import shutil
+import sys
+import unicodedata
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional
+
+MANIFESTO = "manifesto.json"
+TRAVA_ESCRITA = ".escrita.lock"
+
+INDICE_DIR = os.getenv("DJE_INDICE_DIR", "data/dje_indice")
+
+# Incrementar quando o formato das colunas mudar
+VERSAO_INDICE = 6
+
+LARGURA_NUMERO = 25
+
+COLUNAS_DICIONARIO = (
+    "tipo", "classe", "comarca", "codigo_comarca", "relevancia", "data_pdf", "pdf_origem", "ultima_aparicao"
+)
+
+# coluna -> (typecode do array, valor quando o campo não existe)
+COLUNAS_NUMERICAS = {
+    "pagina_dje": ("I", 0),
+    "offset": ("i", -1),
+    "score_relevancia": ("d", 0.0),
+    "valor_causa": ("d", math.nan),
+    "flags": ("B", 0),
+    "data_ordinal": ("I", 0),
+}
+
+# Processos sem data (ou com data inválida) ordenam como 01-01-2000
+ORDINAL_SEM_DATA = date(2000, 1, 1).toordinal()
+
+FLAG_IMOVEL = 1
+FLAG_ATIVO = 2
+CODIGOS_FLAGS = (FLAG_IMOVEL | FLAG_ATIVO) + 1
+
+# Colunas com lista invertida (código -> linhas) para os filtros
+COLUNAS_BITMAP = ("tipo", "comarca", "codigo_comarca", "relevancia", "data_pdf", "flags")
+
+_BYTES_NAO_NULOS = re.compile(rb'[^\x00]+')
+_BITS_DO_BYTE = [[bit for bit in range(8) if byte >> bit & 1] for byte in range(256)]
+
+CAMPOS_DETALHES = ("partes", "advogados")
+
+# Campos com índice de termos (tokens dos nomes -> linhas)
+CAMPOS_TERMOS = ("partes", "advogados")
+
+# Tokens que não entram no índice de termos nem na busca
+PALAVRAS_IGNORADAS = frozenset({"a", "e", "o", "da", "das", "de", "do", "dos", "di", "du"})
+
+# Prefixo mínimo de um termo de busca (prefixos de 1 letra casam com metade do vocabulário)
+TAMANHO_MINIMO_TERMO = 2
+
+_PADRAO_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Registros completos: "Requerente: Nome" e "Nome (OAB: 123/SP)" -> só o nome
+_PADRAO_ROTULO_PARTE = re.compile(r"^[^:]{1,40}:\s*")
+_PADRAO_OAB = re.compile(r"\s*\([^)]*\)\s*$")
+
+# Arquivos de aparições (um por atualização diária) antes de fundir num só
+LIMITE_ARQUIVOS_APARICOES = 30
+
+
+@lru_cache(maxsize=4096)
+def ordinal_data(data_pdf: Optional[str]) -> int:
+    """DD-MM-YYYY -> date.toordinal() (ORDINAL_SEM_DATA se ausente ou inválida)"""
+    try:
+        return datetime.strptime(data_pdf, "%d-%m-%Y").toordinal()
+    except (TypeError, ValueError):
+        return ORDINAL_SEM_DATA
+
+
+def tokens(texto: Optional[str]) -> List[str]:
+    """Tokens de um nome ou termo de busca: sem acento, minúsculos, sem PALAVRAS_IGNORADAS"""
+    if not texto:
+        return []
+    sem_acento = unicodedata.normalize("NFKD", texto.lower()).encode("ascii", "ignore").decode("ascii")
+    return [token for token in _PADRAO_TOKEN.findall(sem_acento) if token not in PALAVRAS_IGNORADAS]
+
+
+def nomes_processo(processo: Dict, campo: str) -> List[str]:
+    """
+    Nomes de partes ou advogados de um registro
+
+    Registros leves (e as linhas leves do índice) trazem nomes_<campo>; nos completos,
+    o nome sai de "Rótulo: Nome" (partes) e "Nome (OAB...)" (advogados).
+    """
+    nomes = processo.get(f"nomes_{campo}")
+    if nomes is not None:
+        return nomes
+    padrao = _PADRAO_ROTULO_PARTE if campo == "partes" else _PADRAO_OAB
+    return [padrao.sub("", valor) for valor in processo.get(campo) or []]
+
+
+def _blocos_termos(processos: List[Dict], campo: str) -> Dict[str, object]:
+    """Vocabulário e listas invertidas dos tokens do campo (linhas em ordem, sem repetição)"""
+    linhas_por_token: Dict[str, array] = {}
+    for linha, processo in enumerate(processos):
+        vistos = set()
+        for nome in nomes_processo(processo, campo):
+            vistos.update(tokens(nome))
+        for token in vistos:
+            linhas_por_token.setdefault(token, array("I")).append(linha)
+
+    vocabulario = sorted(linhas_por_token)
+    offsets = array("Q", [0])
+    for token in vocabulario:
+        offsets.append(offsets[-1] + len(linhas_por_token[token]))
+    return {
+        f"termos_{campo}.voc": "\n".join(vocabulario).encode("utf-8"),
+        f"termos_{campo}.post": array("I", (linha for token in vocabulario for linha in linhas_por_token[token])),
+        f"termos_{campo}.pidx": offsets
+    }
+
+
+def _formato_codigos(tamanho: int) -> str:
+    """Menor typecode sem sinal que comporta os códigos do dicionário (0 = ausente)"""
+    if tamanho < 2 ** 8:
+        return "B"
+    if tamanho < 2 ** 16:
+        return "H"
+    return "I"
+
+
+def _abrir_mmap(caminho: str):
+    """mmap somente leitura (arquivo vazio não pode ser mapeado: devolve bytes vazios)"""
+    with open(caminho, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def escrever_segmento(processos: Iterable[Dict], meta: Optional[Dict], diretorio: str) -> Dict:
+    """
+    Grava os processos como um segmento colunar e devolve o meta.json gravado
+
+    Escreve num diretório temporário ao lado e renomeia no fim: o segmento
+    nunca aparece pela metade.
+    """
+    processos = list(processos)
+    total = len(processos)
+
+    dicionarios = {}
+    codigos = {}
+    for coluna in COLUNAS_DICIONARIO:
+        valores = sorted({p[coluna] for p in processos if p.get(coluna) is not None})
+        dicionarios[coluna] = valores
+        mapa = {valor: codigo for codigo, valor in enumerate(valores, 1)}
+        formato = _formato_codigos(len(valores) + 1)
+        codigos[coluna] = array(formato, (mapa.get(p.get(coluna), 0) for p in processos))
+
+    numericas = {}
+    for coluna, (formato, padrao) in COLUNAS_NUMERICAS.items():
+        if coluna == "flags":
+            valores = (
+                (FLAG_IMOVEL if p.get("tem_imovel") else 0) | (FLAG_ATIVO if p.get("esta_ativo") else 0)
+                for p in processos
+            )
+        elif coluna == "data_ordinal":
+            ordinais = {valor: ordinal_data(valor) for valor in dicionarios["data_pdf"]}
+            valores = (ordinais.get(p.get("data_pdf"), ORDINAL_SEM_DATA) for p in processos)
+        else:
+            valores = (padrao if p.get(coluna) is None else p[coluna] for p in processos)
+        numericas[coluna] = array(formato, valores)
+
+    blocos = {"numero": "".join(p["numero"] for p in processos).encode('ascii')}
+    blocos.update(codigos)
+    blocos.update(numericas)
+
+    # Listas invertidas: linhas (já em ordem) de cada código
+    for coluna in COLUNAS_BITMAP:
+        dados = codigos[coluna] if coluna in codigos else numericas[coluna]
+        quantidade = len(dicionarios[coluna]) + 1 if coluna in dicionarios else CODIGOS_FLAGS
+        listas = [array("I") for _ in range(quantidade)]
+        for linha, codigo in enumerate(dados):
+            listas[codigo].append(linha)
+        offsets = array("Q", [0])
+        for lista in listas:
+            offsets.append(offsets[-1] + len(lista))
+        blocos[f"{coluna}.post"] = array("I", (linha for lista in listas for linha in lista))
+        blocos[f"{coluna}.pidx"] = offsets
+
+    for campo in CAMPOS_TERMOS:
+        blocos.update(_blocos_termos(processos, campo))
+
+    # Detalhes: só registros completos (os leves são extraídos sob demanda)
+    detalhes = bytearray()
+    offsets = array("Q", [0])
+    for p in processos:
+        if "partes" in p:
+            detalhes += json.dumps({c: p.get(c) for c in CAMPOS_DETALHES}, ensure_ascii=False).encode('utf-8')
+        offsets.append(len(detalhes))
+    blocos["detalhes"] = bytes(detalhes)
+    blocos["detalhes.idx"] = offsets
+
+    # Nomes dos registros leves (os mesmos do índice de termos): a linha já
+    # diz quem são as partes sem reabrir o PDF
+    nomes = bytearray()
+    offsets = array("Q", [0])
+    for p in processos:
+        if "partes" not in p and (p.get("nomes_partes") or p.get("nomes_advogados")):
+            nomes += json.dumps(
+                {f"nomes_{campo}": nomes_processo(p, campo) for campo in CAMPOS_TERMOS}, ensure_ascii=False
+            ).encode('utf-8')
+        offsets.append(len(nomes))
+    blocos["nomes"] = bytes(nomes)
+    blocos["nomes.idx"] = offsets
+
+    temp = f"{diretorio}.{os.getpid()}.tmp"
+    shutil.rmtree(temp, ignore_errors=True)
+    os.makedirs(temp)
+
+    posicoes = {}
+    with open(os.path.join(temp, "colunas.dat"), 'wb') as f:
+        for nome, dados in blocos.items():
+            f.write(b"\0" * (-f.tell() % 8))
+            inicio = f.tell()
+            if isinstance(dados, array):
+                dados.tofile(f)
+                formato = dados.typecode
+            else:
+                f.write(dados)
+                formato = "B"
+            posicoes[nome] = [inicio, f.tell() - inicio, formato]
+
+    meta = {
+        **(meta or {}),
+        "versao": VERSAO_INDICE,
+        "ordem_bytes": sys.byteorder,
+        "total_processos": total,
+        "dicionarios": dicionarios,
+        "blocos": posicoes
+    }
+    meta.setdefault("data_indexacao", datetime.now().isoformat())
+
+    with open(os.path.join(temp, "meta.json"), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    antigo = f"{diretorio}.{os.getpid()}.antigo"
+    if os.path.exists(diretorio):
+        os.replace(diretorio, antigo)
+    os.replace(temp, diretorio)
+    shutil.rmtree(antigo, ignore_errors=True)
+
+    return meta
+
+
+class SegmentoDJE:
+    """
+    Segmento aberto: colunas como memoryview sobre mmap
+
+    len(segmento) é o número de linhas; segmento.coluna(nome) devolve a
+    coluna (códigos para as colunas de dicionário), segmento.bitmap(coluna,
+    códigos) as linhas com esses códigos como bitmap (bit i = linha i) e
+    segmento.processo(i) monta o dict da linha i no formato dos registros
+    do parser.
+    """
+
+    def __init__(self, diretorio: str):
+        with open(os.path.join(diretorio, "meta.json"), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        if self.meta.get("versao") != VERSAO_INDICE or self.meta.get("ordem_bytes") != sys.byteorder:
+            raise ValueError(f"Segmento em {diretorio} é de outra versão/arquitetura: reindexe")
+
+        self.diretorio = diretorio
+        self.total = self.meta["total_processos"]
+        self.dicionarios = {coluna: [None] + valores for coluna, valores in self.meta["dicionarios"].items()}
+
+        self._mapa = _abrir_mmap(os.path.join(diretorio, "colunas.dat"))
+        self._visoes = {}
+        for nome, (inicio, tamanho, formato) in self.meta["blocos"].items():
+            self._visoes[nome] = memoryview(self._mapa)[inicio:inicio + tamanho].cast(formato)
+        self._colunas = {nome: visao for nome, visao in self._visoes.items() if "." not in nome}
+        self._numeros = self._colunas.pop("numero")
+        self._detalhes = self._colunas.pop("detalhes")
+        self._offsets_detalhes = self._visoes["detalhes.idx"]
+        self._nomes = self._colunas.pop("nomes")
+        self._offsets_nomes = self._visoes["nomes.idx"]
+
+        # (coluna, código) -> bitmap; o segmento não muda, então vale enquanto estiver aberto
+        self._bitmaps: Dict[tuple, int] = {}
+
+        # número -> última aparição posterior à gravação do segmento (IndiceDJE preenche)
+        self.aparicoes: Dict[str, str] = {}
+
+        # campo -> tokens ordenados (decodificados na primeira busca por termo)
+        self._vocabularios: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return self.total
+
+    def coluna(self, nome: str) -> memoryview:
+        return self._colunas[nome]
+
+    def todas(self) -> int:
+        """Bitmap com todas as linhas"""
+        return (1 << self.total) - 1
+
+    def _bitmap_codigo(self, coluna: str, codigo: int) -> int:
+        chave = (coluna, codigo)
+        bitmap = self._bitmaps.get(chave)
+        if bitmap is None:
+            offsets = self._visoes[f"{coluna}.pidx"]
+            bits = bytearray((self.total + 7) // 8)
+            for linha in self._visoes[f"{coluna}.post"][offsets[codigo]:offsets[codigo + 1]]:
+                bits[linha >> 3] |= 1 << (linha & 7)
+            bitmap = self._bitmaps[chave] = int.from_bytes(bits, 'little')
+        return bitmap
+
+    def bitmap(self, coluna: str, codigos: Iterable[int]) -> int:
+        """Linhas cuja coluna (de COLUNAS_BITMAP) tem algum dos códigos (OR das listas invertidas)"""
+        bitmap = 0
+        for codigo in codigos:
+            bitmap |= self._bitmap_codigo(coluna, codigo)
+        return bitmap
+
+    def vocabulario(self, campo: str) -> List[str]:
+        vocabulario = self._vocabularios.get(campo)
+        if vocabulario is None:
+            texto = bytes(self._visoes[f"termos_{campo}.voc"]).decode("utf-8")
+            vocabulario = self._vocabularios[campo] = texto.split("\n") if texto else []
+        return vocabulario
+
+    def bitmap_prefixo(self, campo: str, prefixo: str) -> int:
+        """Linhas com algum token do campo (de CAMPOS_TERMOS) que começa com o prefixo já normalizado"""
+        vocabulario = self.vocabulario(campo)
+        bitmap = 0
+        posicao = bisect_left(vocabulario, prefixo)
+        while posicao < len(vocabulario) and vocabulario[posicao].startswith(prefixo):
+            bitmap |= self._bitmap_codigo(f"termos_{campo}", posicao)
+            posicao += 1
+        return bitmap
+
+    def linhas(self, bitmap: int) -> List[int]:
+        """Linhas (em ordem) com bit ligado no bitmap: só os bytes não nulos são percorridos"""
+        dados = bitmap.to_bytes((self.total + 7) // 8, 'little')
+        linhas = []
+        for trecho in _BYTES_NAO_NULOS.finditer(dados):
+            for posicao in range(trecho.start(), trecho.end()):
+                base = posicao << 3
+                linhas.extend(base + bit for bit in _BITS_DO_BYTE[dados[posicao]])
+        return linhas
+
+    def codigos(self, coluna: str, aceitar) -> set:
+        """Códigos do dicionário da coluna cujo valor satisfaz aceitar(valor) (avaliado uma vez por valor)"""
+        return {codigo for codigo, valor in enumerate(self.dicionarios[coluna]) if valor is not None and aceitar(valor)}
+
+    def numero(self, linha: int) -> str:
+        inicio = linha * LARGURA_NUMERO
+        return bytes(self._numeros[inicio:inicio + LARGURA_NUMERO]).decode('ascii')
+
+    def numeros(self) -> Iterator[str]:
+        for linha in range(self.total):
+            yield self.numero(linha)
+
+    def localizar(self, procurados: set) -> Dict[str, int]:
+        """número -> linha dos números procurados presentes no segmento (sem montar dicts)"""
+        bloco = bytes(self._numeros).decode('ascii')
+        return {
+            bloco[inicio:inicio + LARGURA_NUMERO]: inicio // LARGURA_NUMERO
+            for inicio in range(0, len(bloco), LARGURA_NUMERO)
+            if bloco[inicio:inicio + LARGURA_NUMERO] in procurados
+        }
+
+    def contagem(self, coluna: str) -> Dict[Optional[str], int]:
+        """Linhas por valor de uma coluna de COLUNAS_BITMAP (tamanho das listas invertidas)"""
+        offsets = self._visoes[f"{coluna}.pidx"]
+        return {
+            valor: offsets[codigo + 1] - offsets[codigo]
+            for codigo, valor in enumerate(self.dicionarios[coluna])
+            if offsets[codigo + 1] > offsets[codigo]
+        }
+
+    def valor(self, coluna: str, linha: int):
+        """Valor decodificado (string do dicionário ou número) da linha"""
+        bruto = self._colunas[coluna][linha]
+        if coluna in self.dicionarios:
+            return self.dicionarios[coluna][bruto]
+        return bruto
+
+    def processo(self, linha: int) -> Dict:
+        """Dict da linha no formato dos registros do parser (sem os campos ausentes)"""
+        flags = self._colunas["flags"][linha]
+        processo = {
+            "numero": self.numero(linha),
+            "tipo": self.valor("tipo", linha),
+            "classe": self.valor("classe", linha),
+            "comarca": self.valor("comarca", linha),
+            "codigo_comarca": self.valor("codigo_comarca", linha),
+            "pagina_dje": self._colunas["pagina_dje"][linha],
+            "tem_imovel": bool(flags & FLAG_IMOVEL),
+            "esta_ativo": bool(flags & FLAG_ATIVO),
+            "relevancia": self.valor("relevancia", linha),
+            "score_relevancia": self._colunas["score_relevancia"][linha],
+        }
+
+        offset = self._colunas["offset"][linha]
+        if offset >= 0:
+            processo["offset"] = offset
+
+        valor_causa = self._colunas["valor_causa"][linha]
+        if not math.isnan(valor_causa):
+            processo["valor_causa"] = valor_causa
+
+        inicio, fim = self._offsets_detalhes[linha], self._offsets_detalhes[linha + 1]
+        if fim > inicio:
+            processo.update(json.loads(bytes(self._detalhes[inicio:fim]).decode('utf-8')))
+            processo.setdefault("valor_causa", None)
+
+        inicio, fim = self._offsets_nomes[linha], self._offsets_nomes[linha + 1]
+        if fim > inicio:
+            processo.update(json.loads(bytes(self._nomes[inicio:fim]).decode('utf-8')))
+
+        for coluna in ("pdf_origem", "data_pdf", "ultima_aparicao"):
+            valor = self.valor(coluna, linha)
+            if valor is not None:
+                processo[coluna] = valor
+
+        if self.aparicoes:
+            ultima = self.aparicoes.get(processo["numero"])
+            if ultima and ordinal_data(ultima) > ordinal_data(processo.get("ultima_aparicao")):
+                processo["ultima_aparicao"] = ultima
+
+        return processo
+
+    def processos(self, linhas: Optional[Iterable[int]] = None) -> List[Dict]:
+        """Dicts das linhas informadas (None = todas)"""
+        return [self.processo(linha) for linha in (range(self.total) if linhas is None else linhas)]
+
+    def fechar(self) -> None:
+        """Solta o mmap (as memoryviews precisam ser liberadas antes)"""
+        for visao in self._visoes.values():
+            visao.release()
+        self._visoes.clear()
+        self._colunas.clear()
+        self._bitmaps.clear()
+        self._vocabularios.clear()
+        if isinstance(self._mapa, mmap.mmap):
+            self._mapa.close()
+
+
+class IndiceDJE:
+    """
+    Índice aberto: os segmentos listados no manifesto
+
+    indice.meta é o manifesto (totais, PDFs indexados, backend/janela);
+    as buscas percorrem indice.segmentos. len(indice) soma as linhas.
+    """
+
+    def __init__(self, diretorio: str = INDICE_DIR):
+        manifesto = ler_manifesto(diretorio)
+        if manifesto is None:
+            raise FileNotFoundError(
+                f"Índice não encontrado em {diretorio}. "
+                f"Execute indexar_todos_pdfs() primeiro."
+            )
+        if manifesto.get("versao") != VERSAO_INDICE:
+            raise ValueError(f"Índice em {diretorio} é de outra versão: reindexe")
+
+        self.diretorio = diretorio
+        self.meta = manifesto
+        self.segmentos = [SegmentoDJE(os.path.join(diretorio, s["nome"])) for s in manifesto["segmentos"]]
+        self.total = sum(len(segmento) for segmento in self.segmentos)
+
+        self.aparicoes = ler_aparicoes(manifesto.get("aparicoes", []), diretorio)
+        for segmento in self.segmentos:
+            segmento.aparicoes = self.aparicoes
+
+    def __len__(self) -> int:
+        return self.total
+
+    def numeros(self) -> Iterator[str]:
+        for segmento in self.segmentos:
+            yield from segmento.numeros()
+
+    def localizar(self, numeros: Iterable[str]) -> Dict[str, tuple]:
+        """número -> (segmento, linha) dos números que já estão no índice"""
+        procurados = set(numeros)
+        localizados = {}
+        for segmento in self.segmentos:
+            if not procurados:
+                break
+            for numero, linha in segmento.localizar(procurados).items():
+                localizados[numero] = (segmento, linha)
+                procurados.discard(numero)
+        return localizados
+
+    def contagem(self, coluna: str) -> Dict[Optional[str], int]:
+        """Processos por valor de uma coluna de COLUNAS_BITMAP, somando os segmentos"""
+        total: Dict[Optional[str], int] = {}
+        for segmento in self.segmentos:
+            for valor, quantidade in segmento.contagem(coluna).items():
+                total[valor] = total.get(valor, 0) + quantidade
+        return total
+
+    def processos(self) -> List[Dict]:
+        """Dicts de todas as linhas, segmento a segmento"""
+        return [p for segmento in self.segmentos for p in segmento.processos()]
+
+    def fechar(self) -> None:
+        for segmento in self.segmentos:
+            segmento.fechar()
+
+
+def abrir_indice(diretorio: str = INDICE_DIR) -> IndiceDJE:
+    return IndiceDJE(diretorio)
+
+
+def ler_manifesto(diretorio: str = INDICE_DIR) -> Optional[Dict]:
+    """Manifesto do índice (None se o índice ainda não existe)"""
+    try:
+        with open(os.path.join(diretorio, MANIFESTO), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def ler_aparicoes(arquivos: Iterable[str], diretorio: str = INDICE_DIR) -> Dict[str, str]:
+    """número -> última aparição, juntando os arquivos de aparições (fica a data mais recente)"""
+    aparicoes: Dict[str, str] = {}
+    for arquivo in arquivos:
+        with open(os.path.join(diretorio, arquivo), 'r', encoding='utf-8') as f:
+            for numero, data in json.load(f).items():
+                if ordinal_data(data) > ordinal_data(aparicoes.get(numero)):
+                    aparicoes[numero] = data
+    return aparicoes
+
+
+def _gravar_json(objeto, caminho: str) -> None:
+    temp = f"{caminho}.{os.getpid()}.tmp"
+    with open(temp, 'w', encoding='utf-8') as f:
+        json.dump(objeto, f, ensure_ascii=False)
+    os.replace(temp, caminho)
+
+
+def nome_segmento(pdf: str, geracao: int) -> str:
+    return f"{os.path.splitext(pdf)[0] or 'sem_pdf'}.g{geracao}"
+
+
+@contextmanager
+def trava_escrita(diretorio: str = INDICE_DIR) -> Iterator[None]:
+    """
+    Um escritor por vez no índice (flock: vale entre processos e threads)
+
+    Da leitura da geração até a troca do manifesto: dois escritores ao
+    mesmo tempo usariam a mesma geração, e a limpeza de um apagaria os
+    segmentos que o outro gravou e ainda não publicou. Não é reentrante.
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    with open(os.path.join(diretorio, TRAVA_ESCRITA), 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _conferir_versao(anterior: Dict, diretorio: str) -> None:
+    if anterior and anterior.get("versao") != VERSAO_INDICE:
+        raise ValueError(
+            f"Índice em {diretorio} é da versão {anterior.get('versao')} (atual: {VERSAO_INDICE}): "
+            f"os segmentos dele não podem ser mantidos, reindexe"
+        )
+
+
+def proxima_geracao(diretorio: str = INDICE_DIR) -> int:
+    """Geração da próxima escrita (nomeia os segmentos novos)"""
+    return (ler_manifesto(diretorio) or {}).get("geracao", 0) + 1
+
+
+def trocar_manifesto(
+    novos: List[Dict],
+    meta: Optional[Dict] = None,
+    diretorio: str = INDICE_DIR,
+    manter: Optional[Iterable[str]] = None,
+    geracao: Optional[int] = None,
+    acrescentar: bool = False
+) -> Dict:
+    """
+    Publica segmentos já gravados ({"nome", "pdf", "total"}) num manifesto novo
+
+    Segmentos de PDFs fora de `novos` continuam no índice (todos, com
+    manter=None, ou só os dos PDFs em `manter`); os dos PDFs em `novos`
+    são substituídos, ou mantidos ao lado dos novos com acrescentar=True.
+    Campos de `meta` (ex.: "pdfs", a tabela de PDFs indexados, e
+    "aparicoes", os arquivos de aparições) sobrescrevem os do manifesto
+    anterior; total_processos, segmentos e geração são recalculados.
+    Devolve o manifesto gravado. Segmentos substituídos só são apagados na
+    gravação seguinte (ficam uma geração no disco).
+
+    Chamar com trava_escrita, da gravação dos segmentos até aqui. Manter
+    segmentos de um manifesto de outra VERSAO_INDICE levanta ValueError.
+    """
+    anterior = ler_manifesto(diretorio) or {}
+    geracao = geracao or anterior.get("geracao", 0) + 1
+    manter = None if manter is None else set(manter)
+    pdfs_novos = set() if acrescentar else {s["pdf"] for s in novos}
+    os.makedirs(diretorio, exist_ok=True)
+
+    mantidos = [
+        s for s in anterior.get("segmentos", [])
+        if s["pdf"] not in pdfs_novos and (manter is None or s["pdf"] in manter)
+    ]
+    if mantidos:
+        _conferir_versao(anterior, diretorio)
+    segmentos = mantidos + list(novos)
+
+    # Mais recentes primeiro (mesma ordem dos PDFs na indexação)
+    segmentos.sort(key=lambda s: s["pdf"], reverse=True)
+
+    manifesto = {
+        **{k: v for k, v in anterior.items() if k != "segmentos"},
+        **(meta or {}),
+        "versao": VERSAO_INDICE,
+        "geracao": geracao,
+        "total_processos": sum(s["total"] for s in segmentos),
+        "segmentos": segmentos
+    }
+    manifesto.setdefault("data_indexacao", datetime.now().isoformat())
+
+    _gravar_json(manifesto, os.path.join(diretorio, MANIFESTO))
+
+    # Segmentos e aparições fora do manifesto novo E do anterior: os do
+    # anterior ficam uma geração a mais, para leitores que ainda não
+    # reabriram (ou leram o manifesto anterior e vão abrir os segmentos dele)
+    validos = (
+        {s["nome"] for s in segmentos} | set(manifesto.get("aparicoes", []))
+        | {s["nome"] for s in anterior.get("segmentos", [])} | set(anterior.get("aparicoes", []))
+    )
+    for entrada in os.scandir(diretorio):
+        if entrada.name in validos:
+            continue
+        if entrada.is_dir():
+            shutil.rmtree(entrada.path, ignore_errors=True)
+        elif entrada.name.startswith("aparicoes.") and entrada.name.endswith(".json"):
+            os.remove(entrada.path)
+
+    return manifesto
+
+
+def _gravar_segmentos_geracao(novos: Dict[str, List[Dict]], diretorio: str, geracao: int) -> List[Dict]:
+    segmentos = []
+    for pdf, processos in novos.items():
+        nome = nome_segmento(pdf, geracao)
+        escrever_segmento(processos, {"pdf": pdf}, os.path.join(diretorio, nome))
+        segmentos.append({"nome": nome, "pdf": pdf, "total": len(processos)})
+    return segmentos
+
+
+def gravar_segmentos(
+    novos: Dict[str, List[Dict]],
+    meta: Optional[Dict] = None,
+    diretorio: str = INDICE_DIR,
+    manter: Optional[Iterable[str]] = None
+) -> Dict:
+    """Grava um segmento por PDF de `novos` (pdf -> processos) e troca o manifesto (ver trocar_manifesto)"""
+    with trava_escrita(diretorio):
+        geracao = proxima_geracao(diretorio)
+        segmentos = _gravar_segmentos_geracao(novos, diretorio, geracao)
+        return trocar_manifesto(segmentos, meta, diretorio, manter, geracao)
+
+
+def acrescentar_indice(
+    novos: Dict[str, List[Dict]],
+    aparicoes: Optional[Dict[str, str]] = None,
+    meta: Optional[Dict] = None,
+    diretorio: str = INDICE_DIR
+) -> Dict:
+    """
+    Atualização incremental: só os dados novos são gravados
+
+    Os processos novos (pdf -> processos, ainda fora do índice) viram um
+    segmento por PDF, somado aos segmentos que o PDF já tiver. `aparicoes`
+    (número -> última aparição de processos já indexados) vira um arquivo
+    de aparições novo; acima de LIMITE_ARQUIVOS_APARICOES arquivos, todos
+    são fundidos num só. Segmentos existentes não são lidos nem regravados.
+
+    Raises:
+        ValueError: o índice existente é de outra VERSAO_INDICE (os dados
+            novos não podem ser somados a ele: reindexe antes)
+    """
+    with trava_escrita(diretorio):
+        anterior = ler_manifesto(diretorio) or {}
+        _conferir_versao(anterior, diretorio)
+        geracao = anterior.get("geracao", 0) + 1
+
+        segmentos = _gravar_segmentos_geracao({pdf: p for pdf, p in novos.items() if p}, diretorio, geracao)
+
+        arquivos = list(anterior.get("aparicoes", []))
+        if aparicoes:
+            if len(arquivos) + 1 > LIMITE_ARQUIVOS_APARICOES:
+                aparicoes = {**ler_aparicoes(arquivos, diretorio), **aparicoes}
+                arquivos = []
+            arquivo = f"aparicoes.g{geracao}.json"
+            _gravar_json(aparicoes, os.path.join(diretorio, arquivo))
+            arquivos.append(arquivo)
+
+        return trocar_manifesto(
+            segmentos, {**(meta or {}), "aparicoes": arquivos}, diretorio, geracao=geracao, acrescentar=True
+        )
+
+
+def escrever_indice(processos: Iterable[Dict], meta: Optional[Dict] = None, diretorio: str = INDICE_DIR) -> Dict:
+    """
+    Regrava o índice inteiro: os processos são separados por pdf_origem
+    (um segmento por PDF) e substituem todos os segmentos anteriores
+
+    A tabela de PDFs indexados do manifesto anterior só é mantida se vier
+    em meta["pdfs"] (quem regrava sabe se os registros deles continuam).
+    As aparições também são descartadas: ultima_aparicao vem nos processos.
+    """
+    por_pdf: Dict[str, List[Dict]] = {}
+    for p in processos:
+        por_pdf.setdefault(p.get("pdf_origem") or "", []).append(p)
+    return gravar_segmentos(por_pdf, {"pdfs": {}, "aparicoes": [], **(meta or {})}, diretorio, manter=())
+
+
+def converter_cache_json(cache_path: str = "data/dje_cache.json", diretorio: str = INDICE_DIR) -> Dict:
+    """Migra um dje_cache.json antigo para o índice colunar (sem tabela de PDFs: a próxima indexação reparseia)"""
+    with open(cache_path, 'r', encoding='utf-8') as f:
+        cache = json.load(f)
+    processos = cache.pop("processos", [])
+    cache.pop("total_processos", None)
+    print(f"🔄 Convertendo {cache_path} ({len(processos)} processos) para {diretorio}")
+    return escrever_indice(processos, cache, diretorio)
@@ -0,0 +1,208 @@
+"""
+Números CNJ já conhecidos (índice do DJE + tabela processos)
+
+O parser consulta este conjunto logo depois da regex do número: número
+conhecido só registra uma nova aparição (número + página) e pula a
+extração de classe, partes, advogados, valor e relevância.
+
+Até LIMITE_CONJUNTO_EXATO números o conjunto é exato (set); acima disso
+vira um filtro de Bloom com TAXA_FALSO_POSITIVO. O Bloom nunca dá falso
+negativo, mas pode dar falso positivo: quem usa (scripts/daily_update.py)
+confere as aparições contra a fonte exata e reextrai as que não existirem
+(reextrair_aparicoes em src/scrapers/dje_parser.py).
+
+Arquivo (data/dje_numeros_conhecidos.bin):
+    b"DJEX" + números separados por \\n                      conjunto exato
+    b"DJEB" + <bits, hashes, quantidade> (uint64) + bits    filtro de Bloom
+"""
+import hashlib
+import math
+import os
+import struct
+from typing import Iterable, List, Optional, Union
+from src.utils.indice_dje import INDICE_DIR, abrir_indice
+
+CAMINHO_NUMEROS_CONHECIDOS = os.getenv("DJE_NUMEROS_CONHECIDOS", "data/dje_numeros_conhecidos.bin")
+
+LIMITE_CONJUNTO_EXATO = 200_000
+TAXA_FALSO_POSITIVO = 0.001
+
+_MAGICO_EXATO = b"DJEX"
+_MAGICO_BLOOM = b"DJEB"
+_CABECALHO_BLOOM = struct.Struct("<QQQ")
+
+
+class FiltroBloom:
+    """
+    Filtro de Bloom com hashing duplo sobre blake2b (h1 + i*h2)
+
+    `numero in filtro` é False com certeza para números nunca adicionados e
+    True com probabilidade ~taxa_falso_positivo para os demais.
+    """
+
+    exato = False
+
+    def __init__(self, capacidade: int, taxa_falso_positivo: float = TAXA_FALSO_POSITIVO):
+        capacidade = max(1, capacidade)
+        self.bits = max(8, math.ceil(-capacidade * math.log(taxa_falso_positivo) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacidade * math.log(2)))
+        self.quantidade = 0
+        self._dados = bytearray((self.bits + 7) // 8)
+
+    def _posicoes(self, numero: str):
+        digest = hashlib.blake2b(numero.encode('ascii'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def add(self, numero: str) -> None:
+        for posicao in self._posicoes(numero):
+            self._dados[posicao >> 3] |= 1 << (posicao & 7)
+        self.quantidade += 1
+
+    def __contains__(self, numero: str) -> bool:
+        dados = self._dados
+        return all(dados[posicao >> 3] & (1 << (posicao & 7)) for posicao in self._posicoes(numero))
+
+    def __len__(self) -> int:
+        return self.quantidade
+
+    def capacidade(self) -> int:
+        """Números que cabem mantendo a taxa de falso positivo para a qual foi dimensionado"""
+        return int(-self.bits * math.log(2) ** 2 / math.log(TAXA_FALSO_POSITIVO))
+
+    def serializar(self) -> bytes:
+        return _MAGICO_BLOOM + _CABECALHO_BLOOM.pack(self.bits, self.hashes, self.quantidade) + bytes(self._dados)
+
+    @classmethod
+    def desserializar(cls, dados: bytes) -> "FiltroBloom":
+        bits, hashes, quantidade = _CABECALHO_BLOOM.unpack_from(dados, len(_MAGICO_BLOOM))
+        filtro = cls.__new__(cls)
+        filtro.bits, filtro.hashes, filtro.quantidade = bits, hashes, quantidade
+        filtro._dados = bytearray(dados[len(_MAGICO_BLOOM) + _CABECALHO_BLOOM.size:])
+        return filtro
+
+
+class ConjuntoExato(set):
+    """Conjunto exato (corpora pequenos): mesma interface do FiltroBloom"""
+
+    exato = True
+
+    def serializar(self) -> bytes:
+        return _MAGICO_EXATO + "\n".join(sorted(self)).encode('ascii')
+
+    @classmethod
+    def desserializar(cls, dados: bytes) -> "ConjuntoExato":
+        corpo = dados[len(_MAGICO_EXATO):].decode('ascii')
+        return cls(corpo.split("\n") if corpo else [])
+
+
+NumerosConhecidos = Union[FiltroBloom, ConjuntoExato]
+
+
+def criar_numeros_conhecidos(numeros: Iterable[str], limite_exato: int = LIMITE_CONJUNTO_EXATO) -> NumerosConhecidos:
+    """Conjunto exato se couber no limite, senão filtro de Bloom dimensionado para os números"""
+    unicos = set(numeros)
+    if len(unicos) <= limite_exato:
+        return ConjuntoExato(unicos)
+
+    # Folga de 50% para os números que os próximos dias vão acrescentar
+    filtro = FiltroBloom(capacidade=int(len(unicos) * 1.5))
+    for numero in unicos:
+        filtro.add(numero)
+    return filtro
+
+
+def carregar_numeros_conhecidos(caminho: str = CAMINHO_NUMEROS_CONHECIDOS) -> Optional[NumerosConhecidos]:
+    """Conjunto salvo ou None se ainda não existir"""
+    try:
+        with open(caminho, 'rb') as f:
+            dados = f.read()
+    except OSError:
+        return None
+
+    if dados.startswith(_MAGICO_BLOOM):
+        return FiltroBloom.desserializar(dados)
+    if dados.startswith(_MAGICO_EXATO):
+        return ConjuntoExato.desserializar(dados)
+    return None
+
+
+def salvar_numeros_conhecidos(conhecidos: NumerosConhecidos, caminho: str = CAMINHO_NUMEROS_CONHECIDOS) -> None:
+    """Grava via arquivo temporário + rename (leitores nunca veem arquivo pela metade)"""
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    temp = f"{caminho}.{os.getpid()}.tmp"
+    with open(temp, 'wb') as f:
+        f.write(conhecidos.serializar())
+    os.replace(temp, caminho)
+
+
+def numeros_do_banco() -> List[str]:
+    """numero_processo da tabela processos (lista vazia se o banco não estiver acessível)"""
+    try:
+        from src.database import SessionLocal
+        from src.models.processo import Processo
+
+        db = SessionLocal()
+        try:
+            return [numero for (numero,) in db.query(Processo.numero_processo).all()]
+        finally:
+            db.close()
+    except Exception as e:
+        print(f"⚠️  Banco indisponível para números conhecidos: {e}")
+        return []
+
+
+def reconstruir_numeros_conhecidos(
+    indice_dir: Optional[str] = None,
+    caminho: str = CAMINHO_NUMEROS_CONHECIDOS,
+    incluir_banco: bool = True
+) -> NumerosConhecidos:
+    """Refaz o conjunto a partir do índice do DJE (e da tabela processos) e salva"""
+    numeros = []
+    try:
+        indice = abrir_indice(indice_dir or INDICE_DIR)
+        numeros.extend(indice.numeros())
+        indice.fechar()
+    except FileNotFoundError:
+        pass
+
+    if incluir_banco:
+        numeros.extend(numeros_do_banco())
+
+    conhecidos = criar_numeros_conhecidos(numeros)
+    salvar_numeros_conhecidos(conhecidos, caminho)
+
+    tipo = "conjunto exato" if conhecidos.exato else f"filtro de Bloom ({conhecidos.bits // 8 / 1024:.0f} KB)"
+    print(f"🔢 {len(conhecidos)} números conhecidos salvos em {caminho} ({tipo})")
+    return conhecidos
+
+
+def acrescentar_numeros_conhecidos(
+    numeros: Iterable[str],
+    indice_dir: Optional[str] = None,
+    caminho: str = CAMINHO_NUMEROS_CONHECIDOS
+) -> NumerosConhecidos:
+    """
+    Soma números novos ao conjunto salvo, sem reler o índice
+
+    Refaz tudo (reconstruir_numeros_conhecidos) só se o conjunto não existir
+    ou se passar do tamanho para o qual foi dimensionado: o conjunto exato
+    acima de LIMITE_CONJUNTO_EXATO ou o Bloom acima da capacidade.
+    """
+    conhecidos = carregar_numeros_conhecidos(caminho)
+    if conhecidos is None:
+        return reconstruir_numeros_conhecidos(indice_dir, caminho)
+
+    for numero in numeros:
+        if numero not in conhecidos:
+            conhecidos.add(numero)
+
+    limite = LIMITE_CONJUNTO_EXATO if conhecidos.exato else conhecidos.capacidade()
+    if len(conhecidos) > limite:
+        return reconstruir_numeros_conhecidos(indice_dir, caminho)
+
+    salvar_numeros_conhecidos(conhecidos, caminho)
+    print(f"🔢 {len(conhecidos)} números conhecidos salvos em {caminho}")
+    return conhecidos
@@ -0,0 +1,51 @@
+"""
+Casamento de palavras-chave por categoria
+
+Substitui o padrão `any(palavra in texto.lower() for palavra in LISTA)`
+repetido para cada lista: o texto é convertido para minúsculas UMA vez e
+cada categoria é testada com `in` (busca de substring em C, que para no
+primeiro acerto), sem montar uma lista nova nem reconverter o texto.
+
+Uma regex alternada com lookahead sobre todas as palavras foi medida e é
+mais lenta que isso (testa todas as alternativas em cada posição do
+texto) - ver scripts/benchmark_palavras_chave.py.
+"""
+from typing import Dict, FrozenSet, Iterable, Tuple
+
+
+class KeywordMatcher:
+    """
+    Listas de palavras-chave agrupadas por categoria
+
+    Exemplo:
+        matcher = KeywordMatcher({"imovel": ["imóvel", "casa"], "extinto": ["arquivado"]})
+        matcher.categorias("Casa arquivada...")  # frozenset({"imovel"})
+
+    A comparação é feita em minúsculas (mesma semântica de
+    `palavra.lower() in texto.lower()`).
+    """
+
+    def __init__(self, categorias: Dict[str, Iterable[str]]):
+        # categoria -> palavras (minúsculas, sem repetição, na ordem das listas)
+        self._palavras: Dict[str, Tuple[str, ...]] = {
+            categoria: tuple(dict.fromkeys(palavra.lower() for palavra in lista if palavra))
+            for categoria, lista in categorias.items()
+        }
+        self.todas_categorias = frozenset(categorias)
+
+    def categorias(self, texto: str) -> FrozenSet[str]:
+        """Retorna todas as categorias com pelo menos uma palavra no texto"""
+        if not texto:
+            return frozenset()
+
+        texto = texto.lower()
+        return frozenset(
+            categoria for categoria, palavras in self._palavras.items()
+            if any(map(texto.__contains__, palavras))
+        )
+
+    def contem(self, texto: str, categoria: str) -> bool:
+        """Verifica uma única categoria (as outras listas nem são percorridas)"""
+        if not texto:
+            return False
+        return any(map(texto.lower().__contains__, self._palavras.get(categoria, ())))
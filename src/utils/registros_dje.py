@@ -0,0 +1,45 @@
+"""
+Armazenamento dos registros canônicos de cada PDF do DJE
+
+O parser (src/scrapers/dje_parser.py) extrai UMA vez, sem filtros, todos os
+números do PDF com classe, flags e campos; cada busca (/buscar,
+/processar-pdfs-cache, scripts/daily_update.py, ...) só aplica os seus
+filtros sobre a lista guardada aqui.
+
+Os registros são chaveados pelo hash do CONTEÚDO do PDF (o mesmo do cache
+de texto) e por uma chave com backend, janela entre páginas e versão do
+parser - mudar qualquer um deles gera um arquivo novo.
+
+Estrutura:
+    data/dje_registros/<sha256 do PDF>/<chave>.json.gz    {"registros": [...]}
+"""
+import gzip
+import json
+import os
+from typing import Dict, List, Optional
+
+REGISTROS_DIR = os.getenv("DJE_REGISTROS_DIR", "data/dje_registros")
+
+
+def _caminho(pdf_hash: str, chave: str) -> str:
+    return os.path.join(REGISTROS_DIR, pdf_hash, f"{chave}.json.gz")
+
+
+def ler_registros(pdf_hash: str, chave: str) -> Optional[List[Dict]]:
+    """Registros canônicos do PDF ou None se ainda não foi parseado"""
+    try:
+        with gzip.open(_caminho(pdf_hash, chave), 'rt', encoding='utf-8') as f:
+            return json.load(f)["registros"]
+    except (OSError, EOFError, ValueError, KeyError):
+        return None
+
+
+def salvar_registros(pdf_hash: str, chave: str, registros: List[Dict]) -> None:
+    """Grava via arquivo temporário + rename (buscas concorrentes nunca leem arquivo pela metade)"""
+    caminho = _caminho(pdf_hash, chave)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+
+    temp = f"{caminho}.{os.getpid()}.tmp"
+    with gzip.open(temp, 'wt', encoding='utf-8', compresslevel=6) as f:
+        json.dump({"registros": registros}, f, ensure_ascii=False)
+    os.replace(temp, caminho)
@@ -0,0 +1,95 @@
+"""Índice colunar do DJE (src/utils/indice_dje.py) gravado pelo indexador"""
+from unittest import mock
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from src.utils import indexador_dje
+from src.utils.indexador_dje import _indexar_pdf, buscar_processos_cache, iter_processos_cache, versao_parser
+from src.utils.indice_dje import IndiceDJE, gravar_segmentos, trocar_manifesto
+
+
+def _caderno_sem_processos(pdf_path):
+    pdf = canvas.Canvas(str(pdf_path), pagesize=A4)
+    for linha in ("DIÁRIO DA JUSTIÇA ELETRÔNICO", "Caderno 12 - sem publicações de interesse"):
+        pdf.drawString(72, 770, linha)
+        pdf.showPage()
+    pdf.save()
+
+
+def test_indexar_pdf_sem_registros(tmp_path):
+    pdf_path = tmp_path / "dje_22-07-2025_cad12.pdf"
+    _caderno_sem_processos(pdf_path)
+    indice_dir = str(tmp_path / "indice")
+
+    resultado = _indexar_pdf(str(pdf_path), indice_dir, 1, versao_parser())
+    assert resultado["segmento"]["total"] == 0
+    trocar_manifesto([resultado["segmento"]], {"pdfs": {pdf_path.name: resultado["entrada"]}}, indice_dir, geracao=1)
+
+    indice = IndiceDJE(indice_dir)
+    try:
+        assert len(indice) == 0
+        assert indice.contagem("tipo") == {}
+        processos, total, _ = iter_processos_cache(indice, apenas_imoveis=False, apenas_ativos=False)
+        assert total == 0
+        assert list(processos) == []
+    finally:
+        indice.fechar()
+
+
+def _registro_leve(sequencia, valor_causa):
+    return {
+        "numero": f"{sequencia:07d}-00.2025.8.26.0100",
+        "tipo": "Inventário",
+        "classe": "Inventário",
+        "pagina_dje": 1,
+        "offset": sequencia * 100,
+        "valor_causa": valor_causa,
+        "tem_imovel": True,
+        "esta_ativo": True,
+        "pdf_origem": "dje_22-07-2025_cad12.pdf",
+        "data_pdf": "22-07-2025",
+    }
+
+
+def test_valor_filtra_e_ordena_pela_coluna(tmp_path):
+    valores = [5000.0, None, 120000.0, 80000.0, 0.0, 300000.0]
+    processos = [_registro_leve(i, valor) for i, valor in enumerate(valores, 1)]
+    gravar_segmentos({"dje_22-07-2025_cad12.pdf": processos}, {"pdfs": {}}, str(tmp_path))
+
+    indice = IndiceDJE(str(tmp_path))
+    try:
+        # Nada de PDF: filtro e ordenação por valor saem da coluna valor_causa
+        with mock.patch.object(indexador_dje, "detalhes_registro", side_effect=AssertionError("PDF aberto")):
+            faixa, total, _ = buscar_processos_cache(indice, valor_min=10000, valor_max=200000)
+            maiores, _, _ = buscar_processos_cache(indice, ordenar_por="valor_desc")
+            menores, _, cursor = buscar_processos_cache(indice, ordenar_por="valor_asc", limite=4)
+            resto, _, _ = buscar_processos_cache(indice, ordenar_por="valor_asc", limite=4, cursor=cursor)
+    finally:
+        indice.fechar()
+
+    assert total == 2
+    assert sorted(p["valor_causa"] for p in faixa) == [80000.0, 120000.0]
+    # Sem valor fica no fim nas duas direções
+    assert [p.get("valor_causa") for p in maiores] == [300000.0, 120000.0, 80000.0, 5000.0, 0.0, None]
+    assert [p.get("valor_causa") for p in menores + resto] == [0.0, 5000.0, 80000.0, 120000.0, 300000.0, None]
+
+
+def test_busca_por_parte_devolve_nomes_do_indice(tmp_path):
+    processos = [_registro_leve(i, None) for i in (1, 2)]
+    processos[0].update(nomes_partes=["JOSÉ DA SILVA", "MARIA SOUZA"], nomes_advogados=["Ana Lima"])
+    processos[1].update(nomes_partes=["PEDRO MARTINS"], nomes_advogados=[])
+    gravar_segmentos({"dje_22-07-2025_cad12.pdf": processos}, {"pdfs": {}}, str(tmp_path))
+
+    indice = IndiceDJE(str(tmp_path))
+    try:
+        with mock.patch.object(indexador_dje, "detalhes_registro", side_effect=AssertionError("PDF aberto")):
+            encontrados, total, _ = buscar_processos_cache(indice, parte="jose silv")
+    finally:
+        indice.fechar()
+
+    assert total == 1
+    assert encontrados[0]["numero"] == processos[0]["numero"]
+    assert encontrados[0]["nomes_partes"] == ["JOSÉ DA SILVA", "MARIA SOUZA"]
+    assert encontrados[0]["nomes_advogados"] == ["Ana Lima"]
+    assert "partes" not in encontrados[0]
@@ -0,0 +1,44 @@
+"""Divisão das páginas candidatas do DJE em blocos/tarefas (src/scrapers/dje_parser.py)"""
+from unittest import mock
+
+from src.scrapers import dje_parser
+from src.scrapers.dje_parser import _intervalos_paginas, planejar_intervalos_dje
+
+
+def _paginas(blocos):
+    return [pagina for bloco in blocos for inicio, fim in bloco for pagina in range(inicio, fim)]
+
+
+def test_paginas_salteadas_dividem_blocos():
+    # 750 páginas candidatas alternadas num caderno de 1.500 páginas
+    intervalos = [(inicio, inicio + 1) for inicio in range(0, 1500, 2)]
+
+    blocos = _intervalos_paginas(0, 15, intervalos)
+
+    assert len(blocos) == 15
+    assert all(sum(fim - inicio for inicio, fim in bloco) == 50 for bloco in blocos)
+    assert _paginas(blocos) == list(range(0, 1500, 2))
+
+
+def test_intervalo_longo_e_cortado_entre_blocos():
+    blocos = _intervalos_paginas(0, 3, [(0, 5), (10, 30)])
+
+    assert blocos == [[(0, 5), (10, 14)], [(14, 23)], [(23, 30)]]
+    assert _paginas(blocos) == list(range(0, 5)) + list(range(10, 30))
+
+
+def test_sem_intervalos_divide_o_caderno():
+    assert _intervalos_paginas(10, 3) == [[(0, 4)], [(4, 8)], [(8, 10)]]
+    assert _intervalos_paginas(0, 3, []) == []
+
+
+def test_planejar_tarefas_com_candidatas_fragmentadas():
+    candidatas = [(inicio, inicio + 1) for inicio in range(0, 1500, 2)]
+
+    with mock.patch.object(dje_parser, "paginas_candidatas", return_value=candidatas):
+        tarefas = planejar_intervalos_dje("caderno.pdf", paginas_por_tarefa=50)
+
+    assert len(tarefas) == 15
+    # Faixas 1-based e inclusivas: a página 0-based i vira (i + 1, i + 1)
+    assert tarefas[0][:2] == [(1, 1), (3, 3)]
+    assert sum(fim - inicio + 1 for tarefa in tarefas for inicio, fim in tarefa) == 750
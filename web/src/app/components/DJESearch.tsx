@@ -397,11 +397,11 @@ export default function DJESearch() {
         </div>
       )}
 
-      {processo.partes && processo.partes.length > 0 && (
+      {(processo.partes || processo.nomes_partes)?.length > 0 && (
         <div style={{ marginTop: '12px' }}>
           <p style={{ fontSize: '12px', color: '#6b7280' }}>Partes:</p>
           <div style={{ fontSize: '13px' }}>
-            {processo.partes.slice(0, 2).map((parte: string, i: number) => (
+            {(processo.partes || processo.nomes_partes).slice(0, 2).map((parte: string, i: number) => (
               <p key={i} style={{ margin: '4px 0', color: '#374151' }}>{parte}</p>
             ))}
           </div>